@@ -0,0 +1,98 @@
+"""Agents that choose actions in a game.
+
+An agent is any object with a ``choose_action(game) -> Action`` method;
+``MCTS`` qualifies as-is. Agents are usually built from short text specs
+(see ``make_agent``) so they can be named on the command line and rebuilt
+inside worker processes.
+"""
+
+from __future__ import annotations
+
+import random
+from typing import Protocol
+
+from mtg_engine.engine.actions import Action, ActionType
+from mtg_engine.engine.game import Game
+from mtg_engine.search.mcts import MCTS
+
+# Agent names accepted by make_agent
+AGENT_NAMES = ("random", "greedy", "mcts")
+
+
+class Agent(Protocol):
+    """Anything that picks an action for the player with priority."""
+
+    def choose_action(self, game: Game) -> Action:
+        """Return a legal action for ``game``."""
+        ...
+
+
+class RandomAgent:
+    """Plays a uniformly random legal action."""
+
+    def __init__(self, seed: int | None = None) -> None:
+        """Initialize the agent.
+
+        Args:
+            seed: Seed for the agent's random source.
+        """
+        self.rng: random.Random = random.Random(seed)
+
+    def choose_action(self, game: Game) -> Action:
+        """Return a uniformly random legal action."""
+        return self.rng.choice(game.legal_action_tuple())
+
+
+class GreedyAgent:
+    """Casts its most damaging spell on an empty stack, otherwise passes.
+
+    A fixed, deterministic baseline: it never responds, so every spell on
+    the stack resolves before it casts again.
+    """
+
+    def choose_action(self, game: Game) -> Action:
+        """Return the greedy action for ``game``."""
+        actions = game.legal_action_tuple()
+        passes = [a for a in actions if a.type is ActionType.PASS]
+        if game.state.stack and passes:
+            return passes[0]
+        casts = [a for a in actions if a.type is not ActionType.PASS]
+        if not casts:
+            return passes[0]
+        spell_for_action = game.spells.spell_for_action
+        return max(casts, key=lambda a: spell_for_action(a).damage_to_opponent)
+
+
+def make_agent(spec: str, seed: int | None = None) -> Agent:
+    """Build an agent from a text spec.
+
+    Specs are ``random``, ``greedy``, ``mcts`` or ``mcts:<simulations>``.
+
+    Args:
+        spec: The agent spec.
+        seed: Seed for randomized agents.
+
+    Returns:
+        A new agent.
+
+    Raises:
+        ValueError: If the spec is not recognized.
+
+    Examples:
+        >>> make_agent("mcts:200").simulations
+        200
+    """
+    name, _, arg = spec.partition(":")
+    if name == "random" and not arg:
+        return RandomAgent(seed)
+    if name == "greedy" and not arg:
+        return GreedyAgent()
+    if name == "mcts":
+        if not arg:
+            return MCTS(seed=seed)
+        if arg.isdigit() and int(arg) > 0:
+            return MCTS(simulations=int(arg), seed=seed)
+    raise ValueError(
+        f"unknown agent {spec!r}; expected one of {', '.join(AGENT_NAMES)} "
+        "(mcts takes an optional ':<simulations>')"
+    )
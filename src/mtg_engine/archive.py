@@ -0,0 +1,352 @@
+"""Multi-game archive of game records with a seekable snapshot index.
+
+An archive is a data file plus an index file (the data path with
+``.idx`` appended). For each game the data file holds its GameRecord
+followed by a snapshot of the state every ``snapshot_interval`` plies; the
+index file holds one fixed-size entry per game pointing into the data
+file. Any ply of any game is therefore reachable with one index lookup,
+one snapshot decode and fewer than ``snapshot_interval`` ``Game.apply``
+calls.
+
+Data file layout (little-endian)::
+
+    header: magic "MTGARCH1", version (u32), snapshot interval (u32)
+    per game: GameRecord bytes,
+              snapshot offsets (u32 each, relative to the game's start),
+              snapshots
+
+Snapshots are ``GameState.to_bytes`` encodings against the default spell
+registry, which is what records are replayed with. They are variable-size,
+so stacks up to ``MAX_ENCODED_STACK`` items deep can be checkpointed.
+
+Index file layout: header magic "MTGAIDX1", then per game: data offset
+(u64), ply count (u32), snapshot count (u32).
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Self
+
+from mtg_engine.engine.actions import ACTIONS
+from mtg_engine.engine.game import Game
+from mtg_engine.engine.state import GameState
+from mtg_engine.records import GameRecord
+
+ARCHIVE_VERSION = 3
+
+_DATA_MAGIC = b"MTGARCH1"
+_INDEX_MAGIC = b"MTGAIDX1"
+_DATA_HEADER = struct.Struct("<8sII")
+_INDEX_ENTRY = struct.Struct("<QII")
+_OFFSET = struct.Struct("<I")
+
+
+def index_path(path: str | os.PathLike[str]) -> Path:
+    """Return the index file path for the archive at ``path``."""
+    return Path(f"{os.fspath(path)}.idx")
+
+
+@dataclass(frozen=True, slots=True)
+class EncodedGame:
+    """A game's archive bytes, ready to append.
+
+    Attributes:
+        length: Number of actions in the game.
+        snapshot_interval: Plies between the encoded snapshots.
+        snapshots: Number of snapshots.
+        data: The record, snapshot offsets and snapshots.
+    """
+
+    length: int
+    snapshot_interval: int
+    snapshots: int
+    data: bytes
+
+
+def encode_game(record: GameRecord, snapshot_interval: int) -> EncodedGame:
+    """Replay a record to take its snapshots and encode it for an archive.
+
+    This is the expensive part of adding a game, so it can run in worker
+    processes; ``ArchiveWriter.add_encoded`` then only writes the bytes.
+
+    Args:
+        record: The game to encode.
+        snapshot_interval: Plies between snapshots.
+
+    Returns:
+        The encoded game.
+
+    Raises:
+        ValueError: If a snapshot state cannot be encoded.
+    """
+    game = Game.new(record.starting_life, check_interval=0)
+    apply = game.apply
+    snapshots = []
+    for ply, code in enumerate(record.codes(), start=1):
+        apply(ACTIONS[code])
+        if ply % snapshot_interval == 0:
+            snapshots.append(game.state.to_bytes())
+
+    encoded = record.to_bytes()
+    offsets = []
+    position = len(encoded) + _OFFSET.size * len(snapshots)
+    for snapshot in snapshots:
+        offsets.append(_OFFSET.pack(position))
+        position += len(snapshot)
+    return EncodedGame(
+        length=record.length,
+        snapshot_interval=snapshot_interval,
+        snapshots=len(snapshots),
+        data=b"".join([encoded, *offsets, *snapshots]),
+    )
+
+
+class ArchiveWriter:
+    """Appends game records, with snapshots, to an archive.
+
+    Opening an existing archive appends to it; its snapshot interval is
+    kept.
+
+    Attributes:
+        path: Data file path.
+        snapshot_interval: Plies between snapshots.
+    """
+
+    def __init__(
+        self, path: str | os.PathLike[str], snapshot_interval: int = 256
+    ) -> None:
+        """Open or create an archive for appending.
+
+        Args:
+            path: Data file path; the index is written next to it.
+            snapshot_interval: Plies between snapshots for a new archive.
+
+        Raises:
+            ValueError: If ``snapshot_interval`` is not positive, or an
+                existing file is not a compatible archive or has a missing
+                or damaged index.
+        """
+        if snapshot_interval < 1:
+            raise ValueError("snapshot_interval must be positive")
+        self.path: Path = Path(path)
+        exists = self.path.exists() and self.path.stat().st_size > 0
+        if exists and not index_path(self.path).exists():
+            raise ValueError(f"{self.path} has no index {index_path(self.path)}")
+        self._data = open(self.path, "ab+")  # noqa: SIM115 - closed by close()
+        self._index = open(index_path(self.path), "ab+")  # noqa: SIM115
+        if exists:
+            self._data.seek(0)
+            self._index.seek(0)
+            try:
+                self.snapshot_interval: int = _read_data_header(
+                    self._data.read(_DATA_HEADER.size), self.path
+                )
+                _check_index(
+                    self._index.read(len(_INDEX_MAGIC)),
+                    os.fstat(self._index.fileno()).st_size,
+                    index_path(self.path),
+                )
+            except ValueError:
+                self.close()
+                raise
+        else:
+            self.snapshot_interval = snapshot_interval
+            self._data.write(
+                _DATA_HEADER.pack(_DATA_MAGIC, ARCHIVE_VERSION, snapshot_interval)
+            )
+            self._index.truncate(0)
+            self._index.write(_INDEX_MAGIC)
+        self._data.seek(0, os.SEEK_END)
+        self._index.seek(0, os.SEEK_END)
+        self._count = (self._index.tell() - len(_INDEX_MAGIC)) // _INDEX_ENTRY.size
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        """Return the number of games in the archive."""
+        return self._count
+
+    def close(self) -> None:
+        """Flush and close the archive files."""
+        self._data.close()
+        self._index.close()
+
+    def add(self, record: GameRecord) -> int:
+        """Append a game, replaying it to take its snapshots.
+
+        Args:
+            record: The game to add.
+
+        Returns:
+            The game's index in the archive.
+
+        Raises:
+            ValueError: If a snapshot state cannot be encoded.
+        """
+        return self.add_encoded(encode_game(record, self.snapshot_interval))
+
+    def add_encoded(self, game: EncodedGame) -> int:
+        """Append a game encoded by ``encode_game``.
+
+        Args:
+            game: The encoded game.
+
+        Returns:
+            The game's index in the archive.
+
+        Raises:
+            ValueError: If ``game`` was encoded with another snapshot
+                interval.
+        """
+        if game.snapshot_interval != self.snapshot_interval:
+            raise ValueError(
+                f"game encoded with snapshot interval {game.snapshot_interval}, "
+                f"archive uses {self.snapshot_interval}"
+            )
+        start = self._data.tell()
+        self._data.write(game.data)
+        self._index.write(_INDEX_ENTRY.pack(start, game.length, game.snapshots))
+        self._count += 1
+        return self._count - 1
+
+
+def _check_index(magic: bytes, size: int, path: Path) -> None:
+    """Validate an index file from its leading bytes and total size."""
+    if magic != _INDEX_MAGIC:
+        raise ValueError(f"{path} is not an archive index")
+    if (size - len(_INDEX_MAGIC)) % _INDEX_ENTRY.size:
+        raise ValueError(f"{path} ends with a partial entry")
+
+
+def _read_data_header(header: bytes, path: Path) -> int:
+    """Validate a data file header and return its snapshot interval."""
+    if len(header) < _DATA_HEADER.size:
+        raise ValueError(f"{path} is not a game archive")
+    magic, version, interval = _DATA_HEADER.unpack(header)
+    if magic != _DATA_MAGIC:
+        raise ValueError(f"{path} is not a game archive")
+    if version != ARCHIVE_VERSION:
+        raise ValueError(f"{path}: unsupported archive version {version}")
+    return interval
+
+
+class GameArchive:
+    """Random-access reader for an archive written by ArchiveWriter.
+
+    Both files are memory-mapped; nothing is read until a game is used.
+
+    Attributes:
+        path: Data file path.
+        snapshot_interval: Plies between snapshots.
+    """
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        """Open an archive for reading.
+
+        Raises:
+            ValueError: If the files are not a compatible archive.
+        """
+        self.path: Path = Path(path)
+        with open(self.path, "rb") as f:
+            self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            with open(index_path(self.path), "rb") as f:
+                self._index = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError as e:
+            self._data.close()
+            raise ValueError(f"{index_path(self.path)} is not an archive index") from e
+        try:
+            self.snapshot_interval: int = _read_data_header(
+                self._data[: _DATA_HEADER.size], self.path
+            )
+            _check_index(
+                self._index[: len(_INDEX_MAGIC)],
+                len(self._index),
+                index_path(self.path),
+            )
+        except ValueError:
+            self.close()
+            raise
+        self._count = (len(self._index) - len(_INDEX_MAGIC)) // _INDEX_ENTRY.size
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Unmap the archive files."""
+        self._data.close()
+        self._index.close()
+
+    def __len__(self) -> int:
+        """Return the number of games in the archive."""
+        return self._count
+
+    def _entry(self, game: int) -> tuple[int, int, int]:
+        if not 0 <= game < self._count:
+            raise IndexError(f"game {game} out of range for {self._count} games")
+        return _INDEX_ENTRY.unpack_from(
+            self._index, len(_INDEX_MAGIC) + game * _INDEX_ENTRY.size
+        )
+
+    def record(self, game: int) -> GameRecord:
+        """Return the record of game ``game``.
+
+        Raises:
+            IndexError: If there is no such game.
+        """
+        offset, _, _ = self._entry(game)
+        return GameRecord.from_bytes(self._data, offset)
+
+    def game_at(self, game: int, ply: int | None = None) -> Game:
+        """Reconstruct game ``game`` after ``ply`` actions.
+
+        Starts from the nearest snapshot at or before ``ply``, so at most
+        ``snapshot_interval - 1`` actions are applied.
+
+        Args:
+            game: Game index.
+            ply: Number of actions to apply; the whole game if None.
+
+        Returns:
+            A new Game at that ply (invariant checks at the class default).
+
+        Raises:
+            IndexError: If the game or ply is out of range.
+        """
+        offset, length, snapshot_count = self._entry(game)
+        if ply is None:
+            ply = length
+        if not 0 <= ply <= length:
+            raise IndexError(f"ply {ply} out of range for {length} actions")
+        record = GameRecord.from_bytes(self._data, offset)
+
+        slot = min(ply // self.snapshot_interval, snapshot_count)
+        if slot == 0:
+            game_ = Game.new(record.starting_life)
+            base = 0
+        else:
+            table = offset + record.encoded_size + (slot - 1) * _OFFSET.size
+            (relative,) = _OFFSET.unpack_from(self._data, table)
+            game_ = Game(GameState.from_bytes(self._data, offset + relative))
+            base = slot * self.snapshot_interval
+
+        apply = game_.apply
+        for i in range(base, ply):
+            apply(ACTIONS[record.code(i)])
+        return game_
+
+    def state_at(self, game: int, ply: int | None = None) -> GameState:
+        """Return the state of game ``game`` after ``ply`` actions."""
+        return self.game_at(game, ply).state
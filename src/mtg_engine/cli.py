@@ -1,7 +1,25 @@
 """Command-line interface for MTG Engine."""
 
+import argparse
+import asyncio
+import contextlib
+import textwrap
+import time
+from collections.abc import Callable, Iterator, Sequence
+from typing import Any
+
+from mtg_engine import selfplay, server
+from mtg_engine.agents import AGENT_NAMES, make_agent
+from mtg_engine.archive import ArchiveWriter, GameArchive
 from mtg_engine.engine.actions import action_from_input, action_label
 from mtg_engine.engine.game import Game
+from mtg_engine.engine.instrument import GameMetrics
+from mtg_engine.loadtest import run_load_test
+from mtg_engine.rules.index import RulesIndex
+from mtg_engine.rules.search import RulesSearch
+from mtg_engine.rules.xref import RuleGraph
+from mtg_engine.search.solver import RetrogradeSolver
+from mtg_engine.selfplay import GameResult
 
 
 def print_state(game: Game) -> None:
@@ -69,8 +87,380 @@ def run_game_loop(game: Game) -> None:
         print("\n*** GAME OVER: Draw! ***\n")
 
 
-def main() -> None:
-    """Entry point for the CLI."""
+def _agent_spec(spec: str) -> str:
+    """argparse type: accept only agent specs that ``make_agent`` knows."""
+    try:
+        make_agent(spec)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e)) from e
+    return spec
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser for all subcommands."""
+    parser = argparse.ArgumentParser(
+        prog="mtg_engine",
+        description="Play interactively (no subcommand) or run a subcommand.",
+    )
+    commands = parser.add_subparsers(dest="command")
+
+    sp = commands.add_parser("selfplay", help="run headless self-play games")
+    sp.add_argument("-n", "--games", type=int, default=100, help="games to play")
+    sp.add_argument(
+        "--agents",
+        nargs=2,
+        type=_agent_spec,
+        default=["random", "random"],
+        metavar=("P0", "P1"),
+        help=f"agent specs: {', '.join(AGENT_NAMES)} or mcts:<simulations>",
+    )
+    sp.add_argument("-j", "--workers", type=int, default=1, help="worker processes")
+    sp.add_argument("--seed", type=int, default=0, help="run seed")
+    sp.add_argument(
+        "--max-actions",
+        type=int,
+        default=10_000,
+        help="actions after which a game is abandoned",
+    )
+    sp.add_argument("--starting-life", type=int, default=20)
+    sp.add_argument("-o", "--output", help="file to stream per-game results to")
+    sp.add_argument(
+        "--metrics",
+        metavar="PATH",
+        help="instrument games and keep a JSON metrics dump at PATH",
+    )
+    sp.add_argument(
+        "--metrics-every",
+        type=int,
+        default=100,
+        metavar="N",
+        help="rewrite the metrics dump every N games (default: %(default)s)",
+    )
+    sp.add_argument(
+        "--format",
+        choices=("jsonl", "binary"),
+        default="jsonl",
+        help="output format (binary uses selfplay.RESULT_STRUCT records)",
+    )
+    sp.add_argument(
+        "--archive",
+        metavar="PATH",
+        help="append every game to a seekable game archive at PATH",
+    )
+    sp.add_argument(
+        "--snapshot-interval",
+        type=int,
+        default=256,
+        metavar="K",
+        help="plies between archive snapshots (default: %(default)s)",
+    )
+
+    rp = commands.add_parser("replay", help="show a game from a game archive")
+    rp.add_argument("archive", help="archive written by selfplay --archive")
+    rp.add_argument("game", type=int, help="game index within the archive")
+    rp.add_argument(
+        "--ply", type=int, help="show the state after this many actions (default: end)"
+    )
+
+    sv = commands.add_parser(
+        "solve", help="solve the game exactly for a range of starting lives"
+    )
+    sv.add_argument(
+        "--life",
+        type=int,
+        nargs=2,
+        default=[1, 10],
+        metavar=("MIN", "MAX"),
+        help="starting lives to solve, inclusive (default: 1 10)",
+    )
+    sv.add_argument(
+        "--max-stack-depth",
+        type=int,
+        default=4,
+        help="stack depth at which casting stops (default: %(default)s)",
+    )
+
+    sr = commands.add_parser("serve", help="host games for remote agents over TCP")
+    sr.add_argument("--host", default=server.DEFAULT_HOST, help="interface to bind")
+    sr.add_argument(
+        "--port", type=int, default=7474, help="port (default: %(default)s)"
+    )
+    sr.add_argument(
+        "--max-games",
+        type=int,
+        default=100_000,
+        help="most games hosted at once (default: %(default)s)",
+    )
+
+    lt = commands.add_parser("loadtest", help="measure server action latency")
+    lt.add_argument("--host", default=server.DEFAULT_HOST, help="server host")
+    lt.add_argument(
+        "--port",
+        type=int,
+        help="server port (default: start a server in-process on loopback)",
+    )
+    lt.add_argument(
+        "-c", "--connections", type=int, default=100, help="client connections"
+    )
+    lt.add_argument(
+        "-g", "--games", type=int, default=10, help="live games per connection"
+    )
+    lt.add_argument(
+        "-n", "--actions", type=int, default=1000, help="actions per connection"
+    )
+    lt.add_argument(
+        "--opponent",
+        type=_agent_spec,
+        help="server agent playing seat 1 (default: clients play both seats)",
+    )
+    lt.add_argument("--starting-life", type=int, default=20)
+    lt.add_argument("--seed", type=int, default=0, help="action seed")
+
+    ru = commands.add_parser("rules", help="look things up in the Comprehensive Rules")
+    ru.add_argument(
+        "--rules-file",
+        help="rules text file (default: the Comprehensive Rules in docs/)",
+    )
+    rules_commands = ru.add_subparsers(dest="rules_command", required=True)
+    rs = rules_commands.add_parser("show", help="show a rule or glossary entry")
+    rs.add_argument("item", help="rule number such as 704.5a, or a glossary term")
+    rs.add_argument(
+        "--children", action="store_true", help="also show the rules under it"
+    )
+    rq = rules_commands.add_parser(
+        "search", help="full-text search of the rules and glossary"
+    )
+    rq.add_argument(
+        "query",
+        nargs="+",
+        help='words, "quoted phrases", -excluded words, and OR between clauses',
+    )
+    rq.add_argument(
+        "-n",
+        "--limit",
+        type=int,
+        default=10,
+        help="most results (default: %(default)s)",
+    )
+    rr = rules_commands.add_parser(
+        "refs", help="rules a rule refers to, or that refer to it"
+    )
+    rr.add_argument("number", help="rule number such as 608.2")
+    rr.add_argument(
+        "--dependents",
+        action="store_true",
+        help="list the rules that refer to it instead",
+    )
+    rr.add_argument(
+        "--transitive", action="store_true", help="follow references of references"
+    )
+    return parser
+
+
+def run_selfplay_command(args: argparse.Namespace) -> None:
+    """Run the ``selfplay`` subcommand and print throughput."""
+    start = time.perf_counter()
+    metrics = GameMetrics() if args.metrics else None
+    with contextlib.ExitStack() as stack:
+        archive = None
+        if args.archive:
+            archive = stack.enter_context(
+                ArchiveWriter(args.archive, args.snapshot_interval)
+            )
+        results = selfplay.run_selfplay(
+            args.games,
+            agents=args.agents,
+            workers=args.workers,
+            seed=args.seed,
+            max_actions=args.max_actions,
+            starting_life=args.starting_life,
+            metrics=metrics,
+            archive=archive,
+        )
+        if metrics is not None:
+            results = _dump_metrics(results, metrics, args.metrics, args.metrics_every)
+
+        if args.output is None:
+            stats = selfplay.summarize(results, start)
+        elif args.format == "jsonl":
+            out = stack.enter_context(open(args.output, "w"))
+            stats = selfplay.summarize(_tee(results, selfplay.write_jsonl, out), start)
+        else:
+            out = stack.enter_context(open(args.output, "wb"))
+            stats = selfplay.summarize(_tee(results, selfplay.write_binary, out), start)
+
+    draws = stats.games - stats.wins[0] - stats.wins[1]
+    print(
+        f"{stats.games} games ({args.agents[0]} vs {args.agents[1]}): "
+        f"P0 {stats.wins[0]}, P1 {stats.wins[1]}, no winner {draws}"
+    )
+    print(f"{stats.actions} actions in {stats.seconds:.2f}s")
+    print(
+        f"{stats.games_per_second:.1f} games/s, "
+        f"{stats.actions_per_second:.1f} actions/s"
+    )
+
+
+def run_replay_command(args: argparse.Namespace) -> None:
+    """Run the ``replay`` subcommand: print one archived game at one ply."""
+    with GameArchive(args.archive) as archive:
+        try:
+            record = archive.record(args.game)
+            ply = record.length if args.ply is None else args.ply
+            game = archive.game_at(args.game, ply)
+        except IndexError as e:
+            raise SystemExit(f"error: {e}") from e
+    print(f"Game {args.game}: ply {ply} of {record.length}")
+    print_state(game)
+
+
+def run_serve_command(args: argparse.Namespace) -> None:
+    """Run the ``serve`` subcommand until interrupted."""
+    try:
+        asyncio.run(server.serve(args.host, args.port, max_games=args.max_games))
+    except KeyboardInterrupt:
+        pass
+
+
+def run_loadtest_command(args: argparse.Namespace) -> None:
+    """Run the ``loadtest`` subcommand and print throughput and latency."""
+    stats = asyncio.run(
+        run_load_test(
+            args.host,
+            args.port,
+            connections=args.connections,
+            games_per_connection=args.games,
+            actions_per_connection=args.actions,
+            starting_life=args.starting_life,
+            opponent=args.opponent,
+            seed=args.seed,
+        )
+    )
+    print(
+        f"{stats.connections} connections x {args.games} games: "
+        f"{stats.actions} actions, {stats.games} games finished "
+        f"in {stats.seconds:.2f}s"
+    )
+    print(f"{stats.actions_per_second:.1f} actions/s")
+    print(f"ACT latency p50 {stats.p50_ms:.3f} ms, p99 {stats.p99_ms:.3f} ms")
+
+
+def run_solve_command(args: argparse.Namespace) -> None:
+    """Run the ``solve`` subcommand: print value, table size and time per life."""
+    print(
+        f"{'life':>5} {'value':>6} {'plies':>6} {'positions':>10} "
+        f"{'table KiB':>10} {'seconds':>8}"
+    )
+    for life in range(args.life[0], args.life[1] + 1):
+        solver = RetrogradeSolver(life, args.max_stack_depth)
+        stats = solver.solve()
+        root = Game.new(life).state
+        print(
+            f"{life:>5} {solver.value(root).name:>6} {solver.plies(root):>6} "
+            f"{stats.positions:>10,} {stats.table_bytes / 1024:>10,.1f} "
+            f"{stats.seconds:>8.3f}"
+        )
+
+
+def run_rules_command(args: argparse.Namespace) -> None:
+    """Run the ``rules`` subcommands."""
+    if args.rules_command == "search":
+        run_rules_search(args)
+        return
+    if args.rules_command == "refs":
+        run_rules_refs(args)
+        return
+    with RulesIndex(args.rules_file) as rules:
+        if args.item in rules:
+            path = rules.section_path(args.item)
+            print(" > ".join(f"{rule.number} {rule.text}" for rule in path[:-1]))
+            print(f"{path[-1].number} {path[-1].text}")
+            if args.children:
+                for child in rules.children(args.item):
+                    print(f"  {child.number} {child.text}")
+            return
+        try:
+            entry = rules.glossary(args.item)
+        except KeyError:
+            raise SystemExit(f"error: no rule or glossary term {args.item!r}") from None
+        print(entry.term)
+        print(entry.text)
+
+
+def run_rules_search(args: argparse.Namespace) -> None:
+    """Run ``rules search``: print the best matches with their scores."""
+    with RulesSearch(args.rules_file) as search:
+        hits = search.search(" ".join(args.query), args.limit)
+    if not hits:
+        print("No matches.")
+    for hit in hits:
+        key = f"[{hit.key}]" if hit.glossary else hit.key
+        print(f"{hit.score:6.2f}  {key}  {textwrap.shorten(hit.text, 100)}")
+
+
+def run_rules_refs(args: argparse.Namespace) -> None:
+    """Run ``rules refs``: print a rule's dependencies or dependents."""
+    with RuleGraph(args.rules_file) as graph:
+        query = graph.dependents if args.dependents else graph.dependencies
+        try:
+            numbers = query(args.number, transitive=args.transitive)
+        except KeyError:
+            raise SystemExit(f"error: no rule {args.number!r}") from None
+        relation = "referring to" if args.dependents else "referenced by"
+        print(f"Rules {relation} {args.number}: {len(numbers)}")
+        for number in numbers:
+            rule = graph.rules.get_rule(number)
+            print(f"  {number}  {textwrap.shorten(rule.text, 100)}")
+
+
+def _dump_metrics(
+    results: Iterator[GameResult], metrics: GameMetrics, path: str, every: int
+) -> Iterator[GameResult]:
+    """Rewrite the metrics dump every ``every`` games and at the end."""
+    for i, result in enumerate(results, start=1):
+        yield result
+        if i % every == 0:
+            metrics.write_json(path)
+    metrics.write_json(path)
+
+
+def _tee(
+    results: Iterator[GameResult],
+    write: Callable[[GameResult, Any], None],
+    out: Any,
+) -> Iterator[GameResult]:
+    """Write each result to ``out`` as it passes through."""
+    for result in results:
+        write(result, out)
+        yield result
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    """Entry point for the CLI.
+
+    Args:
+        argv: Command-line arguments (defaults to ``sys.argv[1:]``).
+    """
+    args = build_parser().parse_args(argv)
+    if args.command == "selfplay":
+        run_selfplay_command(args)
+        return
+    if args.command == "replay":
+        run_replay_command(args)
+        return
+    if args.command == "solve":
+        run_solve_command(args)
+        return
+    if args.command == "serve":
+        run_serve_command(args)
+        return
+    if args.command == "loadtest":
+        run_loadtest_command(args)
+        return
+    if args.command == "rules":
+        run_rules_command(args)
+        return
+
     print("MTG Engine - Minimal Prototype")
     print("Two players, MAIN phase only")
     print("Spell A deals 3 damage, Spell B deals 2 damage")
@@ -11,11 +11,14 @@ class ActionType(Enum):
     - CAST_A: Cast spell A (placeholder for a damage spell)
     - CAST_B: Cast spell B (placeholder for another damage spell)
     - PASS: Pass priority
+    - CAST: Cast the spell whose id is ``Action.spell``, for registries
+      with more spells than fixed cast actions
     """
 
     CAST_A = auto()
     CAST_B = auto()
     PASS = auto()
+    CAST = auto()
 
 
 @dataclass(frozen=True, slots=True)
@@ -24,11 +27,36 @@ class Action:
 
     Attributes:
         type: The type of action being taken.
+        spell: Spell id cast by a CAST action; -1 for every other type.
     """
 
     type: ActionType
+    spell: int = -1
 
 
+# Canonical ordering of the fixed action types. An action type's position in
+# this tuple is its integer code, used by array-backed consumers such as
+# BatchGame. The parametric CAST type has no code.
+ACTION_TYPES: tuple[ActionType, ...] = tuple(
+    t for t in ActionType if t is not ActionType.CAST
+)
+
+# Action code of each action type
+ACTION_CODES: dict[ActionType, int] = {t: i for i, t in enumerate(ACTION_TYPES)}
+
+# Interned Action instances, indexed by action code. Actions are immutable,
+# so hot loops should reuse these rather than constructing new ones.
+ACTIONS: tuple[Action, ...] = tuple(Action(t) for t in ACTION_TYPES)
+
+# Legal-action bitmask with every action set (bit i is ACTION_TYPES[i])
+ALL_ACTIONS_MASK = (1 << len(ACTION_TYPES)) - 1
+
+# Interned actions whose bits are set in each bitmask, indexed by mask
+MASK_ACTIONS: tuple[tuple[Action, ...], ...] = tuple(
+    tuple(action for i, action in enumerate(ACTIONS) if mask >> i & 1)
+    for mask in range(ALL_ACTIONS_MASK + 1)
+)
+
 # Mapping from input characters to action types
 _INPUT_MAP: dict[str, ActionType] = {
     "a": ActionType.CAST_A,
@@ -55,14 +83,30 @@ def action_from_input(s: str) -> Action | None:
 
     Examples:
         >>> action_from_input("a")
-        Action(type=<ActionType.CAST_A: 1>)
+        Action(type=<ActionType.CAST_A: 1>, spell=-1)
         >>> action_from_input("X")
         None
     """
     action_type = _INPUT_MAP.get(s.strip().lower())
     if action_type is None:
         return None
-    return Action(action_type)
+    return action_for(action_type)
+
+
+def action_for(action_type: ActionType) -> Action:
+    """Return the interned Action for an action type.
+
+    Args:
+        action_type: The type of action.
+
+    Returns:
+        The shared Action instance for ``action_type``.
+
+    Examples:
+        >>> action_for(ActionType.PASS) is action_for(ActionType.PASS)
+        True
+    """
+    return ACTIONS[ACTION_CODES[action_type]]
 
 
 def action_label(a: Action) -> str:
@@ -77,5 +121,9 @@ def action_label(a: Action) -> str:
     Examples:
         >>> action_label(Action(ActionType.PASS))
         'Pass'
+        >>> action_label(Action(ActionType.CAST, spell=7))
+        'Cast Spell #7'
     """
+    if a.type is ActionType.CAST:
+        return f"Cast Spell #{a.spell}"
     return _LABEL_MAP[a.type]
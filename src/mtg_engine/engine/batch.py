@@ -0,0 +1,294 @@
+"""Batched game environment - many games stored as parallel NumPy arrays.
+
+Requires NumPy, which is an optional dependency: install the ``numpy``
+extra (``pip install 'mtg-zero[numpy]'``).
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+
+import numpy as np
+
+from mtg_engine.engine.actions import ACTION_CODES, ACTION_TYPES, ActionType
+from mtg_engine.engine.game import Game, GameInvariantError
+from mtg_engine.engine.phases import Phase
+from mtg_engine.engine.spells import DEFAULT_SPELLS, SpellRegistry
+from mtg_engine.engine.stack import Stack
+from mtg_engine.engine.state import GameState, PlayerState
+
+# Integer action codes (positions in ACTION_TYPES)
+CAST_A = ACTION_TYPES.index(ActionType.CAST_A)
+CAST_B = ACTION_TYPES.index(ActionType.CAST_B)
+PASS = ACTION_TYPES.index(ActionType.PASS)
+
+
+class BatchGame:
+    """N independent games stored in struct-of-arrays form.
+
+    Each field of GameState is held in a NumPy array indexed by game, and
+    ``apply`` steps every game with a fixed number of whole-array
+    operations, so the per-game cost of a step is a few vectorized element
+    operations rather than a Python-level ``Game.apply`` call. Semantics
+    match ``Game.apply`` exactly, including the pass/pass resolve-or-advance
+    rule.
+
+    Stack entries are packed as ``spell_id * 2 + controller``, where the
+    spell id indexes ``spells``; row ``i`` of ``stack`` is game ``i``'s
+    stack, bottom first, with ``stack_depth[i]`` items in use.
+
+    Attributes:
+        size: Number of games in the batch.
+        spells: The spell registry shared by every game.
+        max_stack_depth: Maximum number of items on any one game's stack.
+        turn: Turn number per game, ``[N]``.
+        active_player: Active player per game, ``[N]``.
+        priority_player: Player with priority per game, ``[N]``.
+        pass_streak: Consecutive passes per game, ``[N]``.
+        life: Life totals, ``[N, 2]``.
+        stack_depth: Number of stack items per game, ``[N]``.
+        stack: Packed stack entries, ``[N, max_stack_depth]``.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        starting_life: int = 20,
+        max_stack_depth: int = 32,
+        spells: SpellRegistry = DEFAULT_SPELLS,
+    ) -> None:
+        """Initialize a batch of fresh games.
+
+        Args:
+            size: Number of games to hold.
+            starting_life: Starting life total for each player.
+            max_stack_depth: Fixed per-game stack capacity.
+            spells: Spell registry defining each cast action.
+
+        Raises:
+            ValueError: If ``spells`` uses the parametric CAST action.
+        """
+        spells.require_action_codes("BatchGame")
+        self.size: int = size
+        self.spells: SpellRegistry = spells
+        # Damage per spell id, and spell id per action code (-1 if none)
+        self._damage: np.ndarray = np.array(
+            [s.damage_to_opponent for s in spells], dtype=np.int64
+        )
+        self._spell_for_code: np.ndarray = np.full(len(ACTION_TYPES), -1, np.int64)
+        for action_type, spell in spells.by_action.items():
+            self._spell_for_code[ACTION_CODES[action_type]] = spell.id
+        self.max_stack_depth: int = max_stack_depth
+        self.turn: np.ndarray = np.ones(size, np.int64)
+        self.active_player: np.ndarray = np.zeros(size, np.int8)
+        self.priority_player: np.ndarray = np.zeros(size, np.int8)
+        self.pass_streak: np.ndarray = np.zeros(size, np.int8)
+        self.life: np.ndarray = np.full((size, 2), starting_life, np.int64)
+        self.stack_depth: np.ndarray = np.zeros(size, np.int64)
+        self.stack: np.ndarray = np.zeros((size, max_stack_depth), np.uint16)
+        self._initial: tuple[np.ndarray, ...] = ()
+        self._save_initial()
+
+    @classmethod
+    def from_games(
+        cls,
+        games: Sequence[Game],
+        max_stack_depth: int = 32,
+        spells: SpellRegistry = DEFAULT_SPELLS,
+    ) -> BatchGame:
+        """Build a batch holding copies of the given games' states.
+
+        ``reset`` returns each game to the state copied here.
+
+        Args:
+            games: Games to copy into the batch.
+            max_stack_depth: Fixed per-game stack capacity.
+            spells: Spell registry defining each cast action.
+
+        Returns:
+            A new BatchGame with one slot per input game.
+
+        Raises:
+            ValueError: If a stack is too deep or holds an unknown spell.
+        """
+        batch = cls(len(games), max_stack_depth=max_stack_depth, spells=spells)
+        for i, game in enumerate(games):
+            batch.set_state(i, game.state)
+        batch._save_initial()
+        return batch
+
+    def _arrays(self) -> tuple[np.ndarray, ...]:
+        """Return every per-game state array."""
+        return (
+            self.turn,
+            self.active_player,
+            self.priority_player,
+            self.pass_streak,
+            self.life,
+            self.stack_depth,
+            self.stack,
+        )
+
+    def _save_initial(self) -> None:
+        """Record the current states as the ones ``reset`` restores."""
+        self._initial = tuple(a.copy() for a in self._arrays())
+
+    def reset(self, indices: Iterable[int] | None = None) -> None:
+        """Reset games to their initial states.
+
+        The initial state is a fresh game for a batch built by the
+        constructor, and the copied state for one built by ``from_games``.
+
+        Args:
+            indices: Games to reset. Resets every game if None.
+        """
+        selected = slice(None) if indices is None else np.fromiter(indices, np.intp)
+        for array, initial in zip(self._arrays(), self._initial):
+            array[selected] = initial[selected]
+
+    def apply(self, codes: Sequence[int] | np.ndarray) -> None:
+        """Apply one action to every game in the batch.
+
+        The whole batch is validated before any game is changed, so a
+        rejected call leaves every game as it was.
+
+        Args:
+            codes: One action code per game (a position in ``ACTION_TYPES``).
+
+        Raises:
+            ValueError: If the number of codes does not match the batch size.
+            KeyError: If a code casts no spell in ``spells``.
+            GameInvariantError: If a cast would overflow a game's stack.
+        """
+        codes = np.asarray(codes, dtype=np.int64)
+        if codes.shape != (self.size,):
+            raise ValueError(f"expected {self.size} action codes, got {codes.size}")
+        invalid = (codes < 0) | (codes >= len(ACTION_TYPES))
+        if invalid.any():
+            raise KeyError(f"invalid action code {codes[invalid][0]}")
+
+        depth = self.stack_depth
+        passing = codes == PASS
+        casts = np.flatnonzero(~passing)
+        spell_ids = self._spell_for_code[codes[casts]]
+        if (spell_ids < 0).any():
+            code = codes[casts][spell_ids < 0][0]
+            raise KeyError(f"{ACTION_TYPES[code].name} casts no spell")
+        full = casts[depth[casts] >= self.max_stack_depth]
+        if full.size:
+            raise GameInvariantError(
+                f"stack depth of game {full[0]} exceeds "
+                f"max_stack_depth={self.max_stack_depth}"
+            )
+
+        priority = self.priority_player
+        streak = self.pass_streak
+        active = self.active_player
+        second = passing & (streak == 1)
+        resolves = np.flatnonzero(second & (depth > 0))
+        advances = np.flatnonzero(second & (depth == 0))
+
+        # Casts push an item; every action passes priority to the opponent
+        self.stack[casts, depth[casts]] = spell_ids * 2 + priority[casts]
+        depth[casts] += 1
+        streak[:] = passing & (streak == 0)
+        priority ^= 1
+
+        # Both players passed in succession: resolve the top item...
+        depth[resolves] -= 1
+        packed = self.stack[resolves, depth[resolves]].astype(np.int64)
+        self.life[resolves, 1 - (packed & 1)] -= self._damage[packed >> 1]
+        priority[resolves] = active[resolves]
+
+        # ...or, with an empty stack, advance to the next turn
+        self.turn[advances] += 1
+        active[advances] ^= 1
+        priority[advances] = active[advances]
+
+    def is_over(self, i: int) -> bool:
+        """Check if game ``i`` is over.
+
+        Args:
+            i: Game index.
+
+        Returns:
+            True if either player in game ``i`` has life <= 0.
+        """
+        return bool((self.life[i] <= 0).any())
+
+    def done(self) -> np.ndarray:
+        """Return the game-over flag for every game in the batch."""
+        return (self.life <= 0).any(axis=1)
+
+    def winner(self, i: int) -> int | None:
+        """Determine the winner of game ``i``, as ``Game.winner`` does.
+
+        Args:
+            i: Game index.
+
+        Returns:
+            The index of the winning player, or None if the game is not over
+            or both players are at <= 0 life.
+        """
+        p0_alive = self.life[i, 0] > 0
+        p1_alive = self.life[i, 1] > 0
+        if p0_alive and not p1_alive:
+            return 0
+        if p1_alive and not p0_alive:
+            return 1
+        return None
+
+    def get_state(self, i: int) -> GameState:
+        """Materialize game ``i`` as a standalone GameState.
+
+        Args:
+            i: Game index.
+
+        Returns:
+            A new GameState equal to the batched game.
+        """
+        spells = self.spells.spells
+        stack = Stack()
+        for packed in self.stack[i, : self.stack_depth[i]].tolist():
+            stack.push_id(spells[packed >> 1].item_ids[packed & 1])
+        return GameState(
+            turn=int(self.turn[i]),
+            active_player=int(self.active_player[i]),
+            priority_player=int(self.priority_player[i]),
+            phase=Phase.MAIN,
+            pass_streak=int(self.pass_streak[i]),
+            players=[
+                PlayerState(life=int(self.life[i, 0])),
+                PlayerState(life=int(self.life[i, 1])),
+            ],
+            stack=stack,
+        )
+
+    def set_state(self, i: int, state: GameState) -> None:
+        """Overwrite game ``i`` with the given state.
+
+        Args:
+            i: Game index.
+            state: The state to copy in.
+
+        Raises:
+            ValueError: If the stack is too deep or holds an unknown spell.
+        """
+        items = state.stack.items()
+        if len(items) > self.max_stack_depth:
+            raise ValueError(
+                f"stack depth {len(items)} exceeds max_stack_depth={self.max_stack_depth}"
+            )
+        packed = []
+        for item in items:
+            spell = self.spells.spell_for(item)
+            if spell is None:
+                raise ValueError(f"cannot batch unknown stack item {item!r}")
+            packed.append(spell.id * 2 + item.controller)
+        self.stack[i, : len(packed)] = packed
+        self.stack_depth[i] = len(items)
+        self.turn[i] = state.turn
+        self.active_player[i] = state.active_player
+        self.priority_player[i] = state.priority_player
+        self.pass_streak[i] = state.pass_streak
+        self.life[i] = (state.players[0].life, state.players[1].life)
@@ -2,9 +2,23 @@
 
 from __future__ import annotations
 
-from mtg_engine.engine.actions import Action, ActionType
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any, ClassVar
+
+from mtg_engine.engine.actions import ACTION_TYPES, MASK_ACTIONS, Action, ActionType
+from mtg_engine.engine.spells import DEFAULT_SPELLS, SpellRegistry
 from mtg_engine.engine.stack import StackItem
 from mtg_engine.engine.state import GameState, new_game
+from mtg_engine.engine.zobrist import (
+    ACTIVE_KEYS,
+    PASS_STREAK_KEYS,
+    PRIORITY_KEYS,
+    compute_key,
+    life_key,
+    stack_key,
+    turn_key,
+)
 
 
 class GameInvariantError(Exception):
@@ -13,6 +27,33 @@ class GameInvariantError(Exception):
     pass
 
 
+@dataclass(frozen=True, slots=True)
+class UndoRecord:
+    """Everything needed to reverse a single ``Game.apply`` call.
+
+    Attributes:
+        turn: Turn number before the action.
+        active_player: Active player before the action.
+        priority_player: Player with priority before the action.
+        pass_streak: Pass streak before the action.
+        key: Zobrist key of the state before the action.
+        pushed: True if the action pushed an item onto the stack.
+        popped: The stack item resolved by the action, if any.
+        life_player: Index of the player whose life changed, or -1.
+        life_delta: Change applied to that player's life total.
+    """
+
+    turn: int
+    active_player: int
+    priority_player: int
+    pass_streak: int
+    key: int
+    pushed: bool = False
+    popped: StackItem | None = None
+    life_player: int = -1
+    life_delta: int = 0
+
+
 class Game:
     """Orchestrates a Magic: The Gathering game.
 
@@ -21,49 +62,141 @@ class Game:
 
     Attributes:
         state: The current game state.
+        check_keys: If True, every apply and undo cross-checks the
+            incrementally maintained ``state.key`` against a from-scratch
+            recomputation (debug mode).
+        check_interval: How often ``apply`` runs ``_assert_invariants``:
+            0 never, 1 after every action, N after every Nth action. The
+            class attribute is the default for new games; it is 1 normally
+            and 0 under ``python -O``, so optimized search and self-play
+            runs skip the checks.
+        spells: The spell registry defining what each cast action puts on
+            the stack. Defaults to ``DEFAULT_SPELLS`` (spells A and B).
     """
 
-    def __init__(self, state: GameState) -> None:
+    check_interval: int = 1 if __debug__ else 0
+    spells: SpellRegistry = DEFAULT_SPELLS
+    _DISPATCH: ClassVar[dict[ActionType, Callable[[Game, Action], UndoRecord]]]
+
+    def __init__(
+        self,
+        state: GameState,
+        check_keys: bool = False,
+        check_interval: int | None = None,
+        spells: SpellRegistry | None = None,
+    ) -> None:
         """Initialize a game with the given state.
 
         Args:
             state: The initial game state.
+            check_keys: Enable Zobrist key cross-checking.
+            check_interval: Invariant-check interval for this game. Uses
+                ``Game.check_interval`` if None.
+            spells: Spell registry for this game. Uses ``Game.spells`` if
+                None.
         """
         self.state: GameState = state
+        self.check_keys: bool = check_keys
+        if check_interval is not None:
+            self.check_interval = check_interval
+        if spells is not None:
+            self.spells = spells
+        self._unchecked = 0
 
     @classmethod
-    def new(cls, starting_life: int = 20) -> Game:
+    def new(
+        cls,
+        starting_life: int = 20,
+        check_keys: bool = False,
+        check_interval: int | None = None,
+        spells: SpellRegistry | None = None,
+    ) -> Game:
         """Create a new game with default initial state.
 
         Args:
             starting_life: Starting life total for each player.
+            check_keys: Enable Zobrist key cross-checking.
+            check_interval: Invariant-check interval for this game. Uses
+                ``Game.check_interval`` if None.
+            spells: Spell registry for this game. Uses ``Game.spells`` if
+                None.
 
         Returns:
             A new Game instance ready to play.
         """
-        return cls(new_game(starting_life))
+        return cls(new_game(starting_life), check_keys, check_interval, spells)
+
+    def clone(self) -> Game:
+        """Return an independent game at a copy of the current state.
+
+        The copy keeps this game's key-checking, invariant-checking and
+        spell settings.
+
+        Returns:
+            A new Game.
+        """
+        clone = Game(self.state.clone_shallow(), self.check_keys, spells=self.spells)
+        clone.check_interval = self.check_interval
+        return clone
 
     def legal_actions(self) -> list[Action]:
         """Return all legal actions for the player with priority.
 
-        Currently, all actions are always legal (no mana/timing restrictions).
+        Currently, PASS and every action that casts a spell in ``spells``
+        are always legal (no mana/timing restrictions). The returned
+        actions are the interned instances from ``spells.actions``.
 
         Returns:
             A list of legal actions.
         """
-        return [
-            Action(ActionType.CAST_A),
-            Action(ActionType.CAST_B),
-            Action(ActionType.PASS),
-        ]
+        return list(self.legal_action_tuple())
+
+    def legal_action_tuple(self) -> tuple[Action, ...]:
+        """Return the legal actions as a shared tuple, without allocating.
+
+        The tuple is ``spells.actions`` when every action of the registry is
+        legal, otherwise ``MASK_ACTIONS[mask]``. Do not mutate it.
+
+        Returns:
+            The interned legal actions.
+        """
+        mask = self.legal_action_mask()
+        spells = self.spells
+        return spells.actions if mask == spells.action_mask else MASK_ACTIONS[mask]
+
+    def legal_action_mask(self) -> int:
+        """Return the legal actions as a bitmask.
+
+        Bit ``i`` is set if ``ACTION_TYPES[i]`` is legal. Use
+        ``MASK_ACTIONS[mask]`` to get the matching interned actions without
+        allocating. Parametric CAST actions have no code, so they are not
+        in the mask; use ``legal_actions`` for registries that use them.
+
+        Returns:
+            The legal-action bitmask.
+        """
+        return self.spells.action_mask
+
+    def legal_action_mask_into(self, out: Any, offset: int = 0) -> None:
+        """Write the legal-action mask as 0/1 values into a buffer.
 
-    def apply(self, action: Action) -> None:
+        Args:
+            out: Writable buffer (e.g. a bool or float NumPy array, or an
+                ``array``) with at least ``offset + len(ACTION_TYPES)``
+                elements, indexed by action code.
+            offset: Index of the first element to write.
+        """
+        mask = self.legal_action_mask()
+        for i in range(len(ACTION_TYPES)):
+            out[offset + i] = mask >> i & 1
+
+    def apply(self, action: Action) -> UndoRecord:
         """Apply an action to the game state.
 
         This method implements the core game rules for action resolution:
 
-        **Casting a spell (CAST_A or CAST_B):**
-        1. Push the spell onto the stack
+        **Casting a spell (CAST_A, CAST_B or CAST):**
+        1. Push the spell's stack item (from ``spells``) onto the stack
         2. Reset pass_streak to 0
         3. Pass priority to the opponent
 
@@ -82,58 +215,148 @@ class Game:
              - Reset pass_streak to 0
              - Priority goes to the new active player
 
+        Actions are dispatched through a table of per-type handlers.
+        Invariants are checked according to ``check_interval``.
+
         Args:
             action: The action to apply.
 
+        Returns:
+            An UndoRecord that ``undo`` can use to restore the prior state.
+
         Raises:
-            GameInvariantError: If the action results in an invalid game state.
+            GameInvariantError: If the action results in an invalid game state
+                (only detected on actions where invariants are checked).
+            KeyError: If the action casts no spell in ``spells``.
         """
+        record = self._DISPATCH[action.type](self, action)
+
+        interval = self.check_interval
+        if interval:
+            self._unchecked += 1
+            if self._unchecked >= interval:
+                self._unchecked = 0
+                self._assert_invariants()
+        if self.check_keys:
+            self._assert_key()
+        return record
+
+    def _cast(self, action: Action) -> UndoRecord:
+        """Push the spell cast by ``action`` and pass priority."""
         state = self.state
         priority_player = state.priority_player
+        pass_streak = state.pass_streak
+        key = state.key
+        stack = state.stack
+
+        spell = self.spells.spell_for_action(action)
+        item = spell.items[priority_player]
+        record = UndoRecord(
+            state.turn,
+            state.active_player,
+            priority_player,
+            pass_streak,
+            key,
+            pushed=True,
+        )
+
+        key ^= stack_key(len(stack), item)
+        stack.push_id(spell.item_ids[priority_player])
+        state.pass_streak = 0
+        state.priority_player = 1 - priority_player
+        state.key = (
+            key
+            ^ PRIORITY_KEYS[priority_player]
+            ^ PRIORITY_KEYS[1 - priority_player]
+            ^ PASS_STREAK_KEYS[pass_streak]
+            ^ PASS_STREAK_KEYS[0]
+        )
+        return record
+
+    def _pass(self, action: Action) -> UndoRecord:
+        """Pass priority; on a second consecutive pass, resolve or advance."""
+        state = self.state
+        priority_player = state.priority_player
+        pass_streak = state.pass_streak
+        turn = state.turn
+        active_player = state.active_player
+        old_key = state.key
+        key = old_key ^ PRIORITY_KEYS[priority_player] ^ PASS_STREAK_KEYS[pass_streak]
+
+        if pass_streak == 0:
+            state.pass_streak = 1
+            state.priority_player = 1 - priority_player
+            state.key = key ^ PRIORITY_KEYS[1 - priority_player] ^ PASS_STREAK_KEYS[1]
+            return UndoRecord(turn, active_player, priority_player, 0, old_key)
+
+        # Both players passed in succession
+        state.pass_streak = 0
+        stack = state.stack
+        if stack:
+            # Resolve the top item on the stack
+            item = stack.pop()
+            target = 1 - item.controller
+            player = state.players[target]
+            damage = item.damage_to_opponent
+            key ^= stack_key(len(stack), item) ^ life_key(target, player.life)
+            player.life -= damage
+            state.priority_player = active_player
+            state.key = (
+                key
+                ^ life_key(target, player.life)
+                ^ PRIORITY_KEYS[active_player]
+                ^ PASS_STREAK_KEYS[0]
+            )
+            return UndoRecord(
+                turn,
+                active_player,
+                priority_player,
+                pass_streak,
+                old_key,
+                popped=item,
+                life_player=target,
+                life_delta=-damage,
+            )
+
+        # Advance to next turn
+        new_active = 1 - active_player
+        state.turn = turn + 1
+        state.active_player = new_active
+        state.priority_player = new_active
+        state.key = (
+            key
+            ^ turn_key(turn)
+            ^ turn_key(turn + 1)
+            ^ ACTIVE_KEYS[active_player]
+            ^ ACTIVE_KEYS[new_active]
+            ^ PRIORITY_KEYS[new_active]
+            ^ PASS_STREAK_KEYS[0]
+        )
+        return UndoRecord(turn, active_player, priority_player, pass_streak, old_key)
+
+    def undo(self, record: UndoRecord) -> None:
+        """Reverse the ``apply`` call that produced ``record``.
+
+        Records must be undone in reverse order of application (most
+        recent first); each undo is O(1).
 
-        match action.type:
-            case ActionType.CAST_A:
-                state.stack.push(
-                    StackItem(
-                        name="A",
-                        controller=priority_player,
-                        damage_to_opponent=3,
-                    )
-                )
-                state.pass_streak = 0
-                state.priority_player = state.opponent(priority_player)
-
-            case ActionType.CAST_B:
-                state.stack.push(
-                    StackItem(
-                        name="B",
-                        controller=priority_player,
-                        damage_to_opponent=2,
-                    )
-                )
-                state.pass_streak = 0
-                state.priority_player = state.opponent(priority_player)
-
-            case ActionType.PASS:
-                state.pass_streak += 1
-                state.priority_player = state.opponent(priority_player)
-
-                if state.pass_streak >= 2:
-                    if not state.stack.is_empty():
-                        # Resolve the top item on the stack
-                        item = state.stack.pop()
-                        opponent = state.opponent(item.controller)
-                        state.players[opponent].life -= item.damage_to_opponent
-                        state.pass_streak = 0
-                        state.priority_player = state.active_player
-                    else:
-                        # Advance to next turn
-                        state.turn += 1
-                        state.active_player = state.opponent(state.active_player)
-                        state.pass_streak = 0
-                        state.priority_player = state.active_player
-
-        self._assert_invariants()
+        Args:
+            record: The record returned by the most recent un-undone apply.
+        """
+        state = self.state
+        if record.pushed:
+            state.stack.pop()
+        elif record.popped is not None:
+            state.stack.push(record.popped)
+        if record.life_player >= 0:
+            state.players[record.life_player].life -= record.life_delta
+        state.turn = record.turn
+        state.active_player = record.active_player
+        state.priority_player = record.priority_player
+        state.pass_streak = record.pass_streak
+        state.key = record.key
+        if self.check_keys:
+            self._assert_key()
 
     def _assert_invariants(self) -> None:
         """Check that game state invariants hold.
@@ -173,6 +396,18 @@ class Game:
         if state.turn < 1:
             raise GameInvariantError(f"turn must be positive, got {state.turn}")
 
+    def _assert_key(self) -> None:
+        """Check the incremental Zobrist key against a full recomputation.
+
+        Raises:
+            GameInvariantError: If the keys differ.
+        """
+        expected = compute_key(self.state)
+        if self.state.key != expected:
+            raise GameInvariantError(
+                f"state key {self.state.key:#018x} != recomputed {expected:#018x}"
+            )
+
     def is_over(self) -> bool:
         """Check if the game is over.
 
@@ -201,3 +436,11 @@ class Game:
         else:
             # Both dead or neither dead (shouldn't happen if is_over is true)
             return None
+
+
+# Handler for each action type, called as handler(game, action). Every action
+# other than PASS casts a spell from the game's registry.
+Game._DISPATCH = {
+    action_type: Game._pass if action_type is ActionType.PASS else Game._cast
+    for action_type in ActionType
+}
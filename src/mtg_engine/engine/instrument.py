@@ -0,0 +1,229 @@
+"""Opt-in instrumentation for Game: counters, timings and a latency histogram.
+
+``instrument(game)`` shadows ``game.apply`` and ``game._assert_invariants``
+with timed wrappers on that one instance; ``uninstrument(game)`` deletes
+them again. The Game class is never modified, so games that are not
+instrumented run exactly the same code as before and pay nothing.
+
+One GameMetrics can be shared by many games (e.g. every game in a
+self-play worker) and merged across processes. ``snapshot`` returns plain
+JSON-ready data, ``write_json`` replaces a file atomically for periodic
+dumps, and ``prometheus_text`` renders the Prometheus text format for
+scraping.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+from array import array
+from typing import Any
+
+from mtg_engine.engine.actions import Action, ActionType
+from mtg_engine.engine.game import Game, UndoRecord
+
+# Number of latency buckets; bucket b counts applies taking fewer than
+# 2**b nanoseconds (and at least 2**(b - 1)), the last bucket is open-ended.
+HISTOGRAM_BUCKETS = 40
+
+_PASS = ActionType.PASS
+
+# Every action type, parametric CAST included, and the index of each type's
+# counter in ``GameMetrics.actions``
+_ACTION_TYPES = tuple(ActionType)
+_TYPE_INDEX = {t: i for i, t in enumerate(_ACTION_TYPES)}
+
+
+class GameMetrics:
+    """Counters and timings collected from instrumented games.
+
+    Attributes:
+        actions: Applies per action type, in ``ActionType`` order.
+        resolutions: Stack items resolved.
+        turn_advances: Turns advanced.
+        invariant_checks: Invariant checks run.
+        invariant_ns: Total time spent checking invariants, in nanoseconds.
+        apply_ns: Total time spent in ``apply``, in nanoseconds (including
+            invariant checks).
+        latency: Apply latency histogram (see ``HISTOGRAM_BUCKETS``).
+    """
+
+    def __init__(self) -> None:
+        """Initialize all counters to zero."""
+        self.actions: array[int] = array("Q", [0]) * len(_ACTION_TYPES)
+        self.latency: array[int] = array("Q", [0]) * HISTOGRAM_BUCKETS
+        self.resolutions: int = 0
+        self.turn_advances: int = 0
+        self.invariant_checks: int = 0
+        self.invariant_ns: int = 0
+        self.apply_ns: int = 0
+
+    def reset(self) -> None:
+        """Zero every counter."""
+        self.__init__()
+
+    @property
+    def total_actions(self) -> int:
+        """Total number of applies."""
+        return sum(self.actions)
+
+    def merge(self, other: GameMetrics) -> None:
+        """Add another GameMetrics' counts into this one.
+
+        Args:
+            other: Metrics to add, e.g. returned from a worker process.
+        """
+        for i, n in enumerate(other.actions):
+            self.actions[i] += n
+        for i, n in enumerate(other.latency):
+            self.latency[i] += n
+        self.resolutions += other.resolutions
+        self.turn_advances += other.turn_advances
+        self.invariant_checks += other.invariant_checks
+        self.invariant_ns += other.invariant_ns
+        self.apply_ns += other.apply_ns
+
+    def latency_quantile(self, q: float) -> int:
+        """Upper bound, in nanoseconds, of the ``q`` quantile of apply latency.
+
+        Args:
+            q: Quantile in [0, 1].
+
+        Returns:
+            The upper edge of the histogram bucket containing the quantile,
+            or 0 if nothing has been recorded.
+        """
+        total = sum(self.latency)
+        if total == 0:
+            return 0
+        rank = q * total
+        seen = 0
+        for bucket, n in enumerate(self.latency):
+            seen += n
+            if seen >= rank and n:
+                return 1 << bucket
+        return 1 << (HISTOGRAM_BUCKETS - 1)
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return the metrics as JSON-serializable data.
+
+        Returns:
+            A dict of counters, totals in seconds, latency quantiles and
+            the non-empty histogram buckets as ``[upper_bound_ns, count]``.
+        """
+        return {
+            "actions": {t.name: self.actions[i] for i, t in enumerate(_ACTION_TYPES)},
+            "resolutions": self.resolutions,
+            "turn_advances": self.turn_advances,
+            "invariant_checks": self.invariant_checks,
+            "invariant_seconds": self.invariant_ns / 1e9,
+            "apply_seconds": self.apply_ns / 1e9,
+            "apply_latency_ns": {
+                "p50": self.latency_quantile(0.5),
+                "p99": self.latency_quantile(0.99),
+                "buckets": [[1 << b, n] for b, n in enumerate(self.latency) if n],
+            },
+        }
+
+    def write_json(self, path: str | os.PathLike[str]) -> None:
+        """Atomically replace ``path`` with the current snapshot as JSON.
+
+        Readers polling the file never see a partially written dump.
+        """
+        tmp = f"{os.fspath(path)}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.snapshot(), f, indent=2)
+            f.write("\n")
+        os.replace(tmp, path)
+
+    def prometheus_text(self, prefix: str = "mtg_engine") -> str:
+        """Render the metrics in the Prometheus text exposition format.
+
+        Args:
+            prefix: Metric name prefix.
+
+        Returns:
+            The exposition text, ending with a newline.
+        """
+        lines = [f"# TYPE {prefix}_actions_total counter"]
+        for i, action_type in enumerate(_ACTION_TYPES):
+            lines.append(
+                f'{prefix}_actions_total{{action="{action_type.name}"}} '
+                f"{self.actions[i]}"
+            )
+        for name, value in (
+            ("resolutions_total", self.resolutions),
+            ("turn_advances_total", self.turn_advances),
+            ("invariant_checks_total", self.invariant_checks),
+            ("invariant_seconds_total", self.invariant_ns / 1e9),
+        ):
+            lines.append(f"# TYPE {prefix}_{name} counter")
+            lines.append(f"{prefix}_{name} {value}")
+
+        name = f"{prefix}_apply_seconds"
+        lines.append(f"# TYPE {name} histogram")
+        cumulative = 0
+        for bucket in range(HISTOGRAM_BUCKETS - 1):
+            cumulative += self.latency[bucket]
+            lines.append(f'{name}_bucket{{le="{(1 << bucket) / 1e9:g}"}} {cumulative}')
+        cumulative += self.latency[-1]
+        lines.append(f'{name}_bucket{{le="+Inf"}} {cumulative}')
+        lines.append(f"{name}_sum {self.apply_ns / 1e9}")
+        lines.append(f"{name}_count {cumulative}")
+        return "\n".join(lines) + "\n"
+
+
+def instrument(game: Game, metrics: GameMetrics | None = None) -> GameMetrics:
+    """Start collecting metrics from ``game``.
+
+    Args:
+        game: The game to instrument. Instrumenting it again replaces the
+            previous wrappers.
+        metrics: Where to record. A new GameMetrics if None.
+
+    Returns:
+        The GameMetrics being recorded into.
+    """
+    uninstrument(game)
+    if metrics is None:
+        metrics = GameMetrics()
+
+    apply = game.apply
+    check = game._assert_invariants
+    actions = metrics.actions
+    latency = metrics.latency
+    last_bucket = HISTOGRAM_BUCKETS - 1
+    codes = _TYPE_INDEX
+    clock = time.perf_counter_ns
+
+    def timed_check() -> None:
+        start = clock()
+        try:
+            check()
+        finally:
+            metrics.invariant_ns += clock() - start
+            metrics.invariant_checks += 1
+
+    def timed_apply(action: Action) -> UndoRecord:
+        start = clock()
+        record = apply(action)
+        elapsed = clock() - start
+        metrics.apply_ns += elapsed
+        latency[min(elapsed.bit_length(), last_bucket)] += 1
+        actions[codes[action.type]] += 1
+        if record.popped is not None:
+            metrics.resolutions += 1
+        elif record.pass_streak == 1 and action.type is _PASS:
+            metrics.turn_advances += 1
+        return record
+
+    game.apply = timed_apply
+    game._assert_invariants = timed_check
+    return metrics
+
+
+def uninstrument(game: Game) -> None:
+    """Stop collecting metrics from ``game`` (a no-op if not instrumented)."""
+    vars(game).pop("apply", None)
+    vars(game).pop("_assert_invariants", None)
@@ -0,0 +1,358 @@
+"""Persistent game state - immutable states that share structure.
+
+A PersistentState is never modified. Applying an action builds a new
+state that shares every unchanged part with its parent: the stack is a
+cons list whose tail is reused, and a player record is only replaced when
+that player's life changes. Branching a search or keeping many sibling
+states alive is therefore O(1) per state, independent of stack depth.
+
+PersistentGame wraps a PersistentState behind the same interface as
+Game (``apply`` / ``undo`` / ``legal_actions`` / ...), so search code can
+run on either; its undo records are simply the previous states.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+
+from mtg_engine.engine.actions import Action, ActionType
+from mtg_engine.engine.phases import Phase
+from mtg_engine.engine.spells import DEFAULT_SPELLS, SpellRegistry
+from mtg_engine.engine.stack import Stack, StackItem
+from mtg_engine.engine.state import GameState, PlayerState
+from mtg_engine.engine.zobrist import (
+    ACTIVE_KEYS,
+    PASS_STREAK_KEYS,
+    PRIORITY_KEYS,
+    compute_key,
+    life_key,
+    stack_key,
+    turn_key,
+)
+
+
+@dataclass(frozen=True, slots=True)
+class PersistentPlayer:
+    """Immutable state for a single player.
+
+    Attributes:
+        life: The player's current life total.
+    """
+
+    life: int
+
+
+@dataclass(frozen=True, slots=True)
+class StackNode:
+    """One cell of a persistent stack (a cons list, top first).
+
+    Attributes:
+        item: The stack item in this cell.
+        below: The rest of the stack, or None at the bottom.
+        depth: Number of items from this cell to the bottom, inclusive.
+    """
+
+    item: StackItem
+    below: StackNode | None
+    depth: int
+
+
+def iter_stack(node: StackNode | None) -> Iterator[StackItem]:
+    """Iterate over a persistent stack's items, top first."""
+    while node is not None:
+        yield node.item
+        node = node.below
+
+
+@dataclass(frozen=True, slots=True)
+class PersistentState:
+    """Immutable, structurally shared game state.
+
+    Mirrors GameState field for field, except that the players are a
+    tuple of PersistentPlayers and the stack is a StackNode chain (None
+    when empty). Equal states compare equal regardless of sharing, and
+    hash by their Zobrist key.
+
+    Attributes:
+        turn: Current turn number (starts at 1).
+        active_player: Index of the player whose turn it is (0 or 1).
+        priority_player: Index of the player who currently has priority.
+        phase: Current phase of the turn.
+        pass_streak: Number of consecutive passes across both players.
+        players: Player states (always length 2).
+        stack: Top cell of the stack, or None if it is empty.
+        key: 64-bit Zobrist key, equal to that of the matching GameState.
+    """
+
+    turn: int
+    active_player: int
+    priority_player: int
+    phase: Phase
+    pass_streak: int
+    players: tuple[PersistentPlayer, PersistentPlayer]
+    stack: StackNode | None = None
+    key: int = field(default=0, compare=False, repr=False)
+
+    def __post_init__(self) -> None:
+        """Compute the Zobrist key if one was not supplied."""
+        if self.key == 0:
+            object.__setattr__(self, "key", compute_key(self.to_state()))
+
+    def __hash__(self) -> int:
+        return self.key
+
+    @classmethod
+    def from_state(cls, state: GameState) -> PersistentState:
+        """Build a persistent copy of a mutable GameState.
+
+        Args:
+            state: The state to copy.
+
+        Returns:
+            An equal PersistentState with the same key.
+        """
+        node = None
+        for depth, item in enumerate(state.stack.items(), start=1):
+            node = StackNode(item, node, depth)
+        return cls(
+            turn=state.turn,
+            active_player=state.active_player,
+            priority_player=state.priority_player,
+            phase=state.phase,
+            pass_streak=state.pass_streak,
+            players=(
+                PersistentPlayer(state.players[0].life),
+                PersistentPlayer(state.players[1].life),
+            ),
+            stack=node,
+            key=state.key,
+        )
+
+    def to_state(self) -> GameState:
+        """Materialize a mutable GameState equal to this state.
+
+        Returns:
+            A new GameState.
+        """
+        stack = Stack()
+        for item in reversed(list(iter_stack(self.stack))):
+            stack.push(item)
+        return GameState(
+            turn=self.turn,
+            active_player=self.active_player,
+            priority_player=self.priority_player,
+            phase=self.phase,
+            pass_streak=self.pass_streak,
+            players=[PlayerState(life=p.life) for p in self.players],
+            stack=stack,
+            key=self.key,
+        )
+
+    @property
+    def stack_depth(self) -> int:
+        """Number of items on the stack."""
+        return self.stack.depth if self.stack is not None else 0
+
+    def apply(
+        self, action: Action, spells: SpellRegistry = DEFAULT_SPELLS
+    ) -> PersistentState:
+        """Return the state reached by applying ``action``.
+
+        Follows exactly the rules of ``Game.apply``; this state is left
+        unchanged.
+
+        Args:
+            action: The action to apply.
+            spells: Spell registry defining each cast action.
+
+        Returns:
+            The successor state.
+
+        Raises:
+            KeyError: If the action casts no spell in ``spells``.
+        """
+        priority_player = self.priority_player
+        pass_streak = self.pass_streak
+        key = self.key ^ PRIORITY_KEYS[priority_player] ^ PASS_STREAK_KEYS[pass_streak]
+
+        if action.type is not ActionType.PASS:
+            item = spells.spell_for_action(action).items[priority_player]
+            depth = self.stack_depth
+            return PersistentState(
+                self.turn,
+                self.active_player,
+                1 - priority_player,
+                self.phase,
+                0,
+                self.players,
+                StackNode(item, self.stack, depth + 1),
+                key
+                ^ stack_key(depth, item)
+                ^ PRIORITY_KEYS[1 - priority_player]
+                ^ PASS_STREAK_KEYS[0],
+            )
+
+        if pass_streak == 0:
+            return PersistentState(
+                self.turn,
+                self.active_player,
+                1 - priority_player,
+                self.phase,
+                1,
+                self.players,
+                self.stack,
+                key ^ PRIORITY_KEYS[1 - priority_player] ^ PASS_STREAK_KEYS[1],
+            )
+
+        active_player = self.active_player
+        node = self.stack
+        if node is not None:
+            # Resolve the top item on the stack
+            item = node.item
+            target = 1 - item.controller
+            life = self.players[target].life
+            new_life = life - item.damage_to_opponent
+            player = PersistentPlayer(new_life)
+            players = (
+                (player, self.players[1]) if target == 0 else (self.players[0], player)
+            )
+            return PersistentState(
+                self.turn,
+                active_player,
+                active_player,
+                self.phase,
+                0,
+                players,
+                node.below,
+                key
+                ^ stack_key(node.depth - 1, item)
+                ^ life_key(target, life)
+                ^ life_key(target, new_life)
+                ^ PRIORITY_KEYS[active_player]
+                ^ PASS_STREAK_KEYS[0],
+            )
+
+        # Advance to next turn
+        new_active = 1 - active_player
+        return PersistentState(
+            self.turn + 1,
+            new_active,
+            new_active,
+            self.phase,
+            0,
+            self.players,
+            None,
+            key
+            ^ turn_key(self.turn)
+            ^ turn_key(self.turn + 1)
+            ^ ACTIVE_KEYS[active_player]
+            ^ ACTIVE_KEYS[new_active]
+            ^ PRIORITY_KEYS[new_active]
+            ^ PASS_STREAK_KEYS[0],
+        )
+
+
+class PersistentGame:
+    """A game over PersistentStates, with the Game interface.
+
+    ``apply`` swaps in the successor state and returns the previous one as
+    the undo record, so apply, undo and clone are all O(1).
+
+    Attributes:
+        state: The current (immutable) state.
+        spells: Spell registry defining each cast action.
+    """
+
+    def __init__(
+        self, state: PersistentState, spells: SpellRegistry = DEFAULT_SPELLS
+    ) -> None:
+        """Initialize a game at the given state.
+
+        Args:
+            state: The initial state.
+            spells: Spell registry defining each cast action.
+        """
+        self.state: PersistentState = state
+        self.spells: SpellRegistry = spells
+
+    @classmethod
+    def new(
+        cls, starting_life: int = 20, spells: SpellRegistry = DEFAULT_SPELLS
+    ) -> PersistentGame:
+        """Create a new game with default initial state.
+
+        Args:
+            starting_life: Starting life total for each player.
+            spells: Spell registry defining each cast action.
+
+        Returns:
+            A new PersistentGame ready to play.
+        """
+        player = PersistentPlayer(starting_life)
+        state = PersistentState(
+            turn=1,
+            active_player=0,
+            priority_player=0,
+            phase=Phase.MAIN,
+            pass_streak=0,
+            players=(player, player),
+        )
+        return cls(state, spells)
+
+    def clone(self) -> PersistentGame:
+        """Return an independent game at the same state, in O(1)."""
+        return PersistentGame(self.state, self.spells)
+
+    def legal_actions(self) -> list[Action]:
+        """Return all legal actions for the player with priority."""
+        return list(self.legal_action_tuple())
+
+    def legal_action_tuple(self) -> tuple[Action, ...]:
+        """Return the legal actions as a shared tuple (see ``Game``)."""
+        return self.spells.actions
+
+    def legal_action_mask(self) -> int:
+        """Return the legal actions as a bitmask (see ``Game``)."""
+        return self.spells.action_mask
+
+    def apply(self, action: Action) -> PersistentState:
+        """Apply an action, replacing the current state.
+
+        Args:
+            action: The action to apply.
+
+        Returns:
+            The previous state, which ``undo`` accepts as a record.
+        """
+        previous = self.state
+        self.state = previous.apply(action, self.spells)
+        return previous
+
+    def undo(self, record: PersistentState) -> None:
+        """Return to the state before the ``apply`` that produced ``record``.
+
+        Args:
+            record: A state returned by ``apply``.
+        """
+        self.state = record
+
+    def is_over(self) -> bool:
+        """Check if the game is over (any player has life <= 0)."""
+        players = self.state.players
+        return players[0].life <= 0 or players[1].life <= 0
+
+    def winner(self) -> int | None:
+        """Determine the winner, as ``Game.winner`` does.
+
+        Returns:
+            The index of the winning player, or None if the game is not over
+            or both players are at <= 0 life.
+        """
+        p0_alive = self.state.players[0].life > 0
+        p1_alive = self.state.players[1].life > 0
+        if p0_alive and not p1_alive:
+            return 0
+        if p1_alive and not p0_alive:
+            return 1
+        return None
@@ -0,0 +1,296 @@
+"""Spell registry - data-driven spell definitions.
+
+Spells are described by plain SpellDefinitions, written in Python or
+loaded from a TOML file, and compiled once into a SpellRegistry. Each
+compiled Spell carries a prebuilt, interned StackItem per controller, so
+casting is a table lookup with no per-spell branching or allocation.
+
+A spell is cast either by a fixed action type (CAST_A, CAST_B), which has
+an integer action code, or by the parametric CAST action carrying its
+spell id, so a registry can hold any number of spells.
+
+TOML format::
+
+    [[spell]]
+    name = "A"
+    action = "CAST_A"
+    damage_to_opponent = 3
+
+    [[spell]]
+    name = "Lightning Bolt"
+    action = "CAST"
+    damage_to_opponent = 3
+"""
+
+from __future__ import annotations
+
+import os
+import tomllib
+from collections.abc import Iterable, Iterator, Mapping
+from dataclasses import dataclass
+from typing import Any
+
+from mtg_engine.engine.actions import ACTION_CODES, MASK_ACTIONS, Action, ActionType
+from mtg_engine.engine.stack import ITEM_POOL, StackItem
+
+# Most spells a registry can hold: stack items are encoded as
+# ``spell_id * 2 + controller`` in 16 bits, and searches index the
+# registry's actions in signed 16 bits
+MAX_SPELLS = 0x7FFF
+
+# Range of ``damage_to_opponent``; the Zobrist stack key hashes 16 bits of it
+MIN_DAMAGE = -0x8000
+MAX_DAMAGE = 0x7FFF
+
+
+@dataclass(frozen=True, slots=True)
+class SpellDefinition:
+    """Source description of a spell.
+
+    Attributes:
+        name: Display name, unique within a registry.
+        action: The action type that casts this spell. CAST casts it by
+            spell id; a fixed type binds it to that action.
+        damage_to_opponent: Damage dealt to the caster's opponent on
+            resolution.
+    """
+
+    name: str
+    action: ActionType
+    damage_to_opponent: int = 0
+
+
+@dataclass(frozen=True, slots=True)
+class Spell:
+    """A compiled spell.
+
+    Attributes:
+        id: Index of the spell in its registry.
+        name: Display name.
+        action: The action type that casts this spell.
+        damage_to_opponent: Damage dealt to the caster's opponent.
+        items: The stack item pushed when player 0 or player 1 casts it.
+        item_ids: ``ITEM_POOL`` ids of ``items``.
+    """
+
+    id: int
+    name: str
+    action: ActionType
+    damage_to_opponent: int
+    items: tuple[StackItem, StackItem]
+    item_ids: tuple[int, int]
+
+
+class SpellRegistry:
+    """Compiled lookup tables for a set of spells.
+
+    Attributes:
+        spells: Compiled spells, indexed by spell id.
+        by_action: Spell bound to each fixed castable action type.
+        by_name: Spell with each name.
+        packed_by_item_id: ``spell_id * 2 + controller`` for the ``ITEM_POOL``
+            id of each of the registry's stack items.
+        action_mask: Legal-action bitmask: PASS plus every fixed castable
+            action type. Parametric CAST actions have no bit.
+        actions: Every castable action plus PASS: the fixed action types
+            in code order, then a CAST action per remaining spell.
+        action_index: Position of each action in ``actions``.
+    """
+
+    def __init__(self, definitions: Iterable[SpellDefinition]) -> None:
+        """Compile spell definitions.
+
+        Args:
+            definitions: The spells, in spell-id order.
+
+        Raises:
+            ValueError: If a name or fixed action is used twice, a spell is
+                bound to PASS, there are more than ``MAX_SPELLS`` spells, or
+                a damage value is outside ``MIN_DAMAGE..MAX_DAMAGE``.
+        """
+        spells: list[Spell] = []
+        by_action: dict[ActionType, Spell] = {}
+        by_name: dict[str, Spell] = {}
+        definitions = list(definitions)
+        if len(definitions) > MAX_SPELLS:
+            raise ValueError(f"a registry holds at most {MAX_SPELLS} spells")
+        for spell_id, definition in enumerate(definitions):
+            name, action = definition.name, definition.action
+            if action is ActionType.PASS:
+                raise ValueError(f"spell {name!r} cannot be cast by PASS")
+            if name in by_name:
+                raise ValueError(f"duplicate spell name {name!r}")
+            if action in by_action:
+                raise ValueError(
+                    f"{action.name} already casts spell {by_action[action].name!r}"
+                )
+            damage = definition.damage_to_opponent
+            if not MIN_DAMAGE <= damage <= MAX_DAMAGE:
+                raise ValueError(
+                    f"spell {name!r} damage {damage} is outside "
+                    f"{MIN_DAMAGE}..{MAX_DAMAGE}"
+                )
+            ids = (
+                ITEM_POOL.intern(StackItem(name, 0, damage)),
+                ITEM_POOL.intern(StackItem(name, 1, damage)),
+            )
+            spell = Spell(
+                id=spell_id,
+                name=name,
+                action=action,
+                damage_to_opponent=damage,
+                items=(ITEM_POOL[ids[0]], ITEM_POOL[ids[1]]),
+                item_ids=ids,
+            )
+            spells.append(spell)
+            if action is not ActionType.CAST:
+                by_action[action] = spell
+            by_name[name] = spell
+
+        self.spells: tuple[Spell, ...] = tuple(spells)
+        self.by_action: dict[ActionType, Spell] = by_action
+        self.by_name: dict[str, Spell] = by_name
+        self.packed_by_item_id: dict[int, int] = {
+            item_id: spell.id * 2 + controller
+            for spell in spells
+            for controller, item_id in enumerate(spell.item_ids)
+        }
+        self.action_mask: int = 1 << ACTION_CODES[ActionType.PASS]
+        for action in by_action:
+            self.action_mask |= 1 << ACTION_CODES[action]
+        self.actions: tuple[Action, ...] = MASK_ACTIONS[self.action_mask] + tuple(
+            Action(ActionType.CAST, spell.id)
+            for spell in spells
+            if spell.action is ActionType.CAST
+        )
+        self.action_index: dict[Action, int] = {
+            action: i for i, action in enumerate(self.actions)
+        }
+
+    @classmethod
+    def from_mapping(cls, data: Mapping[str, Any]) -> SpellRegistry:
+        """Compile spells from parsed TOML-style data.
+
+        Args:
+            data: A mapping with a ``spell`` list of tables, each holding
+                ``name``, ``action`` (an ActionType name) and optionally
+                ``damage_to_opponent``.
+
+        Returns:
+            The compiled registry.
+
+        Raises:
+            ValueError: If an entry is malformed or names an unknown action.
+        """
+        definitions = []
+        for entry in data.get("spell", []):
+            try:
+                action = ActionType[entry["action"]]
+                definitions.append(
+                    SpellDefinition(
+                        name=str(entry["name"]),
+                        action=action,
+                        damage_to_opponent=int(entry.get("damage_to_opponent", 0)),
+                    )
+                )
+            except KeyError as e:
+                raise ValueError(f"invalid spell entry {entry!r}: {e}") from e
+        return cls(definitions)
+
+    @classmethod
+    def from_toml(cls, path: str | os.PathLike[str]) -> SpellRegistry:
+        """Load and compile spells from a TOML file.
+
+        Args:
+            path: The file to read.
+
+        Returns:
+            The compiled registry.
+
+        Raises:
+            ValueError: If the file is not valid spell TOML.
+        """
+        with open(path, "rb") as f:
+            return cls.from_mapping(tomllib.load(f))
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        """Pickle as definitions, since ``ITEM_POOL`` ids are process-local."""
+        definitions = tuple(
+            SpellDefinition(s.name, s.action, s.damage_to_opponent) for s in self.spells
+        )
+        return (SpellRegistry, (definitions,))
+
+    def __len__(self) -> int:
+        """Return the number of spells."""
+        return len(self.spells)
+
+    def __iter__(self) -> Iterator[Spell]:
+        """Iterate over spells in id order."""
+        return iter(self.spells)
+
+    def spell_for_action(self, action: Action) -> Spell:
+        """Return the spell cast by an action.
+
+        Args:
+            action: A cast action.
+
+        Returns:
+            The spell bound to ``action.type``, or for CAST the spell
+            with id ``action.spell``.
+
+        Raises:
+            KeyError: If the action casts no spell in this registry.
+        """
+        if action.type is ActionType.CAST:
+            if 0 <= action.spell < len(self.spells):
+                spell = self.spells[action.spell]
+                if spell.action is ActionType.CAST:
+                    return spell
+            raise KeyError(f"CAST of spell id {action.spell} casts no spell")
+        spell = self.by_action.get(action.type)
+        if spell is None:
+            raise KeyError(f"{action.type.name} casts no spell")
+        return spell
+
+    def require_action_codes(self, consumer: str) -> None:
+        """Check that every action of the registry has an integer code.
+
+        Consumers that store actions as codes (records, replay buffers,
+        batched games) cannot represent parametric CAST actions.
+
+        Args:
+            consumer: Name of the consumer, for the error message.
+
+        Raises:
+            ValueError: If a spell is cast by the parametric CAST action.
+        """
+        for spell in self.spells:
+            if spell.action is ActionType.CAST:
+                raise ValueError(
+                    f"{consumer} needs a fixed cast action per spell; "
+                    f"{spell.name!r} uses the parametric CAST action"
+                )
+
+    def spell_for(self, item: StackItem) -> Spell | None:
+        """Return the spell a stack item was cast from.
+
+        Args:
+            item: A stack item.
+
+        Returns:
+            The matching spell, or None if ``item`` is not one of this
+            registry's stack items.
+        """
+        spell = self.by_name.get(item.name)
+        if spell is None or item not in spell.items:
+            return None
+        return spell
+
+
+# The prototype's two damage spells
+DEFAULT_SPELLS = SpellRegistry(
+    [
+        SpellDefinition("A", ActionType.CAST_A, damage_to_opponent=3),
+        SpellDefinition("B", ActionType.CAST_B, damage_to_opponent=2),
+    ]
+)
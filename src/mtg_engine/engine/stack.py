@@ -1,5 +1,6 @@
 """The stack - spells and abilities waiting to resolve."""
 
+from array import array
 from dataclasses import dataclass, field
 
 
@@ -18,15 +19,80 @@ class StackItem:
     damage_to_opponent: int
 
 
-@dataclass
+class StackItemPool:
+    """Interning table mapping each distinct StackItem to a small integer id.
+
+    StackItems are immutable and there are only a handful of distinct
+    values (spells x controllers), so every equal item is stored once and
+    stacks refer to items by id. Ids are assigned in first-seen order and
+    are only meaningful within one process.
+    """
+
+    # Ids must fit the Stack's unsigned 16-bit storage
+    MAX_ITEMS = 1 << 16
+
+    def __init__(self) -> None:
+        """Initialize an empty pool."""
+        self._items: list[StackItem] = []
+        self._ids: dict[StackItem, int] = {}
+
+    def intern(self, item: StackItem) -> int:
+        """Return the id of ``item``, adding it to the pool if needed.
+
+        Args:
+            item: The item to intern.
+
+        Returns:
+            The item's id.
+
+        Raises:
+            ValueError: If the pool already holds ``MAX_ITEMS`` items.
+        """
+        item_id = self._ids.get(item)
+        if item_id is None:
+            item_id = len(self._items)
+            if item_id >= self.MAX_ITEMS:
+                raise ValueError(f"stack item pool is full ({self.MAX_ITEMS} items)")
+            self._items.append(item)
+            self._ids[item] = item_id
+        return item_id
+
+    def __getitem__(self, item_id: int) -> StackItem:
+        """Return the shared item with the given id."""
+        return self._items[item_id]
+
+    def __len__(self) -> int:
+        """Return the number of interned items."""
+        return len(self._items)
+
+
+# Process-wide pool shared by every Stack
+ITEM_POOL = StackItemPool()
+
+
+@dataclass(repr=False)
 class Stack:
     """The game stack where spells and abilities wait to resolve.
 
     Items are stored in LIFO order. The last item pushed is the first to resolve.
-    The internal list stores items with index 0 being the bottom of the stack.
+    Items are stored as ``ITEM_POOL`` ids in an unsigned 16-bit array, with
+    index 0 being the bottom of the stack, so copying a stack is a single
+    buffer copy and pushing allocates no objects. Items read back from the
+    stack are the shared, interned instances.
     """
 
-    _items: list[StackItem] = field(default_factory=list)
+    _ids: array = field(default_factory=lambda: array("H"))
+
+    def __repr__(self) -> str:
+        return f"Stack({self.items()!r})"
+
+    def __getstate__(self) -> tuple[StackItem, ...]:
+        """Pickle items rather than process-local ids."""
+        return tuple(self.items())
+
+    def __setstate__(self, items: tuple[StackItem, ...]) -> None:
+        """Re-intern pickled items into this process's pool."""
+        self._ids = array("H", [ITEM_POOL.intern(item) for item in items])
 
     def push(self, item: StackItem) -> None:
         """Push an item onto the top of the stack.
@@ -34,7 +100,15 @@ class Stack:
         Args:
             item: The stack item to add.
         """
-        self._items.append(item)
+        self._ids.append(ITEM_POOL.intern(item))
+
+    def push_id(self, item_id: int) -> None:
+        """Push an already interned item onto the top of the stack.
+
+        Args:
+            item_id: The item's ``ITEM_POOL`` id.
+        """
+        self._ids.append(item_id)
 
     def pop(self) -> StackItem:
         """Remove and return the top item from the stack.
@@ -45,7 +119,7 @@ class Stack:
         Raises:
             IndexError: If the stack is empty.
         """
-        return self._items.pop()
+        return ITEM_POOL[self._ids.pop()]
 
     def peek(self) -> StackItem | None:
         """Return the top item without removing it.
@@ -53,8 +127,8 @@ class Stack:
         Returns:
             The top stack item, or None if the stack is empty.
         """
-        if self._items:
-            return self._items[-1]
+        if self._ids:
+            return ITEM_POOL[self._ids[-1]]
         return None
 
     def is_empty(self) -> bool:
@@ -63,11 +137,33 @@ class Stack:
         Returns:
             True if the stack has no items, False otherwise.
         """
-        return len(self._items) == 0
+        return len(self._ids) == 0
 
     def __len__(self) -> int:
         """Return the number of items on the stack."""
-        return len(self._items)
+        return len(self._ids)
+
+    @property
+    def ids(self) -> array:
+        """The ``ITEM_POOL`` ids on the stack, bottom first (do not mutate)."""
+        return self._ids
+
+    def items(self) -> list[StackItem]:
+        """Return the items on the stack, bottom first.
+
+        Returns:
+            A new list of the (shared) stack items.
+        """
+        pool = ITEM_POOL
+        return [pool[item_id] for item_id in self._ids]
+
+    def copy(self) -> "Stack":
+        """Return an independent copy of the stack.
+
+        Returns:
+            A new Stack holding the same items.
+        """
+        return Stack(self._ids[:])
 
     def describe(self) -> list[str]:
         """Return a description of all stack items, top-first.
@@ -76,7 +172,8 @@ class Stack:
             A list of strings describing each item, with the top of the
             stack first (index 0) and bottom last.
         """
+        pool = ITEM_POOL
         return [
             f"{item.name} (P{item.controller}, {item.damage_to_opponent} dmg)"
-            for item in reversed(self._items)
+            for item in (pool[item_id] for item_id in reversed(self._ids))
         ]
@@ -1,9 +1,32 @@
 """Game state representation."""
 
+import struct
 from dataclasses import dataclass, field
 
 from mtg_engine.engine.phases import Phase
-from mtg_engine.engine.stack import Stack
+from mtg_engine.engine.spells import DEFAULT_SPELLS, SpellRegistry
+from mtg_engine.engine.stack import ITEM_POOL, Stack
+from mtg_engine.engine.zobrist import compute_key
+
+# Binary encoding version, stored as the first byte of every encoded state
+ENCODING_VERSION = 3
+
+# Little-endian header: version, key, turn, life P0, life P1, active_player,
+# priority_player, pass_streak, phase, stack depth. The stack follows,
+# bottom first, one u16 per item packed as ``spell_id * 2 + controller``
+# against a spell registry.
+_HEADER_STRUCT = struct.Struct("<BQiiibbbBH")
+
+# Size in bytes of an encoded GameState with an empty stack
+STATE_HEADER_SIZE = _HEADER_STRUCT.size
+
+# Deepest stack the encoding can hold (the depth is stored as a u16)
+MAX_ENCODED_STACK = 0xFFFF
+
+
+def encoded_size(depth: int) -> int:
+    """Return the size in bytes of an encoded state with ``depth`` stack items."""
+    return STATE_HEADER_SIZE + 2 * depth
 
 
 @dataclass
@@ -30,6 +53,9 @@ class GameState:
             Resets when a player takes a non-pass action.
         players: List of player states (always length 2).
         stack: The game stack.
+        key: 64-bit Zobrist key of the state. Computed on construction when
+            left at 0 and kept up to date by ``Game.apply``; call
+            ``recompute_key`` after mutating the state directly.
     """
 
     turn: int
@@ -39,6 +65,21 @@ class GameState:
     pass_streak: int
     players: list[PlayerState]
     stack: Stack = field(default_factory=Stack)
+    key: int = field(default=0, compare=False, repr=False)
+
+    def __post_init__(self) -> None:
+        """Compute the Zobrist key if one was not supplied."""
+        if self.key == 0:
+            self.key = compute_key(self)
+
+    def recompute_key(self) -> int:
+        """Recompute the Zobrist key from scratch and store it.
+
+        Returns:
+            The recomputed key.
+        """
+        self.key = compute_key(self)
+        return self.key
 
     def opponent(self, p: int) -> int:
         """Return the opponent's index for a given player.
@@ -57,12 +98,11 @@ class GameState:
         Note: This creates new list/Stack objects but does not deep-copy
         the StackItems or PlayerState objects within them. For immutable
         StackItems this is fine; PlayerState may need attention if mutated.
+        The stack is copied as a single buffer of item ids.
 
         Returns:
             A new GameState with copied containers.
         """
-        new_stack = Stack()
-        new_stack._items = list(self.stack._items)
         return GameState(
             turn=self.turn,
             active_player=self.active_player,
@@ -70,8 +110,144 @@ class GameState:
             phase=self.phase,
             pass_streak=self.pass_streak,
             players=[PlayerState(life=p.life) for p in self.players],
-            stack=new_stack,
+            stack=self.stack.copy(),
+            key=self.key,
+        )
+
+    @property
+    def encoded_size(self) -> int:
+        """Size of ``to_bytes()`` in bytes."""
+        return encoded_size(len(self.stack))
+
+    def to_bytes(self, spells: SpellRegistry = DEFAULT_SPELLS) -> bytes:
+        """Encode the state in the binary layout.
+
+        Args:
+            spells: Registry the stack items are packed against.
+
+        Returns:
+            The encoded state, ``encoded_size`` bytes long.
+
+        Raises:
+            ValueError: If the state does not fit the layout.
+        """
+        buffer = bytearray(self.encoded_size)
+        self.into_buffer(buffer, 0, spells)
+        return bytes(buffer)
+
+    def into_buffer(
+        self,
+        buffer: memoryview | bytearray,
+        offset: int = 0,
+        spells: SpellRegistry = DEFAULT_SPELLS,
+    ) -> int:
+        """Encode the state directly into a writable buffer.
+
+        Args:
+            buffer: Destination, e.g. a shared memory or mmap view.
+            offset: Byte offset at which to write.
+            spells: Registry the stack items are packed against.
+
+        Returns:
+            The offset just past the written state.
+
+        Raises:
+            ValueError: If the state does not fit the layout or the buffer,
+                or the stack holds an item that is not one of ``spells``.
+        """
+        table = spells.packed_by_item_id
+        try:
+            packed = [table[item_id] for item_id in self.stack.ids]
+        except KeyError as e:
+            raise ValueError(
+                f"cannot encode stack item {ITEM_POOL[e.args[0]]!r} "
+                "outside the spell registry"
+            ) from None
+        depth = len(packed)
+        try:
+            _HEADER_STRUCT.pack_into(
+                buffer,
+                offset,
+                ENCODING_VERSION,
+                self.key,
+                self.turn,
+                self.players[0].life,
+                self.players[1].life,
+                self.active_player,
+                self.priority_player,
+                self.pass_streak,
+                self.phase.value,
+                depth,
+            )
+            struct.pack_into(f"<{depth}H", buffer, offset + STATE_HEADER_SIZE, *packed)
+        except struct.error as e:
+            raise ValueError(f"state does not fit the binary encoding: {e}") from e
+        return offset + encoded_size(depth)
+
+    @classmethod
+    def from_bytes(
+        cls,
+        data: bytes | bytearray | memoryview,
+        offset: int = 0,
+        spells: SpellRegistry = DEFAULT_SPELLS,
+    ) -> "GameState":
+        """Decode a state written by ``to_bytes`` or ``into_buffer``.
+
+        Args:
+            data: Buffer holding the encoded state.
+            offset: Byte offset of the encoded state.
+            spells: Registry the state was encoded against.
+
+        Returns:
+            The decoded GameState.
+
+        Raises:
+            ValueError: If the data is truncated, its encoding version is
+                not supported, a field is out of range, it names a spell
+                missing from ``spells``, or the stored key does not match
+                the decoded fields.
+        """
+        try:
+            (
+                version,
+                key,
+                turn,
+                life0,
+                life1,
+                active,
+                priority,
+                streak,
+                phase,
+                depth,
+            ) = _HEADER_STRUCT.unpack_from(data, offset)
+            if version != ENCODING_VERSION:
+                raise ValueError(f"unsupported GameState encoding version {version}")
+            packed = struct.unpack_from(f"<{depth}H", data, offset + STATE_HEADER_SIZE)
+        except struct.error as e:
+            raise ValueError(f"truncated GameState encoding: {e}") from e
+        if active not in (0, 1) or priority not in (0, 1):
+            raise ValueError(f"invalid players {active}/{priority} in encoding")
+        if streak not in (0, 1):
+            raise ValueError(f"invalid pass streak {streak} in encoding")
+        compiled = spells.spells
+        stack = Stack()
+        for value in packed:
+            if value >> 1 >= len(compiled):
+                raise ValueError(f"encoded spell id {value >> 1} is not registered")
+            stack.push_id(compiled[value >> 1].item_ids[value & 1])
+        state = cls(
+            turn=turn,
+            active_player=active,
+            priority_player=priority,
+            phase=Phase(phase),
+            pass_streak=streak,
+            players=[PlayerState(life=life0), PlayerState(life=life1)],
+            stack=stack,
+            key=key,
         )
+        if compute_key(state) != key:
+            raise ValueError("GameState encoding has a corrupt key")
+        return state
 
 
 def new_game(starting_life: int = 20) -> GameState:
@@ -0,0 +1,110 @@
+"""Zobrist hashing of game states.
+
+A state's key is the XOR of one 64-bit component per feature (turn, each
+player's life, each stack slot, ...). Changing a feature XORs its old
+component out and its new component in, so ``Game.apply`` can maintain
+the key incrementally instead of rehashing the whole state.
+
+Components are derived with the splitmix64 finalizer rather than stored in
+random tables, so unbounded features (turn, life) need no table and keys
+are stable across processes and runs.
+"""
+
+from __future__ import annotations
+
+import zlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from mtg_engine.engine.stack import StackItem
+    from mtg_engine.engine.state import GameState
+
+_MASK64 = (1 << 64) - 1
+_VALUE_MASK = (1 << 56) - 1
+
+# Feature tags (top byte of the pre-mix value)
+_TAG_TURN = 1
+_TAG_ACTIVE = 2
+_TAG_PRIORITY = 3
+_TAG_PHASE = 4
+_TAG_PASS_STREAK = 5
+_TAG_LIFE = 6  # 6 + player index
+_TAG_STACK = 8
+
+
+def _mix(x: int) -> int:
+    """Return the splitmix64 finalizer of ``x``."""
+    x = (x + 0x9E3779B97F4A7C15) & _MASK64
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return x ^ (x >> 31)
+
+
+def _component(tag: int, value: int) -> int:
+    """Return the key component for a tagged integer feature."""
+    return _mix((tag << 56) | (value & _VALUE_MASK))
+
+
+# Small-domain features get precomputed tables
+ACTIVE_KEYS: tuple[int, int] = (_component(_TAG_ACTIVE, 0), _component(_TAG_ACTIVE, 1))
+PRIORITY_KEYS: tuple[int, int] = (
+    _component(_TAG_PRIORITY, 0),
+    _component(_TAG_PRIORITY, 1),
+)
+PASS_STREAK_KEYS: tuple[int, int, int] = tuple(
+    _component(_TAG_PASS_STREAK, n) for n in range(3)
+)
+
+
+def turn_key(turn: int) -> int:
+    """Return the key component for a turn number."""
+    return _component(_TAG_TURN, turn)
+
+
+def phase_key(phase_value: int) -> int:
+    """Return the key component for a phase (by its enum value)."""
+    return _component(_TAG_PHASE, phase_value)
+
+
+def life_key(player: int, life: int) -> int:
+    """Return the key component for a player's life total."""
+    return _component(_TAG_LIFE + player, life)
+
+
+def stack_key(depth: int, item: StackItem) -> int:
+    """Return the key component for ``item`` at stack position ``depth``.
+
+    Args:
+        depth: Position from the bottom of the stack (0 is the bottom).
+        item: The stack item at that position.
+    """
+    name_hash = zlib.crc32(item.name.encode("utf-8"))
+    item_bits = (
+        name_hash | (item.controller << 32) | ((item.damage_to_opponent & 0xFFFF) << 40)
+    )
+    # Mix item and position together: XORing separately mixed halves would
+    # let equal items cancel, so e.g. stacks [A, A] and [B, B] would collide.
+    return _mix(item_bits ^ _component(_TAG_STACK, depth))
+
+
+def compute_key(state: GameState) -> int:
+    """Compute a state's key from scratch.
+
+    Args:
+        state: The state to hash.
+
+    Returns:
+        The 64-bit Zobrist key of the state.
+    """
+    key = (
+        turn_key(state.turn)
+        ^ ACTIVE_KEYS[state.active_player]
+        ^ PRIORITY_KEYS[state.priority_player]
+        ^ phase_key(state.phase.value)
+        ^ PASS_STREAK_KEYS[state.pass_streak]
+    )
+    for player, player_state in enumerate(state.players):
+        key ^= life_key(player, player_state.life)
+    for depth, item in enumerate(state.stack.items()):
+        key ^= stack_key(depth, item)
+    return key
@@ -0,0 +1,117 @@
+"""Observation encoding of game states for neural networks.
+
+Observations are player-relative: "me" is the player with priority (the
+one choosing the next action) and "opponent" is the other player. The
+encoder writes float features into a caller-supplied flat buffer (an
+``array('f')``, a ``memoryview`` cast to ``'f'``, a 1-D float32 NumPy
+array, ...), so the inference path allocates nothing per step.
+
+Layout (``ObservationEncoder.size`` floats):
+
+    0  my life
+    1  opponent life
+    2  turn
+    3  priority seat (0 or 1, absolute)
+    4  1 if I am the active player, else 0
+    5  pass_streak
+    6  stack depth (total, not capped)
+    7  phase one-hot, one slot per Phase
+    .. stack slots, top first, ``max_stack`` of them, each:
+           present (1/0), controlled by me (1/0), damage_to_opponent
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from typing import Any
+
+from mtg_engine.engine.phases import Phase
+from mtg_engine.engine.stack import ITEM_POOL
+from mtg_engine.engine.state import GameState
+
+_PHASES: tuple[Phase, ...] = tuple(Phase)
+_PHASE_INDEX: dict[Phase, int] = {phase: i for i, phase in enumerate(_PHASES)}
+
+# Offsets of the scalar features
+MY_LIFE = 0
+OPPONENT_LIFE = 1
+TURN = 2
+PRIORITY_SEAT = 3
+IS_ACTIVE = 4
+PASS_STREAK = 5
+STACK_DEPTH = 6
+PHASE = 7
+STACK = PHASE + len(_PHASES)
+
+# Floats per stack slot
+STACK_SLOT_SIZE = 3
+
+
+class ObservationEncoder:
+    """Encodes GameStates into fixed-size float observations.
+
+    Attributes:
+        max_stack: Number of stack slots encoded (deeper items are dropped,
+            though the total depth is still reported).
+        size: Number of floats per observation.
+    """
+
+    def __init__(self, max_stack: int = 8) -> None:
+        """Initialize an encoder.
+
+        Args:
+            max_stack: Number of stack slots to encode, top first.
+        """
+        self.max_stack: int = max_stack
+        self.size: int = STACK + STACK_SLOT_SIZE * max_stack
+
+    def encode_into(self, state: GameState, out: Any, offset: int = 0) -> None:
+        """Write the observation of ``state`` into ``out``.
+
+        Args:
+            state: The state to encode.
+            out: Flat, writable float buffer with at least
+                ``offset + size`` elements.
+            offset: Index of the first element to write.
+        """
+        me = state.priority_player
+        players = state.players
+        ids = state.stack.ids
+        depth = len(ids)
+
+        out[offset + MY_LIFE] = players[me].life
+        out[offset + OPPONENT_LIFE] = players[1 - me].life
+        out[offset + TURN] = state.turn
+        out[offset + PRIORITY_SEAT] = me
+        out[offset + IS_ACTIVE] = 1.0 if state.active_player == me else 0.0
+        out[offset + PASS_STREAK] = state.pass_streak
+        out[offset + STACK_DEPTH] = depth
+
+        base = offset + PHASE
+        for i in range(len(_PHASES)):
+            out[base + i] = 0.0
+        out[base + _PHASE_INDEX[state.phase]] = 1.0
+
+        base = offset + STACK
+        shown = min(depth, self.max_stack)
+        for i in range(shown):
+            item = ITEM_POOL[ids[depth - 1 - i]]
+            slot = base + i * STACK_SLOT_SIZE
+            out[slot] = 1.0
+            out[slot + 1] = 1.0 if item.controller == me else 0.0
+            out[slot + 2] = item.damage_to_opponent
+        for i in range(shown * STACK_SLOT_SIZE, self.max_stack * STACK_SLOT_SIZE):
+            out[base + i] = 0.0
+
+    def encode_batch(self, states: Sequence[GameState], out: Any) -> None:
+        """Write observations for many states, back to back, into ``out``.
+
+        Args:
+            states: States to encode.
+            out: Flat, writable float buffer with at least
+                ``len(states) * size`` elements. For a 2-D NumPy array,
+                pass a flat view such as ``obs.reshape(-1)``.
+        """
+        size = self.size
+        for i, state in enumerate(states):
+            self.encode_into(state, out, i * size)
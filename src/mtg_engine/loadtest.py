@@ -0,0 +1,217 @@
+"""Load-test client for the game server.
+
+Each simulated client opens one connection, starts a number of games and
+plays random actions in all of them, pipelined: one ACT per live game is
+written at once and the replies are read back in order, timing each ACT
+until its STATE arrives. Finished games are replaced until the client has
+sent its share of actions. Latencies from every client are combined into
+p50/p99 figures.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from dataclasses import dataclass
+
+from mtg_engine.server import DEFAULT_HOST, GameServer
+
+_ACTION_INPUTS = ("a", "b", "p")
+
+
+@dataclass(frozen=True, slots=True)
+class LoadTestStats:
+    """Result of a load test.
+
+    Attributes:
+        connections: Client connections used.
+        games: Games played to the end.
+        actions: ACT commands answered.
+        seconds: Wall-clock time of the test.
+        p50_ms: Median ACT round-trip latency in milliseconds.
+        p99_ms: 99th-percentile ACT round-trip latency in milliseconds.
+    """
+
+    connections: int
+    games: int
+    actions: int
+    seconds: float
+    p50_ms: float
+    p99_ms: float
+
+    @property
+    def actions_per_second(self) -> float:
+        """ACT commands answered per second."""
+        return self.actions / self.seconds if self.seconds > 0 else 0.0
+
+
+def percentile(sorted_values: list[int], q: float) -> int:
+    """Return the nearest-rank ``q`` quantile of already sorted values.
+
+    Args:
+        sorted_values: Values in ascending order.
+        q: Quantile in [0, 1].
+
+    Returns:
+        The quantile, or 0 if there are no values.
+    """
+    if not sorted_values:
+        return 0
+    rank = max(0, min(len(sorted_values) - 1, round(q * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+class _Client:
+    """One simulated client: a connection and its live games."""
+
+    def __init__(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        starting_life: int,
+        opponent: str | None,
+        seed: int,
+    ) -> None:
+        self.reader = reader
+        self.writer = writer
+        self.rng = random.Random(seed)
+        self.new_line = (
+            f"NEW {starting_life} {opponent or ''}".rstrip().encode() + b"\n"
+        )
+        self.live: list[int] = []
+        self.latencies: list[int] = []
+        self.games = 0
+        self.actions = 0
+
+    async def _read(self) -> list[str]:
+        """Read one server message, failing on ERR."""
+        line = await self.reader.readline()
+        if not line:
+            raise ConnectionError("server closed the connection")
+        words = line.decode("ascii").split()
+        if words[0] == "ERR":
+            raise RuntimeError(f"server error: {' '.join(words[1:])}")
+        return words
+
+    async def start_games(self, count: int) -> None:
+        """Start ``count`` games."""
+        self.writer.write(self.new_line * count)
+        await self.writer.drain()
+        for _ in range(count):
+            reply = await self._read()
+            self.live.append(int(reply[1]))
+            await self._read()  # initial STATE
+
+    async def play_round(self, budget: int) -> int:
+        """Send one action to up to ``budget`` live games and await the replies.
+
+        Returns:
+            The number of games that finished.
+        """
+        games = self.live[:budget]
+        choice = self.rng.choice
+        self.writer.write(
+            b"".join(f"ACT {g} {choice(_ACTION_INPUTS)}\n".encode() for g in games)
+        )
+        sent = time.perf_counter_ns()
+        await self.writer.drain()
+
+        finished = 0
+        for _ in games:
+            state = await self._read()
+            self.latencies.append(time.perf_counter_ns() - sent)
+            if int(state[5]) <= 0 or int(state[6]) <= 0:
+                over = await self._read()
+                self.live.remove(int(over[1]))
+                finished += 1
+        self.actions += len(games)
+        self.games += finished
+        return finished
+
+
+async def _run_client(
+    host: str,
+    port: int,
+    games: int,
+    actions: int,
+    starting_life: int,
+    opponent: str | None,
+    seed: int,
+) -> _Client:
+    """Play ``actions`` actions over ``games`` concurrent games."""
+    reader, writer = await asyncio.open_connection(host, port)
+    client = _Client(reader, writer, starting_life, opponent, seed)
+    try:
+        await client.start_games(games)
+        while client.actions < actions:
+            finished = await client.play_round(actions - client.actions)
+            if finished and client.actions < actions:
+                await client.start_games(finished)
+        writer.write(b"QUIT\n")
+        await writer.drain()
+    finally:
+        writer.close()
+    return client
+
+
+async def run_load_test(
+    host: str = DEFAULT_HOST,
+    port: int | None = None,
+    connections: int = 100,
+    games_per_connection: int = 10,
+    actions_per_connection: int = 1000,
+    starting_life: int = 20,
+    opponent: str | None = None,
+    seed: int = 0,
+) -> LoadTestStats:
+    """Drive a server with concurrent clients and measure ACT latency.
+
+    Args:
+        host: Server host.
+        port: Server port. If None, a GameServer is started in this event
+            loop on a free loopback port for the duration of the test.
+        connections: Concurrent client connections.
+        games_per_connection: Games each connection keeps live.
+        actions_per_connection: ACT commands each connection sends.
+        starting_life: Starting life of every game.
+        opponent: Server agent spec for seat 1; None plays both seats.
+        seed: Seed for the clients' random actions.
+
+    Returns:
+        Totals and latency percentiles.
+    """
+    server = None
+    if port is None:
+        server = GameServer()
+        port = await server.start(host)
+    try:
+        start = time.perf_counter()
+        clients = await asyncio.gather(
+            *(
+                _run_client(
+                    host,
+                    port,
+                    games_per_connection,
+                    actions_per_connection,
+                    starting_life,
+                    opponent,
+                    seed * connections + i,
+                )
+                for i in range(connections)
+            )
+        )
+        seconds = time.perf_counter() - start
+    finally:
+        if server is not None:
+            await server.close()
+
+    latencies = sorted(ns for client in clients for ns in client.latencies)
+    return LoadTestStats(
+        connections=connections,
+        games=sum(client.games for client in clients),
+        actions=sum(client.actions for client in clients),
+        seconds=seconds,
+        p50_ms=percentile(latencies, 0.5) / 1e6,
+        p99_ms=percentile(latencies, 0.99) / 1e6,
+    )
@@ -0,0 +1,319 @@
+"""Compact game records and deterministic replay.
+
+A GameRecord holds everything needed to reconstruct a game exactly: the
+``Game.new`` parameters and the sequence of actions, bit-packed at
+``BITS_PER_ACTION`` bits per action code (2 bits, four actions per byte,
+for the current action set). A typical random game of ~150 actions
+encodes in about 50 bytes, so millions of games fit in well under a
+hundred megabytes. Records are replayed with the default spell registry.
+
+Encoded layout (little-endian): version (u8), bits per action (u8),
+starting life (i32), action count (u32), then the packed actions, lowest
+bits first. Records are self-delimiting, so they can be concatenated.
+"""
+
+from __future__ import annotations
+
+import struct
+from collections.abc import Iterator
+from dataclasses import dataclass
+
+from mtg_engine.engine.actions import ACTION_CODES, ACTION_TYPES, ACTIONS, Action
+from mtg_engine.engine.game import Game
+from mtg_engine.engine.state import GameState
+
+RECORD_VERSION = 1
+
+# Bits per packed action: enough for every action code, rounded up to a
+# power of two so that codes never straddle a byte boundary.
+_CODE_BITS = max(1, (len(ACTION_TYPES) - 1).bit_length())
+BITS_PER_ACTION = 1 << (_CODE_BITS - 1).bit_length()
+ACTIONS_PER_BYTE = 8 // BITS_PER_ACTION
+
+_HEADER_STRUCT = struct.Struct("<BBiI")
+_MASK = (1 << BITS_PER_ACTION) - 1
+
+# Action codes packed in each possible byte value, lowest bits first
+_UNPACK: tuple[tuple[int, ...], ...] = tuple(
+    tuple(byte >> (i * BITS_PER_ACTION) & _MASK for i in range(ACTIONS_PER_BYTE))
+    for byte in range(256)
+)
+
+# Byte values that pack a code outside ``ACTION_TYPES``
+_INVALID_BYTES = bytes(
+    byte for byte in range(256) if max(_UNPACK[byte]) >= len(ACTION_TYPES)
+)
+
+
+@dataclass(frozen=True, slots=True)
+class GameRecord:
+    """The starting parameters and action log of one game.
+
+    Attributes:
+        starting_life: ``Game.new`` starting life.
+        length: Number of actions in the log.
+        packed: Bit-packed action codes.
+    """
+
+    starting_life: int
+    length: int
+    packed: bytes
+
+    def codes(self) -> Iterator[int]:
+        """Iterate over the logged action codes."""
+        remaining = self.length
+        for byte in self.packed:
+            chunk = _UNPACK[byte]
+            if remaining < ACTIONS_PER_BYTE:
+                yield from chunk[:remaining]
+                return
+            yield from chunk
+            remaining -= ACTIONS_PER_BYTE
+
+    def actions(self) -> Iterator[Action]:
+        """Iterate over the logged actions (interned instances)."""
+        for code in self.codes():
+            yield ACTIONS[code]
+
+    def code(self, ply: int) -> int:
+        """Return the action code applied at ``ply`` (0-based).
+
+        Raises:
+            IndexError: If ``ply`` is out of range.
+        """
+        if not 0 <= ply < self.length:
+            raise IndexError(f"ply {ply} out of range for {self.length} actions")
+        byte = self.packed[ply // ACTIONS_PER_BYTE]
+        return byte >> (ply % ACTIONS_PER_BYTE * BITS_PER_ACTION) & _MASK
+
+    @property
+    def encoded_size(self) -> int:
+        """Size of ``to_bytes()`` in bytes."""
+        return _HEADER_STRUCT.size + len(self.packed)
+
+    def to_bytes(self) -> bytes:
+        """Encode the record."""
+        header = _HEADER_STRUCT.pack(
+            RECORD_VERSION, BITS_PER_ACTION, self.starting_life, self.length
+        )
+        return header + self.packed
+
+    @classmethod
+    def from_bytes(
+        cls, data: bytes | bytearray | memoryview, offset: int = 0
+    ) -> GameRecord:
+        """Decode a record written by ``to_bytes``.
+
+        Args:
+            data: Buffer holding the record.
+            offset: Byte offset of the record.
+
+        Returns:
+            The decoded record.
+
+        Raises:
+            ValueError: If the version or action width is not supported, the
+                buffer is truncated, or an action code is out of range.
+        """
+        try:
+            version, bits, starting_life, length = _HEADER_STRUCT.unpack_from(
+                data, offset
+            )
+        except struct.error as e:
+            raise ValueError(f"truncated game record: {e}") from e
+        if version != RECORD_VERSION:
+            raise ValueError(f"unsupported game record version {version}")
+        if bits != BITS_PER_ACTION:
+            raise ValueError(
+                f"record uses {bits} bits per action, expected {BITS_PER_ACTION}"
+            )
+        start = offset + _HEADER_STRUCT.size
+        end = start + -(-length // ACTIONS_PER_BYTE)
+        if end > len(data):
+            raise ValueError("truncated game record")
+        packed = bytes(data[start:end])
+        if len(packed.translate(None, _INVALID_BYTES)) != len(packed):
+            raise ValueError("game record holds an unknown action code")
+        return cls(starting_life, length, packed)
+
+
+def iter_records(data: bytes | bytearray | memoryview) -> Iterator[GameRecord]:
+    """Decode concatenated records from a buffer.
+
+    Args:
+        data: Buffer holding back-to-back encoded records.
+
+    Yields:
+        Each record, in order.
+    """
+    offset = 0
+    while offset < len(data):
+        record = GameRecord.from_bytes(data, offset)
+        offset += record.encoded_size
+        yield record
+
+
+class GameRecorder:
+    """Builds a GameRecord as a game is played.
+
+    Example:
+        game = Game.new(starting_life)
+        recorder = GameRecorder(starting_life)
+        while not game.is_over():
+            action = agent.choose_action(game)
+            recorder.record(action)
+            game.apply(action)
+        record = recorder.finish()
+    """
+
+    def __init__(self, starting_life: int = 20) -> None:
+        """Start an empty log for a game created with ``Game.new(starting_life)``."""
+        self.starting_life: int = starting_life
+        self._packed = bytearray()
+        self._length = 0
+
+    def __len__(self) -> int:
+        """Return the number of recorded actions."""
+        return self._length
+
+    def record(self, action: Action) -> None:
+        """Append an action to the log.
+
+        Raises:
+            ValueError: If ``action`` is a parametric CAST, which has no
+                action code.
+        """
+        if action.type not in ACTION_CODES:
+            raise ValueError(f"cannot record {action}: it has no action code")
+        slot = self._length % ACTIONS_PER_BYTE
+        if slot == 0:
+            self._packed.append(0)
+        self._packed[-1] |= ACTION_CODES[action.type] << (slot * BITS_PER_ACTION)
+        self._length += 1
+
+    def finish(self) -> GameRecord:
+        """Return the record so far (recording may continue afterwards)."""
+        return GameRecord(self.starting_life, self._length, bytes(self._packed))
+
+
+class Replayer:
+    """Re-executes a GameRecord through ``Game.apply``.
+
+    While replaying, the state is snapshotted every ``snapshot_interval``
+    plies, so seeking backwards, or forwards over ground already covered,
+    costs at most ``snapshot_interval`` applies.
+
+    Attributes:
+        record: The record being replayed.
+        game: The game at the current ply.
+        ply: Number of actions applied so far.
+        snapshot_interval: Plies between snapshots (0 disables them).
+    """
+
+    def __init__(
+        self,
+        record: GameRecord,
+        snapshot_interval: int = 256,
+        check_interval: int = 0,
+    ) -> None:
+        """Position a replay at ply 0.
+
+        Args:
+            record: The record to replay.
+            snapshot_interval: Plies between in-memory snapshots.
+            check_interval: Invariant-check interval for the replayed game
+                (0, the default, replays at full speed).
+        """
+        self.record: GameRecord = record
+        self.snapshot_interval: int = snapshot_interval
+        self._check_interval = check_interval
+        self._codes = list(record.codes())
+        self._snapshots: dict[int, GameState] = {}
+        self.game: Game = Game.new(record.starting_life, check_interval=check_interval)
+        self.ply: int = 0
+        if snapshot_interval:
+            self._snapshots[0] = self.game.state.clone_shallow()
+
+    def __len__(self) -> int:
+        """Return the number of plies in the record."""
+        return len(self._codes)
+
+    def step(self, n: int = 1) -> None:
+        """Apply the next ``n`` actions.
+
+        Raises:
+            ValueError: If ``n`` is negative.
+            IndexError: If fewer than ``n`` actions remain.
+        """
+        if n < 0:
+            raise ValueError(f"cannot step {n} plies; use seek to go back")
+        end = self.ply + n
+        if end > len(self._codes):
+            raise IndexError(f"cannot step past ply {len(self._codes)}")
+        apply = self.game.apply
+        codes = self._codes
+        interval = self.snapshot_interval
+        snapshots = self._snapshots
+        for ply in range(self.ply, end):
+            apply(ACTIONS[codes[ply]])
+            if interval and (ply + 1) % interval == 0:
+                snapshots.setdefault(ply + 1, self.game.state.clone_shallow())
+        self.ply = end
+
+    def seek(self, ply: int) -> GameState:
+        """Move to ``ply`` (the state after ``ply`` actions).
+
+        Args:
+            ply: Target ply, from 0 to ``len(self)``.
+
+        Returns:
+            The game state at ``ply``.
+
+        Raises:
+            IndexError: If ``ply`` is out of range.
+        """
+        if not 0 <= ply <= len(self._codes):
+            raise IndexError(f"ply {ply} out of range for {len(self._codes)} actions")
+        base = self._nearest_snapshot(ply)
+        if ply < self.ply or (base is not None and base > self.ply):
+            if base is None:
+                state = Game.new(self.record.starting_life).state
+                base = 0
+            else:
+                state = self._snapshots[base].clone_shallow()
+            self.game = Game(state, check_interval=self._check_interval)
+            self.ply = base
+        self.step(ply - self.ply)
+        return self.game.state
+
+    def replay(self) -> Game:
+        """Apply every remaining action and return the finished game."""
+        self.step(len(self._codes) - self.ply)
+        return self.game
+
+    def _nearest_snapshot(self, ply: int) -> int | None:
+        """Latest snapshotted ply at or before ``ply``."""
+        if not self.snapshot_interval:
+            return None
+        base = ply - ply % self.snapshot_interval
+        while base >= 0:
+            if base in self._snapshots:
+                return base
+            base -= self.snapshot_interval
+        return None
+
+
+def replay(record: GameRecord) -> Game:
+    """Replay a record from the start at full speed.
+
+    Args:
+        record: The record to replay.
+
+    Returns:
+        The game after every logged action.
+    """
+    game = Game.new(record.starting_life, check_interval=0)
+    apply = game.apply
+    for code in record.codes():
+        apply(ACTIONS[code])
+    return game
@@ -0,0 +1,444 @@
+"""Memory-mapped ring buffer of self-play training records.
+
+Each record holds an encoded GameState, the action taken, the legal-action
+mask and the final outcome for the player who acted. Records have a fixed
+size and live in a single file that is memory-mapped by every reader and
+writer, so many self-play processes can append to the same buffer while a
+learner samples from it.
+
+Records are sized for stacks up to ``max_stack`` items deep, chosen when
+the file is created. States are encoded against a spell registry that is
+not stored in the file, so every process must open the buffer with the
+same registry.
+
+Concurrency: a writer reserves slots by incrementing the shared cursor
+under an ``fcntl`` lock on the header, then writes its records without
+holding the lock. Each record starts with a sequence number used as a
+seqlock: it is zeroed before the payload is written and set to the
+slot's reservation number afterwards. Readers discard any record whose
+sequence number is zero or changes while it is being copied. A slot
+whose writer crashed keeps a zero sequence number until it is reused.
+"""
+
+from __future__ import annotations
+
+import fcntl
+import mmap
+import os
+import random
+import struct
+from array import array
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Self
+
+from mtg_engine.engine.actions import ACTION_CODES, ACTIONS, Action
+from mtg_engine.engine.game import Game
+from mtg_engine.engine.spells import DEFAULT_SPELLS, SpellRegistry
+from mtg_engine.engine.state import GameState, encoded_size
+
+_MAGIC = b"MTGRPLY2"
+
+# File header: magic, record size, capacity, cursor (records ever appended)
+_HEADER_STRUCT = struct.Struct("<8sIQQ")
+HEADER_SIZE = 64
+_CURSOR_OFFSET = 20
+
+# Record prefix: sequence number, action code, player, outcome, legal mask
+_PREFIX_STRUCT = struct.Struct("<QBBbxHxx")
+_SEQ_STRUCT = struct.Struct("<Q")
+
+# Default deepest stack a record can hold. Random self-play games at 20
+# life peak at a few hundred items (the deepest of 3000 reached 262).
+DEFAULT_MAX_STACK = 512
+
+# Consecutive unfinished slots drawn before ``sample`` gives up
+_MAX_SAMPLE_ATTEMPTS = 1000
+
+
+def record_size(max_stack: int) -> int:
+    """Return the size of one record, padded to 8-byte alignment."""
+    return (_PREFIX_STRUCT.size + encoded_size(max_stack) + 7) // 8 * 8
+
+
+def outcome_for(winner: int | None, player: int) -> int:
+    """Return +1, -1 or 0 for ``player`` given the game's winner."""
+    if winner is None:
+        return 0
+    return 1 if winner == player else -1
+
+
+@dataclass(frozen=True, slots=True)
+class Record:
+    """One decoded replay record.
+
+    Attributes:
+        state: The state before the action.
+        action: The action taken.
+        legal_mask: Bitmask of legal actions in ``state``.
+        outcome: Final result for the player who acted: +1, -1 or 0.
+    """
+
+    state: GameState
+    action: Action
+    legal_mask: int
+    outcome: int
+
+
+@dataclass(frozen=True, slots=True)
+class Batch:
+    """A sampled minibatch, backed by buffers reused across samples.
+
+    Attributes:
+        indices: Slot index of each sampled record.
+        states: Encoded states, ``state_size`` bytes each, back to back.
+        state_size: Bytes reserved for each encoded state.
+        spells: Spell registry the states are encoded against.
+        actions: Action code per record.
+        legal_masks: Legal-action bitmask per record.
+        outcomes: Outcome per record.
+    """
+
+    indices: array
+    states: memoryview
+    state_size: int
+    spells: SpellRegistry
+    actions: array
+    legal_masks: array
+    outcomes: array
+
+    def state(self, i: int) -> GameState:
+        """Decode the ``i``-th sampled state."""
+        return GameState.from_bytes(self.states, i * self.state_size, self.spells)
+
+
+class ReplayBuffer:
+    """Fixed-capacity ring buffer of records in a memory-mapped file.
+
+    Attributes:
+        path: Path of the backing file.
+        capacity: Maximum number of records held; older ones are overwritten.
+        spells: Spell registry states are encoded against.
+        record_size: Size of one record slot in bytes.
+        state_size: Bytes reserved for the encoded state in each slot.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        capacity: int | None = None,
+        max_stack: int = DEFAULT_MAX_STACK,
+        spells: SpellRegistry = DEFAULT_SPELLS,
+    ) -> None:
+        """Open a replay buffer file, creating it if ``capacity`` is given.
+
+        Args:
+            path: Backing file.
+            capacity: Number of records to allocate when creating a new
+                file. Ignored if the file already exists.
+            max_stack: Deepest stack a record can hold, for a new file.
+                Ignored if the file already exists.
+            spells: Spell registry states are encoded against.
+
+        Raises:
+            FileNotFoundError: If the file is missing and no capacity is given.
+            ValueError: If the file is not a compatible replay buffer, or
+                ``spells`` uses the parametric CAST action.
+        """
+        spells.require_action_codes("ReplayBuffer")
+        self.path: Path = Path(path)
+        exists = self.path.exists() and self.path.stat().st_size > 0
+        if not exists and capacity is None:
+            raise FileNotFoundError(f"replay buffer not found: {self.path}")
+
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        self._fd = fd
+        if not exists:
+            fcntl.lockf(fd, fcntl.LOCK_EX)
+            try:
+                if os.fstat(fd).st_size == 0:
+                    size = record_size(max_stack)
+                    os.ftruncate(fd, HEADER_SIZE + capacity * size)
+                    os.pwrite(fd, _HEADER_STRUCT.pack(_MAGIC, size, capacity, 0), 0)
+            finally:
+                fcntl.lockf(fd, fcntl.LOCK_UN)
+
+        self._map = mmap.mmap(fd, 0)
+        magic, size, file_capacity, _ = _HEADER_STRUCT.unpack_from(self._map)
+        if magic != _MAGIC or size < record_size(0):
+            self._map.close()
+            os.close(fd)
+            raise ValueError(f"{self.path} is not a compatible replay buffer")
+        self.capacity: int = file_capacity
+        self.spells: SpellRegistry = spells
+        self.record_size: int = size
+        self.state_size: int = size - _PREFIX_STRUCT.size
+        self._view = memoryview(self._map)
+        self._batch_capacity = 0
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Unmap and close the backing file."""
+        self._view.release()
+        self._map.close()
+        os.close(self._fd)
+
+    @property
+    def records(self) -> memoryview:
+        """Zero-copy view of all record slots (``capacity * record_size``)."""
+        return self._view[HEADER_SIZE:]
+
+    def total_appended(self) -> int:
+        """Return the number of records ever appended."""
+        return struct.unpack_from("<Q", self._map, _CURSOR_OFFSET)[0]
+
+    def __len__(self) -> int:
+        """Return the number of slots in use, including any still being written."""
+        return min(self.total_appended(), self.capacity)
+
+    def _reserve(self, n: int) -> int:
+        """Atomically reserve ``n`` slots; return the first reservation number."""
+        fd = self._fd
+        fcntl.lockf(fd, fcntl.LOCK_EX, 8, _CURSOR_OFFSET)
+        try:
+            start = struct.unpack_from("<Q", self._map, _CURSOR_OFFSET)[0]
+            struct.pack_into("<Q", self._map, _CURSOR_OFFSET, start + n)
+        finally:
+            fcntl.lockf(fd, fcntl.LOCK_UN, 8, _CURSOR_OFFSET)
+        return start
+
+    def _write(
+        self,
+        number: int,
+        state: GameState | bytes | memoryview,
+        action: int,
+        player: int,
+        outcome: int,
+        mask: int,
+    ) -> None:
+        """Write one record for reservation ``number``.
+
+        Raises:
+            ValueError: If ``state`` does not fit the slot. The slot is
+                left unfinished, so readers skip it.
+        """
+        offset = HEADER_SIZE + (number % self.capacity) * self.record_size
+        buf = self._map
+        _PREFIX_STRUCT.pack_into(buf, offset, 0, action, player, outcome, mask)
+        start = offset + _PREFIX_STRUCT.size
+        end = start + self.state_size
+        if isinstance(state, GameState):
+            state.into_buffer(self._view[start:end], 0, self.spells)
+        else:
+            buf[start:end] = state
+        _SEQ_STRUCT.pack_into(buf, offset, number + 1)
+
+    def append(self, state: GameState, action: Action, mask: int, outcome: int) -> int:
+        """Append one record.
+
+        Args:
+            state: The state before the action.
+            action: The action taken.
+            mask: Legal-action bitmask for ``state``.
+            outcome: Final result for the player who acted: +1, -1 or 0.
+
+        Returns:
+            The slot index written.
+
+        Raises:
+            ValueError: If ``state`` does not fit a record.
+        """
+        if state.encoded_size > self.state_size:
+            raise ValueError(
+                f"stack depth {len(state.stack)} does not fit a "
+                f"{self.state_size}-byte record state"
+            )
+        number = self._reserve(1)
+        code = ACTION_CODES[action.type]
+        self._write(number, state, code, state.priority_player, outcome, mask)
+        return number % self.capacity
+
+    def record(self, index: int) -> Record:
+        """Decode the record in slot ``index``.
+
+        Retries while a concurrent writer overwrites the slot, as ``sample``
+        does.
+
+        Raises:
+            IndexError: If the slot is out of range or not yet written.
+        """
+        if not 0 <= index < len(self):
+            raise IndexError(f"record index {index} out of range")
+        offset = HEADER_SIZE + index * self.record_size
+        src = self._map
+        while True:
+            seq, code, _, outcome, mask = _PREFIX_STRUCT.unpack_from(src, offset)
+            if seq == 0:
+                raise IndexError(f"record {index} is not written yet")
+            try:
+                state = GameState.from_bytes(
+                    src, offset + _PREFIX_STRUCT.size, self.spells
+                )
+            except ValueError:
+                if _SEQ_STRUCT.unpack_from(src, offset)[0] == seq:
+                    raise
+                continue  # Torn by a concurrent write
+            if _SEQ_STRUCT.unpack_from(src, offset)[0] == seq:
+                return Record(
+                    state=state,
+                    action=ACTIONS[code],
+                    legal_mask=mask,
+                    outcome=outcome,
+                )
+
+    def sample(self, batch_size: int, rng: random.Random | None = None) -> Batch:
+        """Sample a minibatch of records uniformly at random.
+
+        Each draw is O(1). The returned Batch reuses buffers owned by this
+        ReplayBuffer, so it is only valid until the next ``sample`` call.
+
+        Args:
+            batch_size: Number of records to draw (with replacement).
+            rng: Random source. Uses the ``random`` module if None.
+
+        Returns:
+            The sampled minibatch.
+
+        Raises:
+            ValueError: If the buffer is empty, or a draw keeps landing on
+                slots that are still being written or were abandoned.
+        """
+        size = len(self)
+        if size == 0:
+            raise ValueError("cannot sample from an empty replay buffer")
+        randrange = (rng or random).randrange
+        self._ensure_batch(batch_size)
+
+        src = self._view
+        states = self._batch_states
+        prefix = _PREFIX_STRUCT
+        record_size = self.record_size
+        state_size = self.state_size
+        for i in range(batch_size):
+            for _ in range(_MAX_SAMPLE_ATTEMPTS):
+                index = randrange(size)
+                offset = HEADER_SIZE + index * record_size
+                seq, code, _, outcome, mask = prefix.unpack_from(src, offset)
+                if seq == 0:
+                    continue  # Being written, or abandoned by a crashed writer
+                start = offset + prefix.size
+                states[i * state_size : (i + 1) * state_size] = src[
+                    start : start + state_size
+                ]
+                if _SEQ_STRUCT.unpack_from(src, offset)[0] == seq:
+                    break
+            else:
+                raise ValueError(
+                    f"no finished record found in {_MAX_SAMPLE_ATTEMPTS} draws"
+                )
+            self._batch_indices[i] = index
+            self._batch_actions[i] = code
+            self._batch_masks[i] = mask
+            self._batch_outcomes[i] = outcome
+
+        return Batch(
+            indices=self._batch_indices,
+            states=states[: batch_size * state_size],
+            state_size=state_size,
+            spells=self.spells,
+            actions=self._batch_actions,
+            legal_masks=self._batch_masks,
+            outcomes=self._batch_outcomes,
+        )
+
+    def _ensure_batch(self, batch_size: int) -> None:
+        """Size the reusable sample buffers for ``batch_size`` records."""
+        if batch_size == self._batch_capacity:
+            return
+        self._batch_capacity = batch_size
+        self._batch_indices = array("Q", [0]) * batch_size
+        self._batch_states = memoryview(bytearray(batch_size * self.state_size))
+        self._batch_actions = array("B", [0]) * batch_size
+        self._batch_masks = array("H", [0]) * batch_size
+        self._batch_outcomes = array("b", [0]) * batch_size
+
+
+class EpisodeWriter:
+    """Collects one game's steps and appends them once the outcome is known.
+
+    States are encoded as they are recorded, so no GameState objects are
+    retained during the episode.
+
+    Example:
+        writer = EpisodeWriter(buffer)
+        while not game.is_over():
+            action = agent.choose_action(game)
+            writer.record(game, action)
+            game.apply(action)
+        writer.finish(game.winner())
+    """
+
+    def __init__(self, buffer: ReplayBuffer) -> None:
+        """Start an empty episode for ``buffer``."""
+        self.buffer: ReplayBuffer = buffer
+        self._states = bytearray()
+        self._steps: list[tuple[int, int, int]] = []
+
+    def __len__(self) -> int:
+        """Return the number of recorded steps."""
+        return len(self._steps)
+
+    def record(self, game: Game, action: Action) -> None:
+        """Record the current state and the action about to be applied.
+
+        Raises:
+            ValueError: If the state does not fit a record of the buffer.
+        """
+        offset = len(self._states)
+        self._states.extend(bytes(self.buffer.state_size))
+        try:
+            game.state.into_buffer(self._states, offset, self.buffer.spells)
+        except ValueError:
+            del self._states[offset:]
+            raise
+        self._steps.append(
+            (
+                ACTION_CODES[action.type],
+                game.state.priority_player,
+                game.legal_action_mask(),
+            )
+        )
+
+    def finish(self, winner: int | None) -> int:
+        """Append every recorded step with its outcome and start a new episode.
+
+        Args:
+            winner: ``Game.winner()`` of the finished game (None for a draw
+                or an abandoned game).
+
+        Returns:
+            The number of records appended.
+        """
+        n = len(self._steps)
+        if n:
+            start = self.buffer._reserve(n)
+            states = memoryview(self._states)
+            size = self.buffer.state_size
+            for i, (code, player, mask) in enumerate(self._steps):
+                self.buffer._write(
+                    start + i,
+                    states[i * size : (i + 1) * size],
+                    code,
+                    player,
+                    outcome_for(winner, player),
+                    mask,
+                )
+            states.release()
+        self._states = bytearray()
+        self._steps = []
+        return n
@@ -0,0 +1 @@
+"""Indexed access to the Comprehensive Rules text."""
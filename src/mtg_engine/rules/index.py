@@ -0,0 +1,513 @@
+"""Persistent index over the Comprehensive Rules text file.
+
+Looking a rule up by scanning the 9,000-line rules file costs a full read
+every time. ``RulesIndex`` instead keeps a small binary index next to the
+rules file (its path with ``.idx`` appended) and memory-maps both files:
+a rule is found by binary search over the fixed-size index entries and
+its text is decoded straight from the mapped rules file, so a lookup
+touches O(log n) index entries and only the pages holding that rule.
+
+The index records the rules file's size, modification time and SHA-256.
+It is trusted while size and modification time match; otherwise the file
+is hashed, and the index is rebuilt only if the hash changed.
+
+Entries cover the numbered body of the rules: sections (``"7"``), rules
+(``"704"``), subrules (``"704.5"``) and lettered subrules
+(``"704.5a"``). A rule's text runs up to the next numbered line, so
+examples belong to the rule above them. Glossary terms are indexed
+case-insensitively.
+
+Index file layout (little-endian)::
+
+    header: magic "MTGRULE1", version (u32), source size (u64),
+            source mtime (i64, ns), source SHA-256 (32 bytes),
+            rule count (u32), glossary count (u32)
+    rules, in document order: number (12 bytes, NUL padded),
+            offset (u32), length (u32), parent rule (i32, -1 for sections)
+    glossary, by case-folded term: term offset (u32), term length (u32),
+            definition offset (u32), definition length (u32)
+
+Offsets and lengths are byte positions in the rules file.
+"""
+
+from __future__ import annotations
+
+import bisect
+import hashlib
+import mmap
+import os
+import re
+from collections.abc import Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from struct import Struct
+from typing import Self
+
+INDEX_VERSION = 1
+
+_MAGIC = b"MTGRULE1"
+_HEADER = Struct("<8sIQq32sII")
+_RULE_ENTRY = Struct("<12sIIi")
+_GLOSSARY_ENTRY = Struct("<IIII")
+
+# Numbered lines of the rules body: "7. Additional Rules", "704. State-Based
+# Actions", "704.5. ...", "704.5a ..."
+_NUMBERED_LINE = re.compile(rb"(\d{3}\.\d+[a-z]?|\d{3}|\d)\.? ")
+_RULE_NUMBER = re.compile(r"(\d{3})(?:\.(\d+)([a-z]?))?|(\d)")
+
+_BODY_START = b"1. Game Concepts"
+_GLOSSARY = b"Glossary"
+_CREDITS = b"Credits"
+
+
+@dataclass(frozen=True, slots=True)
+class Rule:
+    """One numbered entry of the rules.
+
+    Attributes:
+        number: Rule number, e.g. ``"704.5a"``, ``"704"`` or ``"7"``.
+        text: Text after the number; for sections and rules, the title.
+        parent: Number of the enclosing entry, or None for a section.
+    """
+
+    number: str
+    text: str
+    parent: str | None
+
+
+@dataclass(frozen=True, slots=True)
+class GlossaryEntry:
+    """One glossary term and its definition.
+
+    Attributes:
+        term: The term as written in the glossary.
+        text: The definition.
+    """
+
+    term: str
+    text: str
+
+
+def default_rules_path() -> Path:
+    """Return the Comprehensive Rules file in the repository's docs/.
+
+    Raises:
+        FileNotFoundError: If docs/ holds no ``*CompRules*.txt`` file.
+    """
+    docs = Path(__file__).resolve().parents[3] / "docs"
+    found = sorted(docs.glob("*CompRules*.txt"))
+    if not found:
+        raise FileNotFoundError(f"no Comprehensive Rules file in {docs}")
+    return found[-1]
+
+
+def index_path(rules_path: str | os.PathLike[str]) -> Path:
+    """Return the index file path for the rules file at ``rules_path``."""
+    return Path(f"{os.fspath(rules_path)}.idx")
+
+
+def rule_sort_key(number: str) -> tuple[int, int, str]:
+    """Return a key that orders rule numbers as the rules file does.
+
+    Sections sort just before their first rule (``"7"`` before ``"700"``)
+    and unnumbered parents before their subrules (``"704"`` before
+    ``"704.1"`` before ``"704.1a"``).
+
+    Raises:
+        ValueError: If ``number`` is not a rule number.
+    """
+    m = _RULE_NUMBER.fullmatch(number)
+    if m is None:
+        raise ValueError(f"not a rule number: {number!r}")
+    rule, sub, letter, section = m.groups()
+    if section is not None:
+        return int(section) * 100 - 1, -1, ""
+    return int(rule), -1 if sub is None else int(sub), letter or ""
+
+
+def parent_number(number: str) -> str | None:
+    """Return the number of the entry enclosing ``number``, or None."""
+    if number[-1].isalpha():
+        return number[:-1]
+    if "." in number:
+        return number.split(".")[0]
+    if len(number) == 3:
+        return number[0]
+    return None
+
+
+def _lines(data: bytes, start: int) -> Iterator[tuple[int, int, bytes]]:
+    """Yield ``(offset, end, line)`` for each line from ``start``.
+
+    ``end`` excludes the line terminator, which may be CRLF.
+    """
+    offset = start
+    size = len(data)
+    while offset < size:
+        newline = data.find(b"\n", offset)
+        if newline < 0:
+            newline = size
+        end = newline - 1 if newline > offset and data[newline - 1] == 13 else newline
+        yield offset, end, data[offset:end]
+        offset = newline + 1
+
+
+def parse_rules(
+    data: bytes,
+) -> tuple[list[tuple[str, int, int, int]], list[tuple[int, int, int, int]]]:
+    """Locate every rule and glossary entry in a rules file.
+
+    Args:
+        data: The rules file's bytes.
+
+    Returns:
+        ``(rules, glossary)``: rules as ``(number, offset, length,
+        parent)`` in document order, and glossary entries as
+        ``(term offset, term length, definition offset, definition
+        length)`` sorted by case-folded term.
+
+    Raises:
+        ValueError: If the body of the rules cannot be found.
+    """
+    # The table of contents repeats the first section title; the body
+    # starts at its second occurrence
+    first = data.find(b"\n" + _BODY_START)
+    body = data.find(b"\n" + _BODY_START, first + 1) if first >= 0 else -1
+    if body < 0:
+        raise ValueError("rules body not found")
+
+    rules: list[tuple[str, int, int, int]] = []
+    positions: dict[str, int] = {}
+    glossary_start = -1
+    span_end = 0
+
+    def close_span() -> None:
+        if rules:
+            number, offset, _, parent = rules[-1]
+            rules[-1] = (number, offset, span_end - offset, parent)
+
+    for offset, end, line in _lines(data, body + 1):
+        if line == _GLOSSARY:
+            glossary_start = offset
+            break
+        m = _NUMBERED_LINE.match(line)
+        if m is not None:
+            close_span()
+            number = m.group(1).decode("ascii")
+            parent = parent_number(number)
+            positions[number] = len(rules)
+            rules.append((number, offset, 0, positions.get(parent, -1)))
+            span_end = end
+        elif line.strip():
+            span_end = end
+    close_span()
+
+    # Glossary entries are blocks of lines separated by blank lines: the
+    # term, then its definition
+    glossary: list[tuple[int, int, int, int]] = []
+    block: list[tuple[int, int]] = []
+    lines = _lines(data, glossary_start) if glossary_start >= 0 else iter(())
+    next(lines, None)
+    for offset, end, line in lines:
+        if line == _CREDITS:
+            break
+        if line.strip():
+            block.append((offset, end))
+            continue
+        if len(block) >= 2:
+            (t_start, t_end), (d_start, _), (_, d_end) = block[0], block[1], block[-1]
+            glossary.append((t_start, t_end - t_start, d_start, d_end - d_start))
+        block = []
+    glossary.sort(key=lambda e: _decode(data[e[0] : e[0] + e[1]]).casefold())
+    return rules, glossary
+
+
+def _decode(raw: bytes) -> str:
+    """Decode rules text, normalizing line endings."""
+    return raw.decode("utf-8").replace("\r\n", "\n")
+
+
+def _file_sha256(path: Path) -> bytes:
+    """Return the SHA-256 digest of a file."""
+    with path.open("rb") as f:
+        return hashlib.file_digest(f, "sha256").digest()
+
+
+def build_index(
+    rules_path: str | os.PathLike[str], out_path: str | os.PathLike[str]
+) -> None:
+    """Parse a rules file and write its index.
+
+    The index is written to a temporary file and renamed into place, so
+    readers never see a partial index.
+    """
+    rules_path = Path(rules_path)
+    data = rules_path.read_bytes()
+    stat = rules_path.stat()
+    rules, glossary = parse_rules(data)
+    parts = [
+        _HEADER.pack(
+            _MAGIC,
+            INDEX_VERSION,
+            stat.st_size,
+            stat.st_mtime_ns,
+            hashlib.sha256(data).digest(),
+            len(rules),
+            len(glossary),
+        )
+    ]
+    parts.extend(
+        _RULE_ENTRY.pack(number.encode("ascii"), offset, length, parent)
+        for number, offset, length, parent in rules
+    )
+    parts.extend(_GLOSSARY_ENTRY.pack(*entry) for entry in glossary)
+    tmp = Path(f"{os.fspath(out_path)}.tmp")
+    tmp.write_bytes(b"".join(parts))
+    os.replace(tmp, out_path)
+
+
+def ensure_index(
+    rules_path: str | os.PathLike[str], out_path: str | os.PathLike[str]
+) -> bool:
+    """Build the index unless an up-to-date one exists.
+
+    Returns:
+        True if the index was (re)built.
+    """
+    rules_path, out_path = Path(rules_path), Path(out_path)
+    stat = rules_path.stat()
+    try:
+        with out_path.open("r+b") as f:
+            header = f.read(_HEADER.size)
+            if len(header) == _HEADER.size:
+                magic, version, size, mtime, digest, *counts = _HEADER.unpack(header)
+                if magic == _MAGIC and version == INDEX_VERSION:
+                    if size == stat.st_size and mtime == stat.st_mtime_ns:
+                        return False
+                    if digest == _file_sha256(rules_path):
+                        # Touched but unchanged: refresh the recorded stat
+                        f.seek(0)
+                        f.write(
+                            _HEADER.pack(
+                                magic,
+                                version,
+                                stat.st_size,
+                                stat.st_mtime_ns,
+                                digest,
+                                *counts,
+                            )
+                        )
+                        return False
+    except FileNotFoundError:
+        pass
+    build_index(rules_path, out_path)
+    return True
+
+
+class RulesIndex:
+    """Memory-mapped lookups of rules and glossary terms.
+
+    Use as a context manager, or call ``close``, to unmap the files.
+
+    Attributes:
+        rules_path: The rules text file.
+        index_path: The index file.
+        rebuilt: True if opening this index had to (re)build it.
+        digest: SHA-256 of the indexed rules file.
+        glossary_count: Number of glossary entries.
+    """
+
+    def __init__(
+        self,
+        rules_path: str | os.PathLike[str] | None = None,
+        index_file: str | os.PathLike[str] | None = None,
+    ) -> None:
+        """Open the index for a rules file, building it if it is stale.
+
+        Args:
+            rules_path: Rules text file. Defaults to the file in docs/.
+            index_file: Index file. Defaults to ``index_path(rules_path)``.
+        """
+        self.rules_path: Path = (
+            default_rules_path() if rules_path is None else Path(rules_path)
+        )
+        self.index_path: Path = (
+            index_path(self.rules_path) if index_file is None else Path(index_file)
+        )
+        self.rebuilt: bool = ensure_index(self.rules_path, self.index_path)
+
+        with self.rules_path.open("rb") as f:
+            self._text = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            with self.index_path.open("rb") as f:
+                self._index = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except BaseException:
+            self._text.close()
+            raise
+        header = _HEADER.unpack_from(self._index)
+        self.digest: bytes = header[4]
+        self._rule_count: int = header[5]
+        self.glossary_count: int = header[6]
+        self._glossary_base = _HEADER.size + self._rule_count * _RULE_ENTRY.size
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Unmap both files."""
+        self._text.close()
+        self._index.close()
+
+    def __len__(self) -> int:
+        """Number of indexed rules."""
+        return self._rule_count
+
+    def __contains__(self, number: object) -> bool:
+        return isinstance(number, str) and self._find(number) >= 0
+
+    def _entry(self, i: int) -> tuple[str, int, int, int]:
+        """Return rule entry ``i`` as ``(number, offset, length, parent)``."""
+        raw, offset, length, parent = _RULE_ENTRY.unpack_from(
+            self._index, _HEADER.size + i * _RULE_ENTRY.size
+        )
+        return raw.rstrip(b"\0").decode("ascii"), offset, length, parent
+
+    def number_at(self, i: int) -> str:
+        """Return the number of the rule at position ``i`` in document order."""
+        start = _HEADER.size + i * _RULE_ENTRY.size
+        return self._index[start : start + 12].rstrip(b"\0").decode("ascii")
+
+    def _parent(self, i: int) -> int:
+        """Return the parent of rule entry ``i``, or -1."""
+        return _RULE_ENTRY.unpack_from(
+            self._index, _HEADER.size + i * _RULE_ENTRY.size
+        )[3]
+
+    def _find(self, number: str) -> int:
+        """Return the entry index of a rule number, or -1."""
+        number = number.strip().rstrip(".")
+        try:
+            key = rule_sort_key(number)
+        except ValueError:
+            return -1
+        i = bisect.bisect_left(
+            range(self._rule_count), key, key=lambda j: rule_sort_key(self.number_at(j))
+        )
+        if i < self._rule_count and self.number_at(i) == number:
+            return i
+        return -1
+
+    def rule_at(self, i: int) -> Rule:
+        """Return the rule at position ``i`` in document order."""
+        number, offset, length, parent = self._entry(i)
+        text = _decode(self._text[offset : offset + length])
+        return Rule(
+            number=number,
+            text=text.split(" ", 1)[1].strip() if " " in text else "",
+            parent=None if parent < 0 else self.number_at(parent),
+        )
+
+    def position(self, number: str) -> int:
+        """Return the position of a rule in document order.
+
+        Raises:
+            KeyError: If there is no such rule.
+        """
+        i = self._find(number)
+        if i < 0:
+            raise KeyError(number)
+        return i
+
+    def get_rule(self, number: str) -> Rule:
+        """Return a rule by number, e.g. ``"704.5a"``.
+
+        Raises:
+            KeyError: If there is no such rule.
+        """
+        i = self._find(number)
+        if i < 0:
+            raise KeyError(number)
+        return self.rule_at(i)
+
+    def children(self, number: str) -> list[Rule]:
+        """Return the entries directly under a rule, in order.
+
+        Raises:
+            KeyError: If there is no such rule.
+        """
+        i = self._find(number)
+        if i < 0:
+            raise KeyError(number)
+        # Descendants follow their ancestor contiguously
+        found = []
+        for j in range(i + 1, self._rule_count):
+            parent = self._parent(j)
+            if parent < i:
+                break
+            if parent == i:
+                found.append(self.rule_at(j))
+        return found
+
+    def section_path(self, number: str) -> list[Rule]:
+        """Return a rule and its ancestors, section first.
+
+        Raises:
+            KeyError: If there is no such rule.
+        """
+        i = self._find(number)
+        if i < 0:
+            raise KeyError(number)
+        path = []
+        while i >= 0:
+            path.append(self.rule_at(i))
+            i = self._parent(i)
+        return path[::-1]
+
+    def numbers(self) -> Iterator[str]:
+        """Yield every rule number in document order."""
+        for i in range(self._rule_count):
+            yield self.number_at(i)
+
+    def rules(self) -> Iterator[Rule]:
+        """Yield every rule in document order."""
+        for i in range(self._rule_count):
+            yield self.rule_at(i)
+
+    def _glossary_entry(self, i: int) -> tuple[int, int, int, int]:
+        return _GLOSSARY_ENTRY.unpack_from(
+            self._index, self._glossary_base + i * _GLOSSARY_ENTRY.size
+        )
+
+    def _term(self, i: int) -> str:
+        """Return glossary term ``i``."""
+        offset, length, _, _ = self._glossary_entry(i)
+        return _decode(self._text[offset : offset + length])
+
+    def glossary(self, term: str) -> GlossaryEntry:
+        """Return a glossary entry by term, ignoring case.
+
+        Raises:
+            KeyError: If the glossary has no such term.
+        """
+        key = term.strip().casefold()
+        i = bisect.bisect_left(
+            range(self.glossary_count), key, key=lambda j: self._term(j).casefold()
+        )
+        if i == self.glossary_count or self._term(i).casefold() != key:
+            raise KeyError(term)
+        return self.glossary_at(i)
+
+    def glossary_at(self, i: int) -> GlossaryEntry:
+        """Return the glossary entry at position ``i`` in term order."""
+        t_offset, t_length, d_offset, d_length = self._glossary_entry(i)
+        return GlossaryEntry(
+            term=_decode(self._text[t_offset : t_offset + t_length]),
+            text=_decode(self._text[d_offset : d_offset + d_length]),
+        )
+
+    def glossary_terms(self) -> list[str]:
+        """Return every glossary term, sorted ignoring case."""
+        return [self._term(i) for i in range(self.glossary_count)]
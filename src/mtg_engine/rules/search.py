@@ -0,0 +1,447 @@
+"""Inverted full-text index over the Comprehensive Rules and glossary.
+
+Every rule and glossary entry of a ``RulesIndex`` is a document: rules by
+position in document order, then glossary entries by position in term
+order. The search index maps each token to a posting list of the
+documents containing it, and is kept next to the rules file (its path
+with ``.search`` appended). It records the SHA-256 of the rules file it
+was built from and is rebuilt when that changes.
+
+Tokens are case-folded runs of letters, or numbers such as ``608.2`` or
+``704.5a`` so that rule references can be searched; a reference to
+``608.2b`` is also posted under ``608.2`` and ``608``. Posting lists are
+delta-encoded: each posting is the gap from the previous document and the
+token's count in the document, both as LEB128 varints.
+
+Query syntax::
+
+    priority stack          documents containing every word
+    "state-based actions"   words adjacent and in this order
+    priority -mana          ... but not containing mana (also NOT mana)
+    lifelink OR deathtouch  documents matching either side
+
+A word that splits into several tokens, such as ``state-based``, is
+matched as a phrase. Phrases are checked against the document text.
+Matches are ranked by BM25 over the words and phrase words of the query.
+
+Index file layout (little-endian)::
+
+    header: magic "MTGRSRC1", version (u32), rules SHA-256 (32 bytes),
+            document count (u32), rule count (u32), term count (u32),
+            term bytes (u32), total tokens (u64)
+    document lengths in tokens (u32 each)
+    terms, sorted by UTF-8 bytes: term offset (u32), term length (u32),
+            postings offset (u32), document frequency (u32)
+    term bytes
+    postings
+"""
+
+from __future__ import annotations
+
+import bisect
+import heapq
+import math
+import mmap
+import os
+import re
+from array import array
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from struct import Struct
+from typing import Self
+
+from mtg_engine.rules.index import RulesIndex, parent_number
+
+SEARCH_VERSION = 1
+
+_MAGIC = b"MTGRSRC1"
+_HEADER = Struct("<8sI32sIIIIQ")
+_TERM_ENTRY = Struct("<IIII")
+
+# BM25 parameters
+_K1 = 1.2
+_B = 0.75
+
+_TOKEN = re.compile(r"\d+(?:\.\d+[a-z]?)?|[^\W\d_]+")
+_QUERY_ITEM = re.compile(r'(-?)"([^"]*)"?|(\S+)')
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into case-folded search tokens."""
+    return _TOKEN.findall(text.casefold())
+
+
+def search_path(rules_path: str | os.PathLike[str]) -> Path:
+    """Return the search index path for the rules file at ``rules_path``."""
+    return Path(f"{os.fspath(rules_path)}.search")
+
+
+@dataclass(frozen=True, slots=True)
+class SearchHit:
+    """One matching rule or glossary entry.
+
+    Attributes:
+        key: Rule number, or glossary term.
+        glossary: True for a glossary entry.
+        score: BM25 score; higher is more relevant.
+        text: The rule text or glossary definition.
+    """
+
+    key: str
+    glossary: bool
+    score: float
+    text: str
+
+
+@dataclass(frozen=True, slots=True)
+class Clause:
+    """Documents matching every required item and no excluded one.
+
+    Each item is a token sequence: one token for a word, several for a
+    phrase.
+
+    Attributes:
+        required: Items that must match.
+        excluded: Items that must not match.
+    """
+
+    required: tuple[tuple[str, ...], ...]
+    excluded: tuple[tuple[str, ...], ...]
+
+
+def parse_query(query: str) -> list[Clause]:
+    """Parse a query into clauses joined by OR.
+
+    Clauses without a required item are dropped, since they would match
+    by exclusion alone.
+    """
+    clauses = []
+    required: list[tuple[str, ...]] = []
+    excluded: list[tuple[str, ...]] = []
+    negate = False
+    for m in _QUERY_ITEM.finditer(query):
+        minus, phrase, word = m.groups()
+        if word == "OR":
+            if required:
+                clauses.append(Clause(tuple(required), tuple(excluded)))
+            required, excluded, negate = [], [], False
+            continue
+        if word in ("AND", "NOT"):
+            negate = word == "NOT"
+            continue
+        if word is not None and word.startswith("-") and len(word) > 1:
+            minus, word = "-", word[1:]
+        tokens = tuple(tokenize(phrase if word is None else word))
+        if tokens:
+            (excluded if minus or negate else required).append(tokens)
+        negate = False
+    if required:
+        clauses.append(Clause(tuple(required), tuple(excluded)))
+    return clauses
+
+
+def _contains(tokens: list[str], phrase: tuple[str, ...]) -> bool:
+    """Return True if ``phrase`` occurs in ``tokens`` as a run."""
+    n = len(phrase)
+    first = phrase[0]
+    return any(
+        tokens[i] == first and tuple(tokens[i : i + n]) == phrase
+        for i in range(len(tokens) - n + 1)
+    )
+
+
+def _rank(entry: tuple[int, float]) -> tuple[float, int]:
+    """Sort key for ``(document, score)``: best score, then document order."""
+    return -entry[1], entry[0]
+
+
+def _put_varint(out: bytearray, value: int) -> None:
+    """Append ``value`` as an unsigned LEB128 varint."""
+    while value >= 0x80:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _document_text(rules: RulesIndex, doc: int) -> str:
+    """Return the searchable text of a document."""
+    n = len(rules)
+    if doc < n:
+        return rules.rule_at(doc).text
+    entry = rules.glossary_at(doc - n)
+    return f"{entry.term}\n{entry.text}"
+
+
+def build_search_index(rules: RulesIndex, out_path: str | os.PathLike[str]) -> None:
+    """Tokenize every rule and glossary entry and write the search index.
+
+    The index is written to a temporary file and renamed into place.
+    """
+    doc_count = len(rules) + rules.glossary_count
+    lengths = array("I")
+    postings: dict[str, list[tuple[int, int]]] = {}
+    for doc in range(doc_count):
+        tokens = tokenize(_document_text(rules, doc))
+        lengths.append(len(tokens))
+        counts = Counter(tokens)
+        # A reference to 608.2b also counts as one to 608.2 and 608
+        for token, count in list(counts.items()):
+            parent = parent_number(token) if token[0].isdigit() else None
+            while parent is not None and len(parent) >= 3:
+                counts[parent] += count
+                parent = parent_number(parent)
+        for token, count in counts.items():
+            postings.setdefault(token, []).append((doc, count))
+
+    terms = sorted(postings, key=lambda t: t.encode("utf-8"))
+    term_bytes = bytearray()
+    blob = bytearray()
+    table = bytearray()
+    for term in terms:
+        encoded = term.encode("utf-8")
+        table += _TERM_ENTRY.pack(
+            len(term_bytes), len(encoded), len(blob), len(postings[term])
+        )
+        term_bytes += encoded
+        previous = 0
+        for doc, count in postings[term]:
+            _put_varint(blob, doc - previous)
+            _put_varint(blob, count)
+            previous = doc
+
+    header = _HEADER.pack(
+        _MAGIC,
+        SEARCH_VERSION,
+        rules.digest,
+        doc_count,
+        len(rules),
+        len(terms),
+        len(term_bytes),
+        sum(lengths),
+    )
+    tmp = Path(f"{os.fspath(out_path)}.tmp")
+    tmp.write_bytes(b"".join((header, lengths.tobytes(), table, term_bytes, blob)))
+    os.replace(tmp, out_path)
+
+
+def ensure_search_index(rules: RulesIndex, out_path: str | os.PathLike[str]) -> bool:
+    """Build the search index unless one for the same rules file exists.
+
+    Returns:
+        True if the index was (re)built.
+    """
+    try:
+        with open(out_path, "rb") as f:
+            header = f.read(_HEADER.size)
+    except FileNotFoundError:
+        header = b""
+    if len(header) == _HEADER.size:
+        magic, version, digest, *_ = _HEADER.unpack(header)
+        if magic == _MAGIC and version == SEARCH_VERSION and digest == rules.digest:
+            return False
+    build_search_index(rules, out_path)
+    return True
+
+
+class RulesSearch:
+    """Boolean, phrase and ranked queries over the rules and glossary.
+
+    Use as a context manager, or call ``close``, to unmap the index and
+    close the rules.
+
+    Attributes:
+        rules: The rules index documents are read from.
+        index_path: The search index file.
+        rebuilt: True if opening this index had to (re)build it.
+    """
+
+    def __init__(
+        self,
+        rules_path: str | os.PathLike[str] | None = None,
+        index_file: str | os.PathLike[str] | None = None,
+        rules_index_file: str | os.PathLike[str] | None = None,
+    ) -> None:
+        """Open the search index for a rules file, building it if stale.
+
+        Args:
+            rules_path: Rules text file. Defaults to the file in docs/.
+            index_file: Search index file. Defaults to
+                ``search_path(rules_path)``.
+            rules_index_file: Rules index file; see ``RulesIndex``.
+        """
+        self.rules: RulesIndex = RulesIndex(rules_path, rules_index_file)
+        try:
+            self.index_path: Path = (
+                search_path(self.rules.rules_path)
+                if index_file is None
+                else Path(index_file)
+            )
+            self.rebuilt: bool = ensure_search_index(self.rules, self.index_path)
+            with self.index_path.open("rb") as f:
+                self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except BaseException:
+            self.rules.close()
+            raise
+
+        (
+            _,
+            _,
+            _,
+            self._doc_count,
+            self._rule_count,
+            self._term_count,
+            term_size,
+            total,
+        ) = _HEADER.unpack_from(self._data)
+        offset = _HEADER.size
+        self._lengths = array("I")
+        self._lengths.frombytes(self._data[offset : offset + 4 * self._doc_count])
+        self._average_length = total / self._doc_count if self._doc_count else 0.0
+        self._terms_base = offset + 4 * self._doc_count
+        self._term_bytes_base = self._terms_base + self._term_count * _TERM_ENTRY.size
+        self._postings_base = self._term_bytes_base + term_size
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Unmap the index and close the rules."""
+        self._data.close()
+        self.rules.close()
+
+    def _term(self, i: int) -> bytes:
+        """Return term ``i`` as UTF-8."""
+        offset, length, _, _ = _TERM_ENTRY.unpack_from(
+            self._data, self._terms_base + i * _TERM_ENTRY.size
+        )
+        start = self._term_bytes_base + offset
+        return self._data[start : start + length]
+
+    def postings(self, token: str) -> dict[int, int]:
+        """Return ``{document: count}`` for a token, in document order."""
+        key = token.encode("utf-8")
+        i = bisect.bisect_left(range(self._term_count), key, key=self._term)
+        if i == self._term_count or self._term(i) != key:
+            return {}
+        _, _, offset, frequency = _TERM_ENTRY.unpack_from(
+            self._data, self._terms_base + i * _TERM_ENTRY.size
+        )
+        data = self._data
+        pos = self._postings_base + offset
+        found = {}
+        doc = 0
+        for _ in range(frequency):
+            values = []
+            for _ in range(2):
+                value = shift = 0
+                while True:
+                    byte = data[pos]
+                    pos += 1
+                    value |= (byte & 0x7F) << shift
+                    if byte < 0x80:
+                        break
+                    shift += 7
+                values.append(value)
+            doc += values[0]
+            found[doc] = values[1]
+        return found
+
+    def _documents_with(
+        self,
+        item: tuple[str, ...],
+        postings: dict[str, dict[int, int]],
+        candidates: set[int] | None = None,
+    ) -> set[int]:
+        """Return the documents (among ``candidates``) matching one item."""
+        for token in item:
+            if token not in postings:
+                postings[token] = self.postings(token)
+        docs = set(candidates) if candidates is not None else None
+        for token in sorted(set(item), key=lambda t: len(postings[t])):
+            docs = (
+                set(postings[token]) if docs is None else docs & postings[token].keys()
+            )
+            if not docs:
+                return set()
+        if len(item) > 1:
+            docs = {
+                doc
+                for doc in docs
+                if _contains(tokenize(_document_text(self.rules, doc)), item)
+            }
+        return docs
+
+    def _score(
+        self, doc: int, tokens: set[str], postings: dict[str, dict[int, int]]
+    ) -> float:
+        """BM25 score of a document for a set of query tokens."""
+        norm = _K1 * (1 - _B + _B * self._lengths[doc] / self._average_length)
+        score = 0.0
+        for token in tokens:
+            docs = postings[token]
+            count = docs.get(doc, 0)
+            if count:
+                idf = math.log(
+                    1 + (self._doc_count - len(docs) + 0.5) / (len(docs) + 0.5)
+                )
+                score += idf * count * (_K1 + 1) / (count + norm)
+        return score
+
+    def match(self, query: str) -> dict[int, float]:
+        """Return ``{document: score}`` for every document matching a query."""
+        postings: dict[str, dict[int, int]] = {}
+        scores: dict[int, float] = {}
+        for clause in parse_query(query):
+            for token in {t for item in clause.required for t in item}:
+                if token not in postings:
+                    postings[token] = self.postings(token)
+            docs: set[int] | None = None
+            # Rarest items first keeps the candidate set small
+            for item in sorted(
+                clause.required, key=lambda item: min(len(postings[t]) for t in item)
+            ):
+                docs = self._documents_with(item, postings, docs)
+                if not docs:
+                    break
+            for item in clause.excluded:
+                if not docs:
+                    break
+                docs -= self._documents_with(item, postings, docs)
+            if not docs:
+                continue
+            tokens = {token for item in clause.required for token in item}
+            for doc in docs:
+                score = self._score(doc, tokens, postings)
+                if score > scores.get(doc, -1.0):
+                    scores[doc] = score
+        return scores
+
+    def search(self, query: str, limit: int | None = 10) -> list[SearchHit]:
+        """Return the best matches for a query, most relevant first.
+
+        Args:
+            query: Words, quoted phrases, ``-word`` or ``NOT word``
+                exclusions, and ``OR`` between clauses.
+            limit: Most hits to return; None for all.
+
+        Returns:
+            Hits ordered by descending score, then document order.
+        """
+        scores = self.match(query)
+        if limit is None:
+            ranked = sorted(scores.items(), key=_rank)
+        else:
+            ranked = heapq.nsmallest(limit, scores.items(), key=_rank)
+        return [self._hit(doc, score) for doc, score in ranked]
+
+    def _hit(self, doc: int, score: float) -> SearchHit:
+        """Build the hit for a document."""
+        if doc < self._rule_count:
+            rule = self.rules.rule_at(doc)
+            return SearchHit(rule.number, False, score, rule.text)
+        entry = self.rules.glossary_at(doc - self._rule_count)
+        return SearchHit(entry.term, True, score, entry.text)
@@ -0,0 +1,345 @@
+"""Cross-reference graph of the Comprehensive Rules.
+
+Rules point at each other: "see rule 608.2", "rules 702.19b and 702.19c",
+"section 8", "rule 601.2g-h". ``RuleGraph`` extracts those references
+from every rule of a ``RulesIndex`` into a directed graph with an edge
+from each rule to every rule it references. Edges are stored both ways in
+compressed sparse row form (an offsets array and a targets array per
+direction), so the dependencies (rules a rule refers to) and the
+dependents (rules referring to it) of any rule, and their transitive
+closures, are array slices and a graph traversal.
+
+The graph is cached next to the rules file (its path with ``.xref``
+appended) along with each rule's number, a digest of its text, and the
+reference numbers extracted from it. The cache records the SHA-256 of the
+rules file. When that changes, the graph is rebuilt incrementally: only
+rules whose number and text digest are not in the cache are re-parsed;
+the others reuse their cached references, and the edge arrays are
+resolved again from those.
+
+Nodes are rules only; glossary entries are not part of the graph.
+References to numbers that are not rules are kept in the cache but have
+no edge.
+
+Cache layout (little-endian)::
+
+    header: magic "MTGXREF1", version (u32), rules SHA-256 (32 bytes),
+            rule count (u32), reference count (u32), edge count (u32)
+    per rule: number (12 bytes, NUL padded), text digest (8 bytes)
+    reference offsets (u32, rule count + 1), references (12 bytes each)
+    dependency offsets (u32, rule count + 1), dependencies (u32 each)
+    dependent offsets (u32, rule count + 1), dependents (u32 each)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+from array import array
+from pathlib import Path
+from struct import Struct
+from typing import Self
+
+from mtg_engine.rules.index import RulesIndex
+
+XREF_VERSION = 1
+
+_MAGIC = b"MTGXREF1"
+_HEADER = Struct("<8sI32sIII")
+_RULE = Struct("<12s8s")
+_NUMBER = Struct("<12s")
+
+# One referenced number: a rule with an optional letter range such as
+# "601.2g-h", or a section digit
+_ITEM = r"\d{3}(?:\.\d+[a-z]?(?:[-–][a-z]\b)?)?(?!\d)|\d(?!\d)"
+_REFERENCE_LIST = re.compile(
+    rf"\b(rules?|sections?) ((?:{_ITEM})(?:,? (?:and |or |through )?(?:{_ITEM}))*)",
+    re.IGNORECASE,
+)
+# Dotted numbers are references wherever they appear
+_DOTTED = re.compile(r"\b\d{3}\.\d+[a-z]?(?:[-–][a-z]\b)?")
+_PARTS = re.compile(r"(\d{3}(?:\.\d+)?)([a-z]?)(?:[-–]([a-z]))?|(\d)")
+
+
+def _expand(item: str) -> list[str]:
+    """Expand one referenced item, e.g. ``"601.2g-h"``, into rule numbers."""
+    m = _PARTS.fullmatch(item)
+    if m is None:
+        return []
+    base, first, last, section = m.groups()
+    if section is not None:
+        return [section]
+    if last is None:
+        return [base + first]
+    return [base + chr(c) for c in range(ord(first), ord(last) + 1)]
+
+
+def extract_references(text: str) -> list[str]:
+    """Return the rule numbers a rule's text refers to, in first-seen order.
+
+    Single digits count as sections only after "section" or "sections".
+    """
+    found: dict[str, None] = {}
+    for m in _REFERENCE_LIST.finditer(text):
+        sections = m.group(1).lower().startswith("section")
+        for item in re.finditer(_ITEM, m.group(2)):
+            if len(item.group()) == 1 and not sections:
+                continue
+            found.update(dict.fromkeys(_expand(item.group())))
+    for m in _DOTTED.finditer(text):
+        found.update(dict.fromkeys(_expand(m.group())))
+    return list(found)
+
+
+def xref_path(rules_path: str | os.PathLike[str]) -> Path:
+    """Return the cross-reference cache path for the rules file at ``rules_path``."""
+    return Path(f"{os.fspath(rules_path)}.xref")
+
+
+def _text_digest(text: str) -> bytes:
+    """Return the 8-byte digest identifying a rule's text."""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest()
+
+
+def _number(raw: bytes) -> str:
+    """Decode a NUL-padded rule number."""
+    return raw.rstrip(b"\0").decode("ascii")
+
+
+def _read_u32(data: bytes, offset: int, count: int) -> tuple[array, int]:
+    """Read ``count`` u32 values at ``offset``; return them and the end offset."""
+    values = array("I")
+    values.frombytes(data[offset : offset + 4 * count])
+    return values, offset + 4 * count
+
+
+def _cached_references(data: bytes) -> dict[tuple[str, bytes], list[str]]:
+    """Return ``{(number, text digest): references}`` from a cache file.
+
+    An unreadable or incompatible cache yields an empty mapping.
+    """
+    if len(data) < _HEADER.size:
+        return {}
+    magic, version, _, count, reference_count, _ = _HEADER.unpack_from(data)
+    if magic != _MAGIC or version != XREF_VERSION:
+        return {}
+    base = _HEADER.size + count * _RULE.size + 4 * (count + 1)
+    if base + reference_count * _NUMBER.size > len(data):
+        return {}
+    rules = [
+        _RULE.unpack_from(data, _HEADER.size + i * _RULE.size) for i in range(count)
+    ]
+    offsets, _ = _read_u32(data, _HEADER.size + count * _RULE.size, count + 1)
+    return {
+        (_number(raw), digest): [
+            _number(data[base + j * 12 : base + j * 12 + 12])
+            for j in range(offsets[i], offsets[i + 1])
+        ]
+        for i, (raw, digest) in enumerate(rules)
+    }
+
+
+def _csr(lists: list[list[int]]) -> tuple[array, array]:
+    """Pack adjacency lists into offsets and targets arrays."""
+    offsets = array("I", [0])
+    targets = array("I")
+    for targets_of in lists:
+        targets.extend(targets_of)
+        offsets.append(len(targets))
+    return offsets, targets
+
+
+def build_graph(
+    rules: RulesIndex, out_path: str | os.PathLike[str], previous: bytes = b""
+) -> int:
+    """Extract references and write the cross-reference cache.
+
+    Args:
+        rules: The rules to extract references from.
+        out_path: Cache file to write; written to a temporary file and
+            renamed into place.
+        previous: An earlier cache's bytes; rules whose number and text
+            are unchanged reuse its references instead of being re-parsed.
+
+    Returns:
+        The number of rules whose references were extracted.
+    """
+    cached = _cached_references(previous)
+    count = len(rules)
+    records = []
+    references: list[list[str]] = []
+    reparsed = 0
+    for i in range(count):
+        rule = rules.rule_at(i)
+        digest = _text_digest(rule.text)
+        refs = cached.get((rule.number, digest))
+        if refs is None:
+            refs = extract_references(rule.text)
+            reparsed += 1
+        records.append(_RULE.pack(rule.number.encode("ascii"), digest))
+        references.append(refs)
+
+    positions = {_number(record[:12]): i for i, record in enumerate(records)}
+    dependencies: list[list[int]] = []
+    dependents: list[list[int]] = [[] for _ in range(count)]
+    for i, refs in enumerate(references):
+        targets = sorted({positions[r] for r in refs if r in positions} - {i})
+        dependencies.append(targets)
+        for j in targets:
+            dependents[j].append(i)
+
+    reference_offsets = array("I", [0])
+    for refs in references:
+        reference_offsets.append(reference_offsets[-1] + len(refs))
+    forward = _csr(dependencies)
+    reverse = _csr(dependents)
+    parts = [
+        _HEADER.pack(
+            _MAGIC,
+            XREF_VERSION,
+            rules.digest,
+            count,
+            reference_offsets[-1],
+            len(forward[1]),
+        ),
+        *records,
+        reference_offsets.tobytes(),
+        *(_NUMBER.pack(r.encode("ascii")) for refs in references for r in refs),
+        *(a.tobytes() for a in (*forward, *reverse)),
+    ]
+    tmp = Path(f"{os.fspath(out_path)}.tmp")
+    tmp.write_bytes(b"".join(parts))
+    os.replace(tmp, out_path)
+    return reparsed
+
+
+class RuleGraph:
+    """Dependencies and dependents of rules through their cross-references.
+
+    Use as a context manager, or call ``close``, to close the rules.
+
+    Attributes:
+        rules: The rules index the graph is built from.
+        index_path: The cross-reference cache file.
+        rebuilt: True if opening the graph had to (re)build the cache.
+        reparsed: Rules whose references were extracted while opening;
+            0 when the cache was current.
+        edge_count: Number of rule-to-rule references.
+    """
+
+    def __init__(
+        self,
+        rules_path: str | os.PathLike[str] | None = None,
+        index_file: str | os.PathLike[str] | None = None,
+        rules_index_file: str | os.PathLike[str] | None = None,
+    ) -> None:
+        """Open the graph for a rules file, updating the cache if stale.
+
+        Args:
+            rules_path: Rules text file. Defaults to the file in docs/.
+            index_file: Cache file. Defaults to ``xref_path(rules_path)``.
+            rules_index_file: Rules index file; see ``RulesIndex``.
+        """
+        self.rules: RulesIndex = RulesIndex(rules_path, rules_index_file)
+        try:
+            self.index_path: Path = (
+                xref_path(self.rules.rules_path)
+                if index_file is None
+                else Path(index_file)
+            )
+            try:
+                data = self.index_path.read_bytes()
+            except FileNotFoundError:
+                data = b""
+            self.rebuilt: bool = not self._current(data)
+            self.reparsed: int = 0
+            if self.rebuilt:
+                self.reparsed = build_graph(self.rules, self.index_path, data)
+                data = self.index_path.read_bytes()
+        except BaseException:
+            self.rules.close()
+            raise
+
+        _, _, _, count, reference_count, self.edge_count = _HEADER.unpack_from(data)
+        offset = _HEADER.size + count * _RULE.size + 4 * (count + 1)
+        offset += reference_count * _NUMBER.size
+        self._dependency_offsets, offset = _read_u32(data, offset, count + 1)
+        self._dependencies, offset = _read_u32(data, offset, self.edge_count)
+        self._dependent_offsets, offset = _read_u32(data, offset, count + 1)
+        self._dependents, offset = _read_u32(data, offset, self.edge_count)
+
+    def _current(self, data: bytes) -> bool:
+        """Return True if ``data`` is a cache built from these rules."""
+        if len(data) < _HEADER.size:
+            return False
+        magic, version, digest, *_ = _HEADER.unpack_from(data)
+        return (
+            magic == _MAGIC and version == XREF_VERSION and digest == self.rules.digest
+        )
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the rules."""
+        self.rules.close()
+
+    def _reach(
+        self, number: str, offsets: array, targets: array, transitive: bool
+    ) -> list[str]:
+        """Return the numbers reachable from a rule, in document order."""
+        start = self.rules.position(number)
+        if not transitive:
+            found = targets[offsets[start] : offsets[start + 1]]
+        else:
+            seen = bytearray(len(offsets) - 1)
+            seen[start] = 1
+            frontier = [start]
+            found = []
+            while frontier:
+                i = frontier.pop()
+                for j in targets[offsets[i] : offsets[i + 1]]:
+                    if not seen[j]:
+                        seen[j] = 1
+                        found.append(j)
+                        frontier.append(j)
+            found.sort()
+        return [self.rules.number_at(i) for i in found]
+
+    def dependencies(self, number: str, transitive: bool = False) -> list[str]:
+        """Return the rules a rule refers to.
+
+        Args:
+            number: Rule number.
+            transitive: Follow references of references as well.
+
+        Returns:
+            Rule numbers in document order, excluding ``number`` itself.
+
+        Raises:
+            KeyError: If there is no such rule.
+        """
+        return self._reach(
+            number, self._dependency_offsets, self._dependencies, transitive
+        )
+
+    def dependents(self, number: str, transitive: bool = False) -> list[str]:
+        """Return the rules that refer to a rule.
+
+        Args:
+            number: Rule number.
+            transitive: Include rules that reach it through other rules.
+
+        Returns:
+            Rule numbers in document order, excluding ``number`` itself.
+
+        Raises:
+            KeyError: If there is no such rule.
+        """
+        return self._reach(
+            number, self._dependent_offsets, self._dependents, transitive
+        )
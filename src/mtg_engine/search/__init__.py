@@ -0,0 +1 @@
+"""Search algorithms over the game engine."""
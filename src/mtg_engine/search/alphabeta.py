@@ -0,0 +1,184 @@
+"""Depth-limited alpha-beta search with a transposition table."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from mtg_engine.engine.actions import Action
+from mtg_engine.engine.game import Game
+from mtg_engine.search.transposition import Bound, TranspositionTable
+
+# Score for a won game; wins found sooner score higher
+WIN_SCORE = 1_000_000.0
+
+# Values beyond this are wins or losses rather than evaluations
+_MATE_BOUND = WIN_SCORE / 2
+
+
+def _to_table(value: float, ply: int) -> float:
+    """Convert a win/loss score from distance-to-root to distance-to-node.
+
+    Mate scores depend on the ply they were found at, so they are stored
+    relative to the node and converted back with ``_from_table`` on probe.
+    """
+    if value > _MATE_BOUND:
+        return value + ply
+    if value < -_MATE_BOUND:
+        return value - ply
+    return value
+
+
+def _from_table(value: float, ply: int) -> float:
+    """Convert a stored win/loss score back to distance-to-root at ``ply``."""
+    if value > _MATE_BOUND:
+        return value - ply
+    if value < -_MATE_BOUND:
+        return value + ply
+    return value
+
+
+def life_difference(game: Game) -> float:
+    """Heuristic value: priority player's life minus the opponent's.
+
+    Args:
+        game: The game to evaluate.
+
+    Returns:
+        The evaluation from the perspective of the player with priority.
+    """
+    state = game.state
+    me = state.priority_player
+    return float(state.players[me].life - state.players[1 - me].life)
+
+
+@dataclass(frozen=True, slots=True)
+class SearchResult:
+    """Outcome of a search from the root position.
+
+    Attributes:
+        value: Value of the root for the player with priority.
+        best_action: Best action found, or None if the game is over.
+        nodes: Number of positions visited.
+    """
+
+    value: float
+    best_action: Action | None
+    nodes: int
+
+
+class AlphaBeta:
+    """Negamax alpha-beta search over ``Game.legal_actions``/``Game.apply``.
+
+    The game is searched in place using ``Game.undo``. Because resolving the
+    stack can hand priority back to the player who just passed, a child's
+    value is negated only when the player with priority changes.
+
+    Attributes:
+        table: Transposition table shared across searches.
+        evaluate: Leaf evaluation, from the priority player's perspective.
+    """
+
+    def __init__(
+        self,
+        table: TranspositionTable | None = None,
+        evaluate: Callable[[Game], float] = life_difference,
+    ) -> None:
+        """Initialize the search.
+
+        Args:
+            table: Transposition table to use. A default table is created
+                if None.
+            evaluate: Leaf evaluation function.
+        """
+        self.table: TranspositionTable = table or TranspositionTable()
+        self.evaluate: Callable[[Game], float] = evaluate
+        self._nodes = 0
+
+    def search(self, game: Game, depth: int) -> SearchResult:
+        """Search ``depth`` plies from the current position.
+
+        The game is left in its original state.
+
+        Args:
+            game: The game to search.
+            depth: Number of plies to look ahead.
+
+        Returns:
+            The root value and best action.
+        """
+        self._nodes = 0
+        value = self._negamax(game, depth, -WIN_SCORE * 2, WIN_SCORE * 2, 0)
+        entry = self.table.get(game.state.key)
+        best = None
+        if entry is not None and entry.best_action >= 0:
+            best = game.spells.actions[entry.best_action]
+        return SearchResult(value=value, best_action=best, nodes=self._nodes)
+
+    def _negamax(
+        self, game: Game, depth: int, alpha: float, beta: float, ply: int
+    ) -> float:
+        """Return the value of the current position for the priority player."""
+        self._nodes += 1
+        state = game.state
+
+        if game.is_over():
+            winner = game.winner()
+            if winner is None:
+                return 0.0
+            score = WIN_SCORE - ply
+            return score if winner == state.priority_player else -score
+        if depth <= 0:
+            return self.evaluate(game)
+
+        table = self.table
+        key = state.key
+        entry = table.get(key)
+        best_code = -1
+        if entry is not None:
+            best_code = entry.best_action
+            if entry.depth >= depth:
+                value = _from_table(entry.value, ply)
+                if entry.bound is Bound.EXACT:
+                    return value
+                if entry.bound is Bound.LOWER and value >= beta:
+                    return value
+                if entry.bound is Bound.UPPER and value <= alpha:
+                    return value
+
+        actions = game.legal_action_tuple()
+        index = game.spells.action_index
+        if best_code >= 0:
+            # Try the stored best move first
+            best_action = game.spells.actions[best_code]
+            if actions[0] is not best_action:
+                actions = (best_action, *(a for a in actions if a is not best_action))
+
+        alpha_orig = alpha
+        best_value = -WIN_SCORE * 2
+        me = state.priority_player
+        for action in actions:
+            record = game.apply(action)
+            if state.priority_player == me:
+                value = self._negamax(game, depth - 1, alpha, beta, ply + 1)
+            else:
+                value = -self._negamax(game, depth - 1, -beta, -alpha, ply + 1)
+            game.undo(record)
+
+            if value > best_value:
+                best_value = value
+                best_code = index[action]
+            alpha = max(alpha, value)
+            if alpha >= beta:
+                break
+
+        if best_value <= alpha_orig:
+            bound = Bound.UPPER
+        elif best_value >= beta:
+            bound = Bound.LOWER
+        else:
+            bound = Bound.EXACT
+        table.store(
+            key, depth, _to_table(best_value, ply), best_action=best_code, bound=bound
+        )
+        return best_value
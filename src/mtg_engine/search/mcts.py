@@ -0,0 +1,568 @@
+"""Monte Carlo Tree Search over Game.legal_actions/Game.apply."""
+
+from __future__ import annotations
+
+import math
+import random
+import time
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from enum import Enum, auto
+
+from mtg_engine.engine.actions import Action
+from mtg_engine.engine.game import Game
+
+# Node fields: (name, struct format). Ordered widest first so every field
+# starts on a naturally aligned offset.
+NODE_FIELDS: tuple[tuple[str, str], ...] = (
+    ("key", "Q"),
+    ("value_sum", "d"),
+    ("prior", "d"),
+    ("parent", "i"),
+    ("first_child", "i"),
+    ("visits", "i"),
+    ("virtual_loss", "i"),
+    ("num_children", "i"),
+    ("action", "h"),
+    ("player", "b"),
+    ("terminal", "b"),
+)
+
+_FIELD_SIZES: dict[str, int] = {"Q": 8, "d": 8, "i": 4, "h": 2, "b": 1}
+
+# Bytes reserved ahead of the node fields (node count)
+_HEADER_BYTES = 8
+
+
+class Selection(Enum):
+    """Child selection rule.
+
+    - UCT: Upper confidence bound applied to trees (uniform priors).
+    - PUCT: Prior-weighted UCT as used by AlphaZero.
+    """
+
+    UCT = auto()
+    PUCT = auto()
+
+
+class NodeArrays:
+    """Flat, fixed-capacity storage for search tree nodes.
+
+    Every node field is a typed view over one contiguous buffer, so a tree
+    can live in a ``bytearray`` or in shared memory. A node is an integer
+    index; children of a node occupy a contiguous index range starting at
+    ``first_child``.
+
+    Per-node fields:
+        key: Zobrist key of the node's state (0 until first visited).
+        value_sum: Sum of backed-up values from player 0's perspective.
+        prior: Prior probability of the action leading to the node.
+        parent: Parent node index, or -1 for the root.
+        first_child: Index of the first child (valid if num_children > 0).
+        visits: Visit count.
+        virtual_loss: Pending in-flight traversals (parallel search only).
+        num_children: Number of children, or 0 if not expanded.
+        action: Index in the game's ``spells.actions`` of the action leading
+            to the node, or -1 for the root.
+        player: Player with priority at the node (-1 until first visited).
+        terminal: 1 if the node's game is over, else 0.
+
+    Attributes:
+        capacity: Maximum number of nodes.
+    """
+
+    def __init__(
+        self, capacity: int, buffer: memoryview | bytearray | None = None
+    ) -> None:
+        """Lay out node storage over a buffer.
+
+        Args:
+            capacity: Maximum number of nodes.
+            buffer: Writable buffer of at least ``nbytes(capacity)`` bytes.
+                A zeroed ``bytearray`` is allocated if None.
+        """
+        self.capacity: int = capacity
+        if buffer is None:
+            buffer = bytearray(self.nbytes(capacity))
+        view = memoryview(buffer)
+        self._buffer = view
+        self._count = view[:_HEADER_BYTES].cast("q")
+        offset = _HEADER_BYTES
+        for name, fmt in NODE_FIELDS:
+            size = _FIELD_SIZES[fmt] * capacity
+            setattr(self, name, view[offset : offset + size].cast(fmt))
+            offset += size
+
+    @staticmethod
+    def nbytes(capacity: int) -> int:
+        """Return the buffer size needed for ``capacity`` nodes."""
+        return _HEADER_BYTES + capacity * sum(_FIELD_SIZES[f] for _, f in NODE_FIELDS)
+
+    def __len__(self) -> int:
+        """Return the number of allocated nodes."""
+        return self._count[0]
+
+    def clear(self) -> None:
+        """Drop all nodes."""
+        self._count[0] = 0
+
+    def truncate(self, n: int) -> None:
+        """Drop every node from index ``n`` on."""
+        self._count[0] = min(n, self._count[0])
+
+    def alloc(self, n: int) -> int:
+        """Allocate ``n`` contiguous, initialized nodes.
+
+        Args:
+            n: Number of nodes.
+
+        Returns:
+            Index of the first new node, or -1 if capacity is exhausted.
+        """
+        start = self._count[0]
+        if start + n > self.capacity:
+            return -1
+        self._count[0] = start + n
+        for i in range(start, start + n):
+            self.init_node(i)
+        return start
+
+    def init_node(self, i: int, parent: int = -1, action: int = -1) -> None:
+        """Reset node ``i`` to an unvisited, unexpanded leaf."""
+        self.key[i] = 0
+        self.value_sum[i] = 0.0
+        self.prior[i] = 0.0
+        self.parent[i] = parent
+        self.first_child[i] = -1
+        self.visits[i] = 0
+        self.virtual_loss[i] = 0
+        self.num_children[i] = 0
+        self.action[i] = action
+        self.player[i] = -1
+        self.terminal[i] = 0
+
+    def copy_node(self, src: NodeArrays, i: int, j: int, parent: int) -> None:
+        """Copy node ``i`` of ``src`` into node ``j`` of this store.
+
+        Children are not copied; ``first_child`` and ``num_children`` are
+        reset so the caller can relink them.
+        """
+        for name, _ in NODE_FIELDS:
+            getattr(self, name)[j] = getattr(src, name)[i]
+        self.parent[j] = parent
+        self.first_child[j] = -1
+        self.num_children[j] = 0
+
+    def release(self) -> None:
+        """Release all views so the underlying buffer can be closed."""
+        for name, _ in NODE_FIELDS:
+            getattr(self, name).release()
+        self._count.release()
+        self._buffer.release()
+
+
+def random_rollout(game: Game, rng: random.Random, max_plies: int = 200) -> float:
+    """Play uniformly random actions to the end of the game or a ply cap.
+
+    Args:
+        game: A game positioned at the leaf. It is modified in place.
+        rng: Random source.
+        max_plies: Maximum number of actions to play.
+
+    Returns:
+        The outcome for the player with priority at the start of the
+        rollout: +1 win, -1 loss, 0 draw; if the cap is reached, the life
+        difference scaled into [-1, 1].
+    """
+    me = game.state.priority_player
+    for _ in range(max_plies):
+        if game.is_over():
+            break
+        game.apply(rng.choice(game.legal_action_tuple()))
+    return outcome_for(game, me)
+
+
+def outcome_for(game: Game, player: int) -> float:
+    """Score a (possibly unfinished) game for ``player`` in [-1, 1].
+
+    Args:
+        game: The game to score.
+        player: The player to score for.
+
+    Returns:
+        +1/-1/0 for a finished game; otherwise the life difference divided
+        by the total absolute life.
+    """
+    if game.is_over():
+        winner = game.winner()
+        if winner is None:
+            return 0.0
+        return 1.0 if winner == player else -1.0
+    mine = game.state.players[player].life
+    theirs = game.state.players[1 - player].life
+    total = abs(mine) + abs(theirs)
+    return (mine - theirs) / total if total else 0.0
+
+
+@dataclass(frozen=True, slots=True)
+class SearchStats:
+    """Throughput figures for one ``choose_action`` call.
+
+    Attributes:
+        simulations: Simulations run.
+        seconds: Wall-clock search time.
+        tree_size: Nodes in the tree after the search.
+        reused: Nodes carried over from the previous search.
+    """
+
+    simulations: int
+    seconds: float
+    tree_size: int
+    reused: int
+
+    @property
+    def simulations_per_second(self) -> float:
+        """Simulations per second of search time."""
+        return self.simulations / self.seconds if self.seconds > 0 else 0.0
+
+
+class MCTS:
+    """Monte Carlo Tree Search agent.
+
+    The game passed to ``choose_action`` is walked in place with
+    ``Game.apply``/``Game.undo`` and restored before returning. Node
+    statistics live in a NodeArrays store rather than per-node objects.
+
+    After each search the tree is kept. On the next call, if the new
+    position (matched by ``GameState.key``) is a descendant of the previous
+    root within ``reuse_depth`` plies, that subtree becomes the new root.
+
+    Attributes:
+        simulations: Default simulation budget per move.
+        time_limit: Default time budget per move in seconds, or None.
+        selection: Child selection rule.
+        c: Exploration constant.
+        prior_fn: Optional callback returning priors aligned with
+            ``game.legal_actions()``. Used by PUCT; uniform if None.
+        value_fn: Optional callback returning the value of a leaf for the
+            player with priority. Replaces the rollout if given.
+        rollout: Rollout policy used when ``value_fn`` is None. Returns
+            the outcome for the player with priority at the leaf.
+        reuse_depth: Maximum depth searched when reusing a subtree.
+        virtual_loss: Virtual losses added to each node on the path of an
+            in-flight simulation. Zero for serial search; parallel searches
+            over a shared tree set it so workers spread out.
+        last_stats: Statistics for the most recent search.
+    """
+
+    virtual_loss: int = 0
+
+    def __init__(
+        self,
+        simulations: int = 800,
+        time_limit: float | None = None,
+        selection: Selection = Selection.UCT,
+        c: float = 1.4,
+        prior_fn: Callable[[Game], Sequence[float]] | None = None,
+        value_fn: Callable[[Game], float] | None = None,
+        rollout: Callable[[Game, random.Random], float] = random_rollout,
+        max_nodes: int = 100_000,
+        reuse_depth: int = 4,
+        seed: int | None = None,
+        nodes: NodeArrays | None = None,
+    ) -> None:
+        """Initialize the agent.
+
+        Args:
+            simulations: Default simulation budget per move.
+            time_limit: Default time budget per move in seconds. When set,
+                the search stops at whichever budget runs out first.
+            selection: Child selection rule.
+            c: Exploration constant.
+            prior_fn: Prior callback (see class attributes).
+            value_fn: Leaf value callback (see class attributes).
+            rollout: Rollout policy (see class attributes).
+            max_nodes: Node capacity of the tree. When full, leaves are
+                evaluated without being expanded.
+            reuse_depth: Maximum depth searched when reusing a subtree.
+            seed: Seed for the agent's random source.
+            nodes: Existing node store to search in, e.g. one in shared
+                memory. ``max_nodes`` is ignored if given.
+
+        Raises:
+            ValueError: If ``max_nodes`` cannot hold the root.
+        """
+        if nodes is None and max_nodes < 1:
+            raise ValueError(f"max_nodes must be positive, got {max_nodes}")
+        self.simulations: int = simulations
+        self.time_limit: float | None = time_limit
+        self.selection: Selection = selection
+        self.c: float = c
+        self.prior_fn: Callable[[Game], Sequence[float]] | None = prior_fn
+        self.value_fn: Callable[[Game], float] | None = value_fn
+        self.rollout: Callable[[Game, random.Random], float] = rollout
+        self.reuse_depth: int = reuse_depth
+        self.nodes: NodeArrays = NodeArrays(max_nodes) if nodes is None else nodes
+        self.rng: random.Random = random.Random(seed)
+        self.last_stats: SearchStats | None = None
+        self._actions: tuple[Action, ...] = ()
+        self.total_simulations: int = 0
+        self.total_seconds: float = 0.0
+
+    @property
+    def simulations_per_second(self) -> float:
+        """Average simulations per second across all searches."""
+        if self.total_seconds <= 0:
+            return 0.0
+        return self.total_simulations / self.total_seconds
+
+    def reset(self) -> None:
+        """Discard the search tree."""
+        self.nodes.clear()
+
+    def choose_action(
+        self,
+        game: Game,
+        simulations: int | None = None,
+        time_limit: float | None = None,
+    ) -> Action:
+        """Search from the current position and return the best action.
+
+        Args:
+            game: The game to search. It is restored before returning.
+            simulations: Simulation budget, overriding the default.
+            time_limit: Time budget in seconds, overriding the default.
+
+        Returns:
+            The most visited root action, or a random legal action if the
+            tree had no room to expand the root.
+
+        Raises:
+            ValueError: If the game is already over or the simulation
+                budget is not positive.
+        """
+        if game.is_over():
+            raise ValueError("cannot choose an action in a finished game")
+        if simulations is None:
+            simulations = self.simulations
+        if simulations < 1:
+            raise ValueError(f"simulations must be positive, got {simulations}")
+        if time_limit is None:
+            time_limit = self.time_limit
+
+        start = time.perf_counter()
+        if game.spells.actions is not self._actions:
+            # Node actions are indices into the registry's action tuple
+            self._actions = game.spells.actions
+            self.nodes.clear()
+        reused = self._set_root(game)
+        deadline = None if time_limit is None else start + time_limit
+
+        done = 0
+        while done < simulations:
+            self.simulate(game)
+            done += 1
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+
+        elapsed = time.perf_counter() - start
+        self.last_stats = SearchStats(
+            simulations=done, seconds=elapsed, tree_size=len(self.nodes), reused=reused
+        )
+        self.total_simulations += done
+        self.total_seconds += elapsed
+        if not self.nodes.num_children[0]:
+            return self.rng.choice(game.legal_action_tuple())
+        return self._actions[self.nodes.action[self.best_child(0)]]
+
+    def root_visits(self) -> dict[Action, int]:
+        """Return the visit count of each root action."""
+        nodes = self.nodes
+        if len(nodes) == 0:
+            return {}
+        first = nodes.first_child[0]
+        return {
+            self._actions[nodes.action[i]]: nodes.visits[i]
+            for i in range(first, first + nodes.num_children[0])
+        }
+
+    def best_child(self, node: int) -> int:
+        """Return the most visited child of ``node``."""
+        nodes = self.nodes
+        first = nodes.first_child[node]
+        return max(
+            range(first, first + nodes.num_children[node]),
+            key=nodes.visits.__getitem__,
+        )
+
+    def simulate(self, game: Game) -> None:
+        """Run one select/expand/evaluate/backup pass from the root."""
+        nodes = self.nodes
+        actions = game.spells.actions
+        node = 0
+        records = []
+        vl = self.virtual_loss
+        while nodes.num_children[node] and not nodes.terminal[node]:
+            node = self._select(node)
+            if vl:
+                nodes.virtual_loss[node] += vl
+            records.append(game.apply(actions[nodes.action[node]]))
+            if nodes.player[node] < 0:
+                self._visit(node, game)
+
+        if nodes.terminal[node]:
+            value0 = outcome_for(game, 0)
+        else:
+            self._expand(node, game)
+            value = self._evaluate(game)
+            value0 = value if nodes.player[node] == 0 else -value
+
+        self._backup(node, value0)
+        for record in reversed(records):
+            game.undo(record)
+
+    def _set_root(self, game: Game) -> int:
+        """Make ``game``'s position the root, reusing a subtree if possible.
+
+        Returns:
+            The number of nodes reused.
+        """
+        key = game.state.key
+        nodes = self.nodes
+        if len(nodes):
+            found = self._find_descendant(key)
+            if found == 0:
+                return len(nodes)
+            if found > 0:
+                self._reroot(found)
+                return len(self.nodes)
+        nodes.clear()
+        nodes.alloc(1)
+        self._visit(0, game)
+        return 0
+
+    def _find_descendant(self, key: int) -> int:
+        """Breadth-first search for a node with ``key`` near the root.
+
+        Returns:
+            The node index, or -1 if not found within ``reuse_depth``.
+        """
+        nodes = self.nodes
+        frontier = [0]
+        for _ in range(self.reuse_depth + 1):
+            next_frontier = []
+            for node in frontier:
+                if nodes.key[node] == key:
+                    return node
+                first = nodes.first_child[node]
+                next_frontier.extend(range(first, first + nodes.num_children[node]))
+            frontier = next_frontier
+        return -1
+
+    def _reroot(self, new_root: int) -> None:
+        """Compact the subtree under ``new_root`` to the front of the store.
+
+        Nodes keep their relative order, so ``new_root`` becomes node 0 and
+        sibling blocks stay contiguous. Each node moves to a lower or equal
+        index, so copying in index order never overwrites a node that is
+        still to be copied.
+        """
+        nodes = self.nodes
+        subtree = [new_root]
+        for node in subtree:
+            first = nodes.first_child[node]
+            subtree.extend(range(first, first + nodes.num_children[node]))
+        subtree.sort()
+        moved = {old: new for new, old in enumerate(subtree)}
+        for new, old in enumerate(subtree):
+            k = nodes.num_children[old]
+            first = nodes.first_child[old]
+            parent = -1 if new == 0 else moved[nodes.parent[old]]
+            nodes.copy_node(nodes, old, new, parent=parent)
+            if k:
+                nodes.first_child[new] = moved[first]
+                nodes.num_children[new] = k
+        nodes.truncate(len(subtree))
+
+    def _visit(self, node: int, game: Game) -> None:
+        """Record state-derived fields the first time a node is reached."""
+        nodes = self.nodes
+        nodes.key[node] = game.state.key
+        nodes.player[node] = game.state.priority_player
+        nodes.terminal[node] = 1 if game.is_over() else 0
+
+    def _expand(self, node: int, game: Game) -> None:
+        """Create the children of a leaf, if there is room."""
+        nodes = self.nodes
+        actions = game.legal_action_tuple()
+        index = game.spells.action_index
+        base = nodes.alloc(len(actions))
+        if base < 0:
+            return
+        if self.prior_fn is not None:
+            priors = self.prior_fn(game)
+        else:
+            priors = [1.0 / len(actions)] * len(actions)
+        for j, action in enumerate(actions):
+            child = base + j
+            nodes.parent[child] = node
+            nodes.action[child] = index[action]
+            nodes.prior[child] = priors[j]
+        nodes.first_child[node] = base
+        nodes.num_children[node] = len(actions)
+
+    def _evaluate(self, game: Game) -> float:
+        """Value of a leaf for the player with priority there."""
+        if self.value_fn is not None:
+            return self.value_fn(game)
+        return self.rollout(game.clone(), self.rng)
+
+    def _select(self, node: int) -> int:
+        """Pick the child of ``node`` maximizing the selection score."""
+        nodes = self.nodes
+        visits = nodes.visits
+        value_sum = nodes.value_sum
+        virtual_loss = nodes.virtual_loss
+        first = nodes.first_child[node]
+        sign = 1.0 if nodes.player[node] == 0 else -1.0
+        parent_visits = visits[node] + virtual_loss[node]
+        c = self.c
+
+        if self.selection is Selection.UCT:
+            log_n = math.log(parent_visits) if parent_visits > 0 else 0.0
+            best, best_score = first, -math.inf
+            for child in range(first, first + nodes.num_children[node]):
+                # In-flight traversals count as visits that lost for the selector
+                loss = virtual_loss[child]
+                n = visits[child] + loss
+                if n == 0:
+                    return child
+                q = (sign * value_sum[child] - loss) / n
+                score = q + c * math.sqrt(log_n / n)
+                if score > best_score:
+                    best, best_score = child, score
+            return best
+
+        sqrt_n = math.sqrt(parent_visits)
+        prior = nodes.prior
+        best, best_score = first, -math.inf
+        for child in range(first, first + nodes.num_children[node]):
+            # Virtual loss is applied as in UCT above
+            loss = virtual_loss[child]
+            n = visits[child] + loss
+            q = (sign * value_sum[child] - loss) / n if n else 0.0
+            score = q + c * prior[child] * sqrt_n / (1 + n)
+            if score > best_score:
+                best, best_score = child, score
+        return best
+
+    def _backup(self, node: int, value0: float) -> None:
+        """Add a result (for player 0) to ``node`` and its ancestors."""
+        nodes = self.nodes
+        vl = self.virtual_loss
+        while node >= 0:
+            nodes.visits[node] += 1
+            nodes.value_sum[node] += value0
+            if vl and node:
+                nodes.virtual_loss[node] -= vl
+            node = nodes.parent[node]
@@ -0,0 +1,293 @@
+"""Multi-process MCTS: root parallelization and tree parallelization."""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from enum import Enum, auto
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Self
+
+from mtg_engine.engine.actions import Action
+from mtg_engine.engine.game import Game
+from mtg_engine.engine.spells import SpellRegistry
+from mtg_engine.engine.state import GameState
+from mtg_engine.search.mcts import MCTS, NodeArrays, SearchStats
+
+
+class ParallelMode(Enum):
+    """How worker processes share a search.
+
+    - ROOT: Each worker grows an independent tree from the root; root
+      visit counts are summed to pick the move.
+    - TREE: All workers grow one tree in shared memory, using virtual loss
+      to steer concurrent simulations down different paths.
+    """
+
+    ROOT = auto()
+    TREE = auto()
+
+
+# Per-process state for tree-parallel workers, set by _init_worker
+_worker_lock: Any = None
+_worker_trees: dict[str, tuple[SharedMemory, NodeArrays]] = {}
+
+
+def _init_worker(lock: Any) -> None:
+    """Pool initializer: keep the shared expansion lock."""
+    global _worker_lock
+    _worker_lock = lock
+
+
+def _run_root(
+    state: GameState,
+    spells: SpellRegistry,
+    simulations: int,
+    seed: int,
+    options: dict[str, Any],
+) -> tuple[dict[int, int], int]:
+    """Root-parallel task: search an independent tree.
+
+    Returns:
+        Visits per root action (its index in ``spells.actions``), and the
+        number of simulations run.
+    """
+    game = Game(state, spells=spells)
+    agent = MCTS(seed=seed, **options)
+    agent.choose_action(game, simulations=simulations)
+    index = spells.action_index
+    visits = {index[action]: n for action, n in agent.root_visits().items()}
+    return visits, agent.last_stats.simulations
+
+
+class _SharedTreeMCTS(MCTS):
+    """MCTS over a NodeArrays store shared between processes."""
+
+    virtual_loss = 1
+
+    def __init__(self, nodes: NodeArrays, lock: Any, **options: Any) -> None:
+        super().__init__(nodes=nodes, **options)
+        self._lock = lock
+
+    def _expand(self, node: int, game: Game) -> None:
+        """Expand under the lock, unless another worker got there first."""
+        with self._lock:
+            if self.nodes.num_children[node] == 0:
+                super()._expand(node, game)
+
+
+def _run_tree(
+    shm_name: str,
+    capacity: int,
+    state: GameState,
+    spells: SpellRegistry,
+    simulations: int,
+    seed: int,
+    options: dict[str, Any],
+) -> int:
+    """Tree-parallel task: run simulations on the shared tree.
+
+    Returns:
+        The number of simulations run.
+    """
+    cached = _worker_trees.get(shm_name)
+    if cached is None:
+        shm = SharedMemory(name=shm_name, track=False)
+        cached = (shm, NodeArrays(capacity, shm.buf))
+        _worker_trees[shm_name] = cached
+    agent = _SharedTreeMCTS(cached[1], _worker_lock, seed=seed, **options)
+    game = Game(state, spells=spells)
+    for _ in range(simulations):
+        agent.simulate(game)
+    return simulations
+
+
+class ParallelMCTS:
+    """MCTS spread over a pool of worker processes.
+
+    Root mode runs ``workers`` independent searches and merges their root
+    visit counts. Tree mode grows a single tree in shared memory with
+    virtual loss; nodes are expanded under a lock, while statistics are
+    updated without one (occasional lost updates are tolerated, as is usual
+    for lock-free tree parallelization).
+
+    Search options (``selection``, ``c``, ``rollout``, ...) are forwarded
+    to MCTS in each worker, so callbacks must be picklable module-level
+    functions. Use as a context manager, or call ``close``, to shut the
+    pool down.
+
+    Attributes:
+        mode: Parallelization mode.
+        workers: Number of worker processes.
+        simulations: Default total simulation budget per move.
+        last_stats: Statistics for the most recent search.
+    """
+
+    def __init__(
+        self,
+        workers: int | None = None,
+        mode: ParallelMode = ParallelMode.ROOT,
+        simulations: int = 800,
+        max_nodes: int = 100_000,
+        seed: int | None = None,
+        **options: Any,
+    ) -> None:
+        """Start the worker pool.
+
+        Args:
+            workers: Number of processes. Defaults to ``os.cpu_count()``.
+            mode: Parallelization mode.
+            simulations: Default total simulation budget per move.
+            max_nodes: Node capacity of each tree.
+            seed: Base seed; worker ``i`` uses ``seed + i`` (offset per move).
+            **options: Extra MCTS keyword arguments.
+
+        Raises:
+            ValueError: If ``max_nodes`` cannot hold the root.
+        """
+        if max_nodes < 1:
+            raise ValueError(f"max_nodes must be positive, got {max_nodes}")
+        self.mode: ParallelMode = mode
+        self.workers: int = workers or os.cpu_count() or 1
+        self.simulations: int = simulations
+        self.last_stats: SearchStats | None = None
+        self._max_nodes = max_nodes
+        self._seed = seed if seed is not None else int.from_bytes(os.urandom(4))
+        self._moves = 0
+        self._options = dict(options)
+        self._last_visits: dict[int, int] = {}
+        self._last_actions: tuple[Action, ...] = ()
+
+        lock = multiprocessing.Lock()
+        self._lock = lock
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.workers, initializer=_init_worker, initargs=(lock,)
+        )
+        self._shm: SharedMemory | None = None
+        self._nodes: NodeArrays | None = None
+        if mode is ParallelMode.TREE:
+            self._shm = SharedMemory(create=True, size=NodeArrays.nbytes(max_nodes))
+            self._nodes = NodeArrays(max_nodes, self._shm.buf)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Shut down the pool and free shared memory."""
+        self._pool.shutdown()
+        if self._shm is not None:
+            self._nodes.release()
+            self._nodes = None
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+    def choose_action(self, game: Game, simulations: int | None = None) -> Action:
+        """Search in parallel and return the best action.
+
+        Args:
+            game: The game to search. It is not modified.
+            simulations: Total simulation budget, overriding the default.
+
+        Returns:
+            The action with the most (merged) root visits, or a random
+            legal action if the root could not be expanded.
+
+        Raises:
+            ValueError: If the game is already over or the simulation
+                budget is not positive.
+        """
+        if game.is_over():
+            raise ValueError("cannot choose an action in a finished game")
+        if simulations is None:
+            simulations = self.simulations
+        if simulations < 1:
+            raise ValueError(f"simulations must be positive, got {simulations}")
+
+        start = time.perf_counter()
+        shares = [simulations // self.workers] * self.workers
+        for i in range(simulations % self.workers):
+            shares[i] += 1
+        seed = self._seed + self._moves * self.workers
+        self._moves += 1
+
+        if self.mode is ParallelMode.ROOT:
+            visits, done = self._search_root(game, shares, seed)
+        else:
+            visits, done = self._search_tree(game, shares, seed)
+
+        self.last_stats = SearchStats(
+            simulations=done,
+            seconds=time.perf_counter() - start,
+            tree_size=len(self._nodes) if self._nodes is not None else 0,
+            reused=0,
+        )
+        self._last_visits = visits
+        self._last_actions = game.spells.actions
+        if not visits:
+            return random.Random(seed).choice(game.legal_action_tuple())
+        best = max(visits, key=visits.__getitem__)
+        return self._last_actions[best]
+
+    def root_visits(self) -> dict[Action, int]:
+        """Return the merged visit count of each root action."""
+        actions = self._last_actions
+        return {actions[i]: n for i, n in self._last_visits.items()}
+
+    def _search_root(
+        self, game: Game, shares: list[int], seed: int
+    ) -> tuple[dict[int, int], int]:
+        """Run independent trees and merge root visits."""
+        options = {"max_nodes": self._max_nodes, **self._options}
+        futures = [
+            self._pool.submit(_run_root, game.state, game.spells, n, seed + i, options)
+            for i, n in enumerate(shares)
+            if n
+        ]
+        merged: dict[int, int] = {}
+        done = 0
+        for future in futures:
+            visits, n = future.result()
+            done += n
+            for code, count in visits.items():
+                merged[code] = merged.get(code, 0) + count
+        return merged, done
+
+    def _search_tree(
+        self, game: Game, shares: list[int], seed: int
+    ) -> tuple[dict[int, int], int]:
+        """Grow the shared tree from ``game``'s position."""
+        nodes = self._nodes
+        nodes.clear()
+        nodes.alloc(1)
+        nodes.key[0] = game.state.key
+        nodes.player[0] = game.state.priority_player
+
+        futures = [
+            self._pool.submit(
+                _run_tree,
+                self._shm.name,
+                self._max_nodes,
+                game.state,
+                game.spells,
+                n,
+                seed + i,
+                self._options,
+            )
+            for i, n in enumerate(shares)
+            if n
+        ]
+        done = sum(future.result() for future in futures)
+
+        first = nodes.first_child[0]
+        visits = {
+            nodes.action[i]: nodes.visits[i]
+            for i in range(first, first + nodes.num_children[0])
+        }
+        return visits, done
@@ -0,0 +1,333 @@
+"""Exact solver for small games by retrograde analysis.
+
+The solver enumerates every position reachable from ``Game.new`` through
+``Game.apply``, then propagates win/loss values backwards from the
+finished games, so every position gets its game-theoretic value under
+perfect play.
+
+Positions are identified by their Zobrist key with the turn component
+removed: the turn number never affects play, and dropping it turns the
+pass-to-next-turn loop into a genuine cycle in the position graph, so the
+graph is finite. Positions left undecided once propagation stops are on
+cycles neither player can profitably leave, and are draws.
+
+Casting is free, so without a limit the stack, and with it the position
+graph, is unbounded. The solver therefore solves the variant in which
+casting is unavailable while the stack holds ``max_stack_depth`` items;
+raise the limit to check that a value does not depend on it.
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+from array import array
+from collections import deque
+from dataclasses import dataclass
+from enum import IntEnum
+
+from mtg_engine.engine.actions import Action, ActionType, action_for
+from mtg_engine.engine.game import Game
+from mtg_engine.engine.spells import SpellRegistry
+from mtg_engine.engine.state import GameState
+from mtg_engine.engine.zobrist import turn_key
+
+_PASS = ActionType.PASS
+
+
+class Outcome(IntEnum):
+    """Value of a position for the player with priority."""
+
+    LOSS = -1
+    DRAW = 0
+    WIN = 1
+
+
+def position_key(state: GameState) -> int:
+    """Return the state's Zobrist key without its turn component."""
+    return state.key ^ turn_key(state.turn)
+
+
+@dataclass(frozen=True, slots=True)
+class SolverStats:
+    """Size and cost of a solved game.
+
+    Attributes:
+        starting_life: ``Game.new`` starting life.
+        max_stack_depth: Stack depth at which casting stops.
+        positions: Positions in the table.
+        terminal: Finished-game positions among them.
+        wins: Positions won by the player with priority.
+        losses: Positions lost by the player with priority.
+        draws: Positions drawn with perfect play.
+        table_bytes: Approximate memory used by the table.
+        seconds: Wall-clock time to enumerate and solve.
+    """
+
+    starting_life: int
+    max_stack_depth: int
+    positions: int
+    terminal: int
+    wins: int
+    losses: int
+    draws: int
+    table_bytes: int
+    seconds: float
+
+
+class RetrogradeSolver:
+    """Solves the game from ``Game.new(starting_life)`` exactly.
+
+    Positions are numbered in discovery order; the table maps position
+    keys to numbers, and per-position values live in parallel arrays with
+    the move graph stored in compressed sparse rows.
+
+    Attributes:
+        starting_life: ``Game.new`` starting life.
+        max_stack_depth: Stack depth at which casting stops.
+        spells: Spell registry the game is played with.
+    """
+
+    def __init__(
+        self,
+        starting_life: int = 20,
+        max_stack_depth: int = 4,
+        spells: SpellRegistry | None = None,
+    ) -> None:
+        """Configure the solver; nothing is computed until ``solve``.
+
+        Args:
+            starting_life: Starting life total for each player.
+            max_stack_depth: Stack depth at which casting stops.
+            spells: Spell registry. Defaults to ``Game.spells``.
+
+        Raises:
+            ValueError: If ``max_stack_depth`` is negative.
+        """
+        if max_stack_depth < 0:
+            raise ValueError("max_stack_depth must be non-negative")
+        self.starting_life: int = starting_life
+        self.max_stack_depth: int = max_stack_depth
+        self.spells: SpellRegistry = spells if spells is not None else Game.spells
+        self._index: dict[int, int] = {}
+        self._mover = array("b")
+        self._value = array("b")
+        self._plies = array("I")
+        self._best = array("h")
+        self._stats: SolverStats | None = None
+
+    def solve(self) -> SolverStats:
+        """Enumerate and solve every reachable position.
+
+        Returns:
+            Table size and solve time. Solving again returns the same
+            stats without recomputing.
+        """
+        if self._stats is not None:
+            return self._stats
+        start = time.perf_counter()
+        first, edges, codes, terminal = self._enumerate()
+        self._propagate(first, edges, codes)
+        self._stats = SolverStats(
+            starting_life=self.starting_life,
+            max_stack_depth=self.max_stack_depth,
+            positions=len(self._index),
+            terminal=terminal,
+            wins=self._value.count(Outcome.WIN),
+            losses=self._value.count(Outcome.LOSS),
+            draws=self._value.count(Outcome.DRAW),
+            table_bytes=sys.getsizeof(self._index)
+            + sum(
+                a.itemsize * len(a)
+                for a in (self._mover, self._value, self._plies, self._best)
+            ),
+            seconds=time.perf_counter() - start,
+        )
+        return self._stats
+
+    def _enumerate(self) -> tuple[array, array, array, int]:
+        """Discover positions breadth-first and record the move graph.
+
+        Terminal positions are valued here; all others start as draws.
+
+        Returns:
+            CSR offsets and successor indices of the move graph, the action
+            of each edge (its index in ``spells.actions``), and the number
+            of terminal positions.
+        """
+        index = self._index
+        mover, value, plies, best = self._mover, self._value, self._plies, self._best
+        first = array("I", [0])
+        edges = array("I")
+        codes = array("h")
+        actions = self.spells.actions
+        cast_codes = [i for i, a in enumerate(actions) if a.type is not _PASS]
+        pass_code = self.spells.action_index[action_for(_PASS)]
+        terminal = 0
+
+        root = Game.new(self.starting_life, check_interval=0, spells=self.spells)
+        frontier = deque([root.state])
+        index[position_key(root.state)] = 0
+        while frontier:
+            game = Game(frontier.popleft(), check_interval=0, spells=self.spells)
+            state = game.state
+            mover.append(state.priority_player)
+            plies.append(0)
+            best.append(-1)
+            if game.is_over():
+                terminal += 1
+                winner = game.winner()
+                if winner is None:
+                    value.append(Outcome.DRAW)
+                else:
+                    won = winner == state.priority_player
+                    value.append(Outcome.WIN if won else Outcome.LOSS)
+                first.append(len(edges))
+                continue
+
+            value.append(Outcome.DRAW)
+            moves = [pass_code]
+            if len(state.stack) < self.max_stack_depth:
+                moves += cast_codes
+            for code in moves:
+                record = game.apply(actions[code])
+                key = position_key(state)
+                child = index.get(key)
+                if child is None:
+                    child = index[key] = len(index)
+                    frontier.append(state.clone_shallow())
+                game.undo(record)
+                edges.append(child)
+                codes.append(code)
+            first.append(len(edges))
+        return first, edges, codes, terminal
+
+    def _propagate(self, first: array, edges: array, codes: array) -> None:
+        """Back values up from terminal positions.
+
+        Breadth-first order gives wins the fewest plies and losses the
+        most, so ``plies`` and ``best`` describe optimal play.
+        """
+        n = len(self._index)
+        mover, value, plies, best = self._mover, self._value, self._plies, self._best
+
+        # Reverse graph in CSR form: predecessors of each position
+        counts = array("I", [0]) * (n + 1)
+        for child in edges:
+            counts[child + 1] += 1
+        for i in range(n):
+            counts[i + 1] += counts[i]
+        pred_first = array("I", counts)
+        preds = array("I", [0]) * len(edges)
+        fill = array("I", counts[:n])
+        for parent in range(n):
+            for e in range(first[parent], first[parent + 1]):
+                child = edges[e]
+                preds[fill[child]] = e
+                fill[child] += 1
+        owner = array("I", [0]) * len(edges)
+        for parent in range(n):
+            for e in range(first[parent], first[parent + 1]):
+                owner[e] = parent
+
+        solved = bytearray(n)
+        remaining = array("I", (first[i + 1] - first[i] for i in range(n)))
+        queue = deque()
+        for i in range(n):
+            if remaining[i] == 0:
+                solved[i] = 1
+                queue.append(i)
+
+        while queue:
+            child = queue.popleft()
+            child_value = value[child]
+            for p in range(pred_first[child], pred_first[child + 1]):
+                e = preds[p]
+                parent = owner[e]
+                if solved[parent]:
+                    continue
+                result = child_value if mover[parent] == mover[child] else -child_value
+                if result == Outcome.WIN:
+                    value[parent] = Outcome.WIN
+                elif result == Outcome.LOSS:
+                    remaining[parent] -= 1
+                    if remaining[parent]:
+                        continue
+                    value[parent] = Outcome.LOSS
+                else:
+                    # A drawn terminal child: the parent is at least a draw
+                    # and is settled if nothing better turns up, below.
+                    continue
+                solved[parent] = 1
+                plies[parent] = plies[child] + 1
+                best[parent] = codes[e]
+                queue.append(parent)
+
+        # Unsolved positions are draws; pick a move that keeps the draw
+        for parent in range(n):
+            if solved[parent] or first[parent] == first[parent + 1]:
+                continue
+            for e in range(first[parent], first[parent + 1]):
+                child = edges[e]
+                result = (
+                    value[child] if mover[parent] == mover[child] else -value[child]
+                )
+                if result != Outcome.LOSS:
+                    best[parent] = codes[e]
+                    break
+
+    def _lookup(self, state: GameState) -> int:
+        """Return the table index of ``state``, solving first if needed.
+
+        Raises:
+            KeyError: If the state is not reachable within the depth limit.
+        """
+        self.solve()
+        try:
+            return self._index[position_key(state)]
+        except KeyError:
+            raise KeyError(f"state not in the solved table: {state!r}") from None
+
+    def value(self, state: GameState) -> Outcome:
+        """Return the perfect-play outcome for the player with priority.
+
+        Raises:
+            KeyError: If the state is not reachable within the depth limit.
+        """
+        return Outcome(self._value[self._lookup(state)])
+
+    def plies(self, state: GameState) -> int:
+        """Return the plies to the end of a won or lost game (0 otherwise).
+
+        The winner ends the game as fast as possible and the loser delays
+        it as long as possible.
+
+        Raises:
+            KeyError: If the state is not reachable within the depth limit.
+        """
+        return self._plies[self._lookup(state)]
+
+    def best_action(self, state: GameState) -> Action | None:
+        """Return an optimal action, or None if the game is over.
+
+        Raises:
+            KeyError: If the state is not reachable within the depth limit.
+        """
+        code = self._best[self._lookup(state)]
+        return self.spells.actions[code] if code >= 0 else None
+
+
+def solve_range(
+    lives: range, max_stack_depth: int = 4, spells: SpellRegistry | None = None
+) -> list[SolverStats]:
+    """Solve the game for each starting life in ``lives``.
+
+    Args:
+        lives: Starting life totals to solve.
+        max_stack_depth: Stack depth at which casting stops.
+        spells: Spell registry. Defaults to ``Game.spells``.
+
+    Returns:
+        One SolverStats per starting life, in order.
+    """
+    return [RetrogradeSolver(life, max_stack_depth, spells).solve() for life in lives]
@@ -0,0 +1,322 @@
+"""Transposition table keyed by GameState Zobrist keys."""
+
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass
+from enum import Enum, auto
+
+
+class ReplacementPolicy(Enum):
+    """How a full bucket chooses which entry to evict.
+
+    - DEPTH_PREFERRED: Evict the shallowest entry, and drop the new entry
+      if it is shallower than everything in the bucket.
+    - ALWAYS_REPLACE: Evict the least recently written entry.
+    - TWO_TIER: Slot 0 of each bucket is depth-preferred and slot 1 is
+      always-replace; a deeper new entry demotes slot 0 into slot 1.
+    """
+
+    DEPTH_PREFERRED = auto()
+    ALWAYS_REPLACE = auto()
+    TWO_TIER = auto()
+
+
+class Bound(Enum):
+    """What a stored value means relative to the true minimax value."""
+
+    EXACT = 0
+    LOWER = 1
+    UPPER = 2
+
+
+# Slots per bucket
+BUCKET_SIZE = 2
+
+# Largest storable depth (depths are signed 16-bit; -1 marks an empty slot)
+MAX_DEPTH = 0x7FFF
+
+# Bytes per slot: key(8) + value(8) + visits(4) + stamp(4) + depth(2)
+# + best_action(2) + bound(1)
+ENTRY_BYTES = 29
+
+
+@dataclass(frozen=True, slots=True)
+class TTEntry:
+    """A snapshot of one stored entry.
+
+    Attributes:
+        key: Full Zobrist key of the state.
+        depth: Search depth (or other quality measure) the entry was stored at.
+        value: Stored value, from the perspective of the player with priority.
+        visits: Visit count.
+        best_action: Code of the best action found, or -1 if unknown.
+        bound: Whether value is exact or a lower/upper bound.
+    """
+
+    key: int
+    depth: int
+    value: float
+    visits: int
+    best_action: int
+    bound: Bound
+
+
+@dataclass(frozen=True, slots=True)
+class TTStats:
+    """Usage statistics for a TranspositionTable.
+
+    Attributes:
+        capacity: Total number of slots.
+        filled: Number of occupied slots.
+        probes: Number of lookups.
+        hits: Lookups that found their key.
+        collisions: Lookups that missed while the bucket held other keys.
+        stores: Number of store calls.
+        evictions: Stores that overwrote a different key.
+        rejected: Stores dropped by the replacement policy.
+    """
+
+    capacity: int
+    filled: int
+    probes: int
+    hits: int
+    collisions: int
+    stores: int
+    evictions: int
+    rejected: int
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of probes that hit."""
+        return self.hits / self.probes if self.probes else 0.0
+
+    @property
+    def occupancy(self) -> float:
+        """Fraction of slots in use."""
+        return self.filled / self.capacity if self.capacity else 0.0
+
+
+class TranspositionTable:
+    """Fixed-size hash table of search results.
+
+    Entries live in preallocated parallel arrays, grouped into buckets of
+    ``BUCKET_SIZE`` slots. The number of buckets is the largest power of two
+    that fits in ``memory_bytes``, and a key's bucket is chosen by its low
+    bits. The full key is stored for verification, so index collisions are
+    detected rather than returned as false hits.
+
+    Attributes:
+        policy: Replacement policy for full buckets.
+        num_buckets: Number of buckets.
+        capacity: Total number of slots.
+    """
+
+    def __init__(
+        self,
+        memory_bytes: int = 64 * 1024 * 1024,
+        policy: ReplacementPolicy = ReplacementPolicy.TWO_TIER,
+    ) -> None:
+        """Preallocate a table within a memory budget.
+
+        Args:
+            memory_bytes: Upper bound on the memory used by entry storage.
+            policy: Replacement policy for full buckets.
+
+        Raises:
+            ValueError: If the budget cannot hold a single bucket.
+        """
+        buckets = memory_bytes // (ENTRY_BYTES * BUCKET_SIZE)
+        if buckets < 1:
+            raise ValueError(
+                f"memory_bytes={memory_bytes} is too small for one bucket "
+                f"({ENTRY_BYTES * BUCKET_SIZE} bytes)"
+            )
+        self.policy: ReplacementPolicy = policy
+        self.num_buckets: int = 1 << (buckets.bit_length() - 1)
+        self.capacity: int = self.num_buckets * BUCKET_SIZE
+        self._mask = self.num_buckets - 1
+        self.clear()
+
+    @property
+    def memory_bytes(self) -> int:
+        """Bytes used by entry storage."""
+        return self.capacity * ENTRY_BYTES
+
+    def clear(self) -> None:
+        """Remove all entries and reset statistics."""
+        n = self.capacity
+        self._keys = array("Q", [0]) * n
+        self._values = array("d", [0.0]) * n
+        self._visits = array("I", [0]) * n
+        self._stamps = array("I", [0]) * n
+        self._depths = array("h", [-1]) * n  # -1 marks an empty slot
+        self._best = array("h", [-1]) * n
+        self._bounds = array("B", [0]) * n
+
+        self._clock = 0
+        self._filled = 0
+        self._probes = 0
+        self._hits = 0
+        self._collisions = 0
+        self._stores = 0
+        self._evictions = 0
+        self._rejected = 0
+
+    def find(self, key: int) -> int:
+        """Locate the slot holding ``key``.
+
+        Args:
+            key: Zobrist key to look up.
+
+        Returns:
+            The slot index, or -1 if the key is not stored.
+        """
+        self._probes += 1
+        base = (key & self._mask) * BUCKET_SIZE
+        keys = self._keys
+        depths = self._depths
+        occupied = False
+        for slot in range(base, base + BUCKET_SIZE):
+            if depths[slot] >= 0:
+                if keys[slot] == key:
+                    self._hits += 1
+                    return slot
+                occupied = True
+        if occupied:
+            self._collisions += 1
+        return -1
+
+    def get(self, key: int) -> TTEntry | None:
+        """Return the entry for ``key``, or None if it is not stored."""
+        slot = self.find(key)
+        if slot < 0:
+            return None
+        return TTEntry(
+            key=self._keys[slot],
+            depth=self._depths[slot],
+            value=self._values[slot],
+            visits=self._visits[slot],
+            best_action=self._best[slot],
+            bound=Bound(self._bounds[slot]),
+        )
+
+    def store(
+        self,
+        key: int,
+        depth: int,
+        value: float,
+        visits: int = 0,
+        best_action: int = -1,
+        bound: Bound = Bound.EXACT,
+    ) -> bool:
+        """Store an entry, subject to the replacement policy.
+
+        An existing entry for the same key is always overwritten.
+
+        Args:
+            key: Zobrist key of the state.
+            depth: Search depth of the result (0 to ``MAX_DEPTH``).
+            value: Value from the perspective of the player with priority.
+            visits: Visit count.
+            best_action: Code of the best action, or -1 if unknown.
+            bound: Whether value is exact or a bound.
+
+        Returns:
+            True if the entry was stored, False if the policy rejected it.
+
+        Raises:
+            ValueError: If ``depth`` is outside 0 to ``MAX_DEPTH``.
+        """
+        if not 0 <= depth <= MAX_DEPTH:
+            raise ValueError(f"depth {depth} outside 0 to {MAX_DEPTH}")
+        self._stores += 1
+        base = (key & self._mask) * BUCKET_SIZE
+        keys = self._keys
+        depths = self._depths
+
+        slot = -1
+        empty = -1
+        for s in range(base, base + BUCKET_SIZE):
+            if depths[s] < 0:
+                if empty < 0:
+                    empty = s
+            elif keys[s] == key:
+                slot = s
+                break
+
+        if slot < 0 and empty >= 0:
+            slot = empty
+            self._filled += 1
+        elif slot < 0:
+            slot = self._victim(base, depth)
+            if slot < 0:
+                self._rejected += 1
+                return False
+            self._evictions += 1
+
+        self._write(slot, key, depth, value, visits, best_action, bound.value)
+        return True
+
+    def _victim(self, base: int, depth: int) -> int:
+        """Choose the slot to evict from a full bucket, or -1 to reject."""
+        depths = self._depths
+        match self.policy:
+            case ReplacementPolicy.DEPTH_PREFERRED:
+                victim = min(range(base, base + BUCKET_SIZE), key=depths.__getitem__)
+                return victim if depth >= depths[victim] else -1
+            case ReplacementPolicy.ALWAYS_REPLACE:
+                return min(
+                    range(base, base + BUCKET_SIZE), key=self._stamps.__getitem__
+                )
+            case ReplacementPolicy.TWO_TIER:
+                if depth >= depths[base]:
+                    # Demote the depth-preferred entry to the always-replace slot
+                    self._copy(base, base + 1)
+                    return base
+                return base + 1
+
+    def _copy(self, src: int, dst: int) -> None:
+        """Copy slot ``src`` over slot ``dst``."""
+        self._write(
+            dst,
+            self._keys[src],
+            self._depths[src],
+            self._values[src],
+            self._visits[src],
+            self._best[src],
+            self._bounds[src],
+        )
+
+    def _write(
+        self,
+        slot: int,
+        key: int,
+        depth: int,
+        value: float,
+        visits: int,
+        best_action: int,
+        bound: int,
+    ) -> None:
+        """Write all fields of one slot."""
+        self._clock += 1
+        self._keys[slot] = key
+        self._depths[slot] = depth
+        self._values[slot] = value
+        self._visits[slot] = visits
+        self._best[slot] = best_action
+        self._bounds[slot] = bound
+        self._stamps[slot] = self._clock & 0xFFFFFFFF
+
+    def stats(self) -> TTStats:
+        """Return current usage statistics."""
+        return TTStats(
+            capacity=self.capacity,
+            filled=self._filled,
+            probes=self._probes,
+            hits=self._hits,
+            collisions=self._collisions,
+            stores=self._stores,
+            evictions=self._evictions,
+            rejected=self._rejected,
+        )
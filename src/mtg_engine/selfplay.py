@@ -0,0 +1,264 @@
+"""Headless self-play: run many games between agents as fast as possible.
+
+Games are spread over a process pool and their results streamed, in game
+order, to a JSONL or fixed-size binary file. Agents are given as text
+specs (see ``mtg_engine.agents.make_agent``) and rebuilt in each worker,
+one fresh pair per game, seeded from the run seed and the game index so a
+run is reproducible for any number of workers. Games can also be recorded
+into a seekable archive (see ``mtg_engine.archive``).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import struct
+import time
+from collections.abc import Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import BinaryIO, TextIO
+
+from mtg_engine.agents import make_agent
+from mtg_engine.archive import ArchiveWriter, EncodedGame, encode_game
+from mtg_engine.engine.game import Game
+from mtg_engine.engine.instrument import GameMetrics, instrument
+from mtg_engine.records import GameRecorder
+
+# Binary result record: game index, winner (-1 for none), turns, actions
+RESULT_STRUCT = struct.Struct("<QbxxxII")
+
+
+@dataclass(frozen=True, slots=True)
+class GameResult:
+    """Outcome of one self-play game.
+
+    Attributes:
+        game: Index of the game within the run.
+        winner: Winning player, or None for a draw or an abandoned game.
+        turns: Turn number when the game ended.
+        actions: Number of actions applied.
+    """
+
+    game: int
+    winner: int | None
+    turns: int
+    actions: int
+
+
+@dataclass(frozen=True, slots=True)
+class SelfPlayStats:
+    """Throughput of a self-play run.
+
+    Attributes:
+        games: Games played.
+        actions: Actions applied across all games.
+        seconds: Wall-clock time of the run.
+        wins: Games won by player 0 and player 1.
+    """
+
+    games: int
+    actions: int
+    seconds: float
+    wins: tuple[int, int]
+
+    @property
+    def games_per_second(self) -> float:
+        """Games completed per second."""
+        return self.games / self.seconds if self.seconds > 0 else 0.0
+
+    @property
+    def actions_per_second(self) -> float:
+        """Actions applied per second."""
+        return self.actions / self.seconds if self.seconds > 0 else 0.0
+
+
+def play_game(
+    index: int,
+    agents: Sequence[str],
+    seed: int = 0,
+    max_actions: int = 10_000,
+    starting_life: int = 20,
+    metrics: GameMetrics | None = None,
+    recorder: GameRecorder | None = None,
+) -> GameResult:
+    """Play one game between freshly built agents.
+
+    Args:
+        index: Index of the game within the run.
+        agents: Agent specs for player 0 and player 1.
+        seed: Run seed. Player ``p`` of game ``i`` is seeded with
+            ``(seed + i) * 2 + p``.
+        max_actions: Actions after which the game is abandoned.
+        starting_life: Starting life total for each player.
+        metrics: If given, the game is instrumented into it.
+        recorder: If given, every action is recorded into it.
+
+    Returns:
+        The game's result.
+    """
+    players = [
+        make_agent(spec, (seed + index) * 2 + p) for p, spec in enumerate(agents)
+    ]
+    game = Game.new(starting_life, check_interval=0)
+    if metrics is not None:
+        instrument(game, metrics)
+    actions = 0
+    while actions < max_actions and not game.is_over():
+        action = players[game.state.priority_player].choose_action(game)
+        if recorder is not None:
+            recorder.record(action)
+        game.apply(action)
+        actions += 1
+    return GameResult(index, game.winner(), game.state.turn, actions)
+
+
+def _play_chunk(
+    start: int,
+    count: int,
+    agents: Sequence[str],
+    seed: int,
+    max_actions: int,
+    starting_life: int,
+    with_metrics: bool,
+    snapshot_interval: int | None,
+) -> tuple[list[GameResult], GameMetrics | None, list[EncodedGame] | None]:
+    """Worker task: play games ``start`` to ``start + count - 1``.
+
+    Returns:
+        The results, the chunk's metrics if ``with_metrics`` is set, and
+        the games encoded for an archive if ``snapshot_interval`` is set.
+    """
+    metrics = GameMetrics() if with_metrics else None
+    results = []
+    encoded = [] if snapshot_interval is not None else None
+    for i in range(start, start + count):
+        recorder = GameRecorder(starting_life) if encoded is not None else None
+        results.append(
+            play_game(i, agents, seed, max_actions, starting_life, metrics, recorder)
+        )
+        if recorder is not None:
+            encoded.append(encode_game(recorder.finish(), snapshot_interval))
+    return results, metrics, encoded
+
+
+def run_selfplay(
+    games: int,
+    agents: Sequence[str] = ("random", "random"),
+    workers: int = 1,
+    seed: int = 0,
+    max_actions: int = 10_000,
+    starting_life: int = 20,
+    chunk_size: int | None = None,
+    metrics: GameMetrics | None = None,
+    archive: ArchiveWriter | None = None,
+) -> Iterator[GameResult]:
+    """Play ``games`` games and yield their results in game order.
+
+    Args:
+        games: Number of games to play.
+        agents: Agent specs for player 0 and player 1.
+        workers: Number of worker processes; 1 plays in this process.
+        seed: Run seed.
+        max_actions: Actions after which a game is abandoned.
+        starting_life: Starting life total for each player.
+        chunk_size: Games per worker task. Defaults to splitting the run
+            into about 8 tasks per worker.
+        metrics: If given, every game is instrumented and its counts are
+            added here (per game in-process, per chunk from workers).
+        archive: If given, every game is recorded and added to it, in game
+            order, before its result is yielded. With several workers the
+            games are encoded, snapshots included, in the workers.
+
+    Yields:
+        One GameResult per game, as soon as its chunk finishes.
+
+    Raises:
+        ValueError: If an agent spec is not recognized.
+    """
+    for spec in agents:
+        make_agent(spec)
+    if workers <= 1:
+        for i in range(games):
+            recorder = GameRecorder(starting_life) if archive is not None else None
+            result = play_game(
+                i, agents, seed, max_actions, starting_life, metrics, recorder
+            )
+            if recorder is not None:
+                archive.add(recorder.finish())
+            yield result
+        return
+
+    if chunk_size is None:
+        chunk_size = max(1, games // (workers * 8))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(
+                _play_chunk,
+                start,
+                min(chunk_size, games - start),
+                tuple(agents),
+                seed,
+                max_actions,
+                starting_life,
+                metrics is not None,
+                archive.snapshot_interval if archive is not None else None,
+            )
+            for start in range(0, games, chunk_size)
+        ]
+        for future in futures:
+            results, chunk_metrics, encoded = future.result()
+            if chunk_metrics is not None:
+                metrics.merge(chunk_metrics)
+            if encoded is not None:
+                for game in encoded:
+                    archive.add_encoded(game)
+            yield from results
+
+
+def write_jsonl(result: GameResult, out: TextIO) -> None:
+    """Write one result as a JSON line."""
+    out.write(json.dumps(asdict(result)) + "\n")
+
+
+def write_binary(result: GameResult, out: BinaryIO) -> None:
+    """Write one result as a ``RESULT_STRUCT`` record."""
+    winner = -1 if result.winner is None else result.winner
+    out.write(RESULT_STRUCT.pack(result.game, winner, result.turns, result.actions))
+
+
+def read_binary(path: str | os.PathLike[str]) -> Iterator[GameResult]:
+    """Read results written by ``write_binary``.
+
+    Args:
+        path: The binary results file.
+
+    Yields:
+        The stored results, in file order.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    for game, winner, turns, actions in RESULT_STRUCT.iter_unpack(data):
+        yield GameResult(game, None if winner < 0 else winner, turns, actions)
+
+
+def summarize(results: Iterator[GameResult], start: float) -> SelfPlayStats:
+    """Consume results and measure throughput.
+
+    Args:
+        results: The results to consume.
+        start: ``time.perf_counter()`` value when the run started.
+
+    Returns:
+        Totals and throughput for the run.
+    """
+    games = actions = 0
+    wins = [0, 0]
+    for result in results:
+        games += 1
+        actions += result.actions
+        if result.winner is not None:
+            wins[result.winner] += 1
+    return SelfPlayStats(
+        games, actions, time.perf_counter() - start, (wins[0], wins[1])
+    )
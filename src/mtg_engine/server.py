@@ -0,0 +1,375 @@
+"""asyncio game server: many concurrent games over a line protocol.
+
+One event loop hosts every game; a game is a plain ``Game`` plus the
+connections attached to it, so thousands of games cost little more than
+their states. Clients speak a text protocol of one command per line and
+receive one or more lines back; ``nc localhost <port>`` is enough to play.
+
+Client commands:
+
+    NEW [life [opponent]]   start a game; opponent is an agent spec that
+                            plays seat 1, or "open" to leave seat 1 for
+                            JOIN (default: this connection plays both)
+    JOIN <game>             take the open seat 1 of a game
+    WATCH <game>            receive a game's updates without playing
+    ACT <game> <a|b|p>      act for the seat holding priority
+    QUIT                    close the connection
+
+Server messages:
+
+    GAME <game> <seats>     reply to NEW or JOIN; seats is 0, 1 or 01
+    STATE <game> <turn> <active> <priority> <life0> <life1> <stack>
+                            pushed to every attached connection after NEW,
+                            JOIN and each ACT (server agents' replies
+                            included); stack is bottom first, e.g. A0.B1,
+                            or - when empty
+    OVER <game> <winner>    pushed after the final STATE; winner is 0, 1,
+                            or - for a draw or an abandoned game
+    ERR <message>           reply to a command that could not be run
+
+Server agents are built once per opponent spec and shared by every game
+that names it; at most ``max_agents`` distinct specs are kept. Their moves
+run one at a time on a worker thread, so a slow search delays only the
+games waiting for an agent, never the event loop.
+
+Backpressure is per connection: after each command the server waits for
+that connection's output to drain before reading its next command, so a
+client that stops reading stops being served. Updates pushed to other
+connections cannot wait on them; a connection whose unsent output grows
+past ``max_write_buffer`` is dropped.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+from collections.abc import Awaitable, Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+from mtg_engine.agents import Agent, make_agent
+from mtg_engine.engine.actions import action_from_input
+from mtg_engine.engine.game import Game
+
+DEFAULT_HOST = "127.0.0.1"
+
+# Longest accepted command line, in bytes
+MAX_LINE = 256
+
+
+class ProtocolError(Exception):
+    """A client command that cannot be run; reported as an ERR line."""
+
+
+@dataclass(eq=False, slots=True)
+class HostedGame:
+    """A game and the connections attached to it.
+
+    Attributes:
+        id: Game id on the server.
+        game: The game.
+        seats: Connection playing each seat; None for a server agent or,
+            with ``open_seat``, a seat waiting for JOIN.
+        agent: Server-side agent playing seat 1, if any.
+        open_seat: True while seat 1 waits for JOIN.
+        watchers: Connections receiving updates without playing.
+    """
+
+    id: int
+    game: Game
+    seats: list[Connection | None]
+    agent: Agent | None = None
+    open_seat: bool = False
+    watchers: set[Connection] = field(default_factory=set)
+
+    def connections(self) -> set[Connection]:
+        """Return every connection that receives this game's updates."""
+        attached = {c for c in self.seats if c is not None}
+        return attached | self.watchers
+
+    def state_line(self) -> str:
+        """Render the current state as a STATE message."""
+        state = self.game.state
+        stack = ".".join(
+            f"{item.name}{item.controller}" for item in state.stack.items()
+        )
+        return (
+            f"STATE {self.id} {state.turn} {state.active_player} "
+            f"{state.priority_player} {state.players[0].life} "
+            f"{state.players[1].life} {stack or '-'}"
+        )
+
+
+@dataclass(eq=False, slots=True)
+class Connection:
+    """One client connection.
+
+    Attributes:
+        writer: The connection's stream writer.
+        games: Games this connection plays in or watches.
+    """
+
+    writer: asyncio.StreamWriter
+    games: set[HostedGame] = field(default_factory=set)
+
+
+class GameServer:
+    """Hosts games for clients of the line protocol.
+
+    Attributes:
+        max_games: Most games hosted at once.
+        max_games_per_connection: Most games one connection may play or
+            watch at once.
+        max_write_buffer: Unsent bytes after which a connection that is
+            not draining its pushed updates is dropped.
+        max_agents: Most distinct opponent specs with a live agent.
+        games: Hosted games by id.
+        agents: Shared server agents by opponent spec.
+    """
+
+    def __init__(
+        self,
+        max_games: int = 100_000,
+        max_games_per_connection: int = 4096,
+        max_write_buffer: int = 1 << 20,
+        max_agents: int = 16,
+    ) -> None:
+        """Configure limits; call ``start`` to listen."""
+        self.max_games: int = max_games
+        self.max_games_per_connection: int = max_games_per_connection
+        self.max_write_buffer: int = max_write_buffer
+        self.max_agents: int = max_agents
+        self.games: dict[int, HostedGame] = {}
+        self.agents: dict[str, Agent] = {}
+        self._ids = itertools.count(1)
+        self._server: asyncio.Server | None = None
+        # One worker: shared agents are not thread-safe, and searches are
+        # CPU-bound, so running them in parallel would gain nothing
+        self._agent_thread = ThreadPoolExecutor(1, thread_name_prefix="agent")
+        self._commands: dict[
+            str, Callable[[Connection, list[str]], Awaitable[None] | None]
+        ] = {
+            "NEW": self._new,
+            "JOIN": self._join,
+            "WATCH": self._watch,
+            "ACT": self._act,
+        }
+
+    async def start(self, host: str = DEFAULT_HOST, port: int = 0) -> int:
+        """Start listening.
+
+        Args:
+            host: Interface to bind.
+            port: Port to bind; 0 picks a free one.
+
+        Returns:
+            The bound port.
+        """
+        self._server = await asyncio.start_server(
+            self._handle, host, port, limit=MAX_LINE
+        )
+        return self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self) -> None:
+        """Serve until cancelled."""
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self) -> None:
+        """Stop listening and wait for the listener to close."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        self._agent_thread.shutdown(wait=False, cancel_futures=True)
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Serve one connection until it quits or disconnects."""
+        conn = Connection(writer)
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    self._send(conn, f"ERR line longer than {MAX_LINE} bytes")
+                    break
+                if not line:
+                    break
+                words = line.decode("ascii", "replace").split()
+                if not words:
+                    continue
+                verb = words[0].upper()
+                if verb == "QUIT":
+                    break
+                command = self._commands.get(verb)
+                try:
+                    if command is None:
+                        raise ProtocolError(f"unknown command {words[0]!r}")
+                    pending = command(conn, words[1:])
+                    if pending is not None:
+                        await pending
+                except ProtocolError as e:
+                    self._send(conn, f"ERR {e}")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self._disconnect(conn)
+            writer.close()
+
+    def _send(self, conn: Connection, line: str) -> None:
+        """Queue one line for a connection, dropping it if it is too far behind."""
+        writer = conn.writer
+        if writer.is_closing():
+            return
+        writer.write(line.encode("ascii", "replace") + b"\n")
+        if writer.transport.get_write_buffer_size() > self.max_write_buffer:
+            writer.transport.abort()
+
+    def _push(self, hosted: HostedGame, line: str) -> None:
+        """Send a line to every connection attached to a game."""
+        for conn in hosted.connections():
+            self._send(conn, line)
+
+    def _lookup(self, conn: Connection, args: list[str]) -> HostedGame:
+        """Return the game named by the first argument."""
+        if not args:
+            raise ProtocolError("missing game id")
+        try:
+            hosted = self.games.get(int(args[0]))
+        except ValueError:
+            raise ProtocolError(f"bad game id {args[0]!r}") from None
+        if hosted is None:
+            raise ProtocolError(f"no game {args[0]}")
+        return hosted
+
+    def _attach(self, conn: Connection, hosted: HostedGame) -> None:
+        """Record that a connection follows a game, within its limit."""
+        if len(conn.games) >= self.max_games_per_connection:
+            raise ProtocolError(
+                f"connection already has {self.max_games_per_connection} games"
+            )
+        conn.games.add(hosted)
+
+    def _new(self, conn: Connection, args: list[str]) -> None:
+        """NEW [life [opponent]]"""
+        if len(self.games) >= self.max_games:
+            raise ProtocolError("server is full")
+        try:
+            life = int(args[0]) if args else 20
+        except ValueError:
+            raise ProtocolError(f"bad starting life {args[0]!r}") from None
+        if life < 1:
+            raise ProtocolError("starting life must be positive")
+        opponent = args[1] if len(args) > 1 else None
+
+        agent = None
+        if opponent is not None and opponent != "open":
+            agent = self._agent(opponent)
+        game_id = next(self._ids)
+        hosted = HostedGame(
+            game_id,
+            Game.new(life, check_interval=0),
+            seats=[conn, conn if opponent is None else None],
+            agent=agent,
+            open_seat=opponent == "open",
+        )
+        self._attach(conn, hosted)
+        self.games[game_id] = hosted
+        self._send(conn, f"GAME {game_id} {'01' if opponent is None else '0'}")
+        self._push(hosted, hosted.state_line())
+
+    def _agent(self, spec: str) -> Agent:
+        """Return the shared agent for an opponent spec, building it once."""
+        agent = self.agents.get(spec)
+        if agent is None:
+            if len(self.agents) >= self.max_agents:
+                raise ProtocolError(
+                    f"server already runs {self.max_agents} kinds of opponent"
+                )
+            try:
+                agent = make_agent(spec)
+            except ValueError as e:
+                raise ProtocolError(str(e)) from None
+            self.agents[spec] = agent
+        return agent
+
+    def _join(self, conn: Connection, args: list[str]) -> None:
+        """JOIN <game>"""
+        hosted = self._lookup(conn, args)
+        if not hosted.open_seat:
+            raise ProtocolError(f"game {hosted.id} has no open seat")
+        self._attach(conn, hosted)
+        hosted.seats[1] = conn
+        hosted.open_seat = False
+        self._send(conn, f"GAME {hosted.id} 1")
+        self._push(hosted, hosted.state_line())
+
+    def _watch(self, conn: Connection, args: list[str]) -> None:
+        """WATCH <game>"""
+        hosted = self._lookup(conn, args)
+        self._attach(conn, hosted)
+        hosted.watchers.add(conn)
+        self._send(conn, hosted.state_line())
+
+    async def _act(self, conn: Connection, args: list[str]) -> None:
+        """ACT <game> <a|b|p>"""
+        hosted = self._lookup(conn, args)
+        if len(args) < 2:
+            raise ProtocolError("missing action")
+        action = action_from_input(args[1])
+        if action is None:
+            raise ProtocolError(f"bad action {args[1]!r}; use a, b or p")
+        game = hosted.game
+        if hosted.seats[game.state.priority_player] is not conn:
+            raise ProtocolError(
+                f"player {game.state.priority_player} has priority in game {hosted.id}"
+            )
+
+        game.apply(action)
+        # Server agents reply before the update is pushed. They search a
+        # copy on the worker thread, so the hosted game stays readable
+        agent = hosted.agent
+        loop = asyncio.get_running_loop()
+        while agent is not None and game.state.priority_player == 1:
+            if game.is_over():
+                break
+            game.apply(
+                await loop.run_in_executor(
+                    self._agent_thread, agent.choose_action, game.clone()
+                )
+            )
+        self._push(hosted, hosted.state_line())
+        if game.is_over():
+            self._finish(hosted, game.winner())
+
+    def _finish(self, hosted: HostedGame, winner: int | None) -> None:
+        """Announce the end of a game and stop hosting it."""
+        self._push(hosted, f"OVER {hosted.id} {'-' if winner is None else winner}")
+        for conn in hosted.connections():
+            conn.games.discard(hosted)
+        del self.games[hosted.id]
+
+    def _disconnect(self, conn: Connection) -> None:
+        """Detach a connection, abandoning the games it was playing."""
+        for hosted in list(conn.games):
+            conn.games.discard(hosted)
+            hosted.watchers.discard(conn)
+            if conn in hosted.seats:
+                hosted.seats = [None if c is conn else c for c in hosted.seats]
+                self._finish(hosted, None)
+
+
+async def serve(host: str = DEFAULT_HOST, port: int = 0, **limits: int) -> None:
+    """Run a GameServer until cancelled, printing the bound address.
+
+    Args:
+        host: Interface to bind.
+        port: Port to bind; 0 picks a free one.
+        **limits: GameServer limits.
+    """
+    server = GameServer(**limits)
+    bound = await server.start(host, port)
+    print(f"Serving on {host}:{bound}", flush=True)
+    await server.serve_forever()
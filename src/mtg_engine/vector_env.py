@@ -0,0 +1,321 @@
+"""Vectorized environment: many games stepped in worker processes.
+
+``VectorEnv`` follows the usual ``reset()`` / ``step(actions)`` shape of
+RL vector environments. Each worker process owns a contiguous slice of
+the games. Actions, observations, rewards, termination flags and
+legal-action masks all live in one ``multiprocessing.shared_memory``
+block, so a batch step moves no per-game messages: the main process
+writes the actions and a command, then every process passes one shared
+barrier to start the step and again to finish it.
+
+Observations are the ``ObservationEncoder`` encoding, relative to the
+player with priority (the one who acts next). A step's reward is from
+the perspective of the player who just acted: 1 if that action won the
+game, -1 if it lost it, else 0. Finished games are replaced with
+``Game.new`` immediately, so the observation and mask returned for a
+finished game already belong to its next game.
+
+The buffers are exposed as memoryviews that are overwritten in place by
+every ``reset``/``step``; wrap them with e.g.
+``numpy.asarray(env.observations)`` for zero-copy arrays (plain
+memoryviews do not support row indexing of 2-D views; use ``tolist()``),
+and copy anything that must outlive the next step.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+import threading
+from collections.abc import Sequence
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Self
+
+from mtg_engine.engine.actions import ACTION_TYPES, ACTIONS
+from mtg_engine.engine.game import Game
+from mtg_engine.features import ObservationEncoder
+
+# Commands written to the shared command slot before each barrier
+_RESET = 0
+_STEP = 1
+_CLOSE = 2
+
+NUM_ACTIONS = len(ACTION_TYPES)
+
+# Legal-action bitmask -> one 0/1 byte per action code
+_MASK_BYTES: tuple[bytes, ...] = tuple(
+    bytes(mask >> code & 1 for code in range(NUM_ACTIONS))
+    for mask in range(1 << NUM_ACTIONS)
+)
+
+
+class _SharedBuffers:
+    """Typed views over the shared block.
+
+    Layout: command (i32), observations (f32, ``num_envs * obs_size``),
+    rewards (f32), actions (i8), terminated (u8), truncated (u8), masks
+    (u8, ``num_envs * NUM_ACTIONS``). Float sections come first so they
+    stay 4-byte aligned.
+    """
+
+    def __init__(self, buf: memoryview, num_envs: int, obs_size: int) -> None:
+        self._views: list[memoryview] = []
+        offset = 0
+
+        def view(fmt: str, itemsize: int, count: int) -> memoryview:
+            nonlocal offset
+            v = buf[offset : offset + itemsize * count].cast(fmt)
+            offset += itemsize * count
+            self._views.append(v)
+            return v
+
+        self.command = view("i", 4, 1)
+        self.observations = view("f", 4, num_envs * obs_size)
+        self.rewards = view("f", 4, num_envs)
+        self.actions = view("b", 1, num_envs)
+        self.terminated = view("B", 1, num_envs)
+        self.truncated = view("B", 1, num_envs)
+        self.masks = view("B", 1, num_envs * NUM_ACTIONS)
+
+    @staticmethod
+    def nbytes(num_envs: int, obs_size: int) -> int:
+        """Size of the shared block for ``num_envs`` games."""
+        return (
+            4
+            + 4 * num_envs * obs_size
+            + 4 * num_envs
+            + 3 * num_envs
+            + (num_envs * NUM_ACTIONS)
+        )
+
+    def release(self) -> None:
+        """Release every view so the block can be closed."""
+        for v in self._views:
+            v.release()
+        self._views.clear()
+
+
+def _worker(
+    shm_name: str,
+    num_envs: int,
+    lo: int,
+    hi: int,
+    barrier: Any,
+    starting_life: int,
+    max_stack: int,
+    max_episode_steps: int,
+) -> None:
+    """Worker process: step games ``lo`` to ``hi - 1`` on each barrier."""
+    encoder = ObservationEncoder(max_stack)
+    size = encoder.size
+    shm = SharedMemory(name=shm_name, track=False)
+    views = _SharedBuffers(shm.buf, num_envs, size)
+    games = [Game.new(starting_life, check_interval=0) for _ in range(lo, hi)]
+    steps = [0] * (hi - lo)
+    try:
+        while True:
+            barrier.wait()
+            command = views.command[0]
+            if command == _CLOSE:
+                break
+            obs, masks = views.observations, views.masks
+            rewards, actions = views.rewards, views.actions
+            terminated, truncated = views.terminated, views.truncated
+            for j, i in enumerate(range(lo, hi)):
+                game = games[j]
+                reward = 0.0
+                done = cut = 0
+                if command == _RESET:
+                    game = games[j] = Game.new(starting_life, check_interval=0)
+                    steps[j] = 0
+                else:
+                    player = game.state.priority_player
+                    game.apply(ACTIONS[actions[i]])
+                    steps[j] += 1
+                    if game.is_over():
+                        winner = game.winner()
+                        if winner is not None:
+                            reward = 1.0 if winner == player else -1.0
+                        done = 1
+                    elif steps[j] >= max_episode_steps:
+                        cut = 1
+                    if done or cut:
+                        game = games[j] = Game.new(starting_life, check_interval=0)
+                        steps[j] = 0
+                rewards[i] = reward
+                terminated[i] = done
+                truncated[i] = cut
+                encoder.encode_into(game.state, obs, i * size)
+                base = i * NUM_ACTIONS
+                masks[base : base + NUM_ACTIONS] = _MASK_BYTES[game.legal_action_mask()]
+            barrier.wait()
+    except BaseException:
+        barrier.abort()
+        raise
+    finally:
+        views.release()
+        shm.close()
+
+
+class VectorEnv:
+    """A batch of games stepped in parallel by worker processes.
+
+    Use as a context manager, or call ``close``, to stop the workers and
+    free the shared memory.
+
+    Attributes:
+        num_envs: Number of games.
+        workers: Number of worker processes.
+        observation_size: Floats per observation.
+        num_actions: Action codes per game (positions in ``ACTION_TYPES``).
+        observations: ``[num_envs, observation_size]`` float32 view.
+        rewards: ``[num_envs]`` float32 view.
+        terminated: ``[num_envs]`` uint8 view; 1 where a game just ended.
+        truncated: ``[num_envs]`` uint8 view; 1 where a game was cut off
+            at ``max_episode_steps``.
+        action_masks: ``[num_envs, num_actions]`` uint8 view of legal
+            actions for the player with priority.
+    """
+
+    def __init__(
+        self,
+        num_envs: int,
+        workers: int | None = None,
+        starting_life: int = 20,
+        max_stack: int = 8,
+        max_episode_steps: int = 10_000,
+    ) -> None:
+        """Allocate the shared buffers and start the workers.
+
+        Args:
+            num_envs: Number of games.
+            workers: Worker processes. Defaults to ``os.cpu_count()``,
+                capped at ``num_envs``.
+            starting_life: Starting life for every game.
+            max_stack: Stack slots in each observation.
+            max_episode_steps: Steps after which a game is truncated.
+
+        Raises:
+            ValueError: If ``num_envs`` is not positive.
+        """
+        if num_envs < 1:
+            raise ValueError("num_envs must be positive")
+        self.num_envs: int = num_envs
+        self.workers: int = min(workers or os.cpu_count() or 1, num_envs)
+        self.observation_size: int = ObservationEncoder(max_stack).size
+        self.num_actions: int = NUM_ACTIONS
+
+        self._shm = SharedMemory(
+            create=True, size=_SharedBuffers.nbytes(num_envs, self.observation_size)
+        )
+        self._buffers = _SharedBuffers(self._shm.buf, num_envs, self.observation_size)
+        buffers = self._buffers
+        self.observations: memoryview = buffers.observations.cast("B").cast(
+            "f", [num_envs, self.observation_size]
+        )
+        self.rewards: memoryview = buffers.rewards
+        self.terminated: memoryview = buffers.terminated
+        self.truncated: memoryview = buffers.truncated
+        self.action_masks: memoryview = buffers.masks.cast("B", [num_envs, NUM_ACTIONS])
+        self._exports = [self.observations, self.action_masks]
+
+        self._barrier = multiprocessing.Barrier(self.workers + 1)
+        bounds = [num_envs * w // self.workers for w in range(self.workers + 1)]
+        self._processes = [
+            multiprocessing.Process(
+                target=_worker,
+                args=(
+                    self._shm.name,
+                    num_envs,
+                    bounds[w],
+                    bounds[w + 1],
+                    self._barrier,
+                    starting_life,
+                    max_stack,
+                    max_episode_steps,
+                ),
+                daemon=True,
+            )
+            for w in range(self.workers)
+        ]
+        for process in self._processes:
+            process.start()
+        self._closed = False
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def _run(self, command: int) -> None:
+        """Have every worker run ``command`` and wait for them to finish."""
+        if self._closed:
+            raise RuntimeError("VectorEnv is closed")
+        self._buffers.command[0] = command
+        try:
+            self._barrier.wait()
+            self._barrier.wait()
+        except threading.BrokenBarrierError as e:
+            raise RuntimeError("a VectorEnv worker failed") from e
+
+    def reset(self) -> memoryview:
+        """Start a new game in every slot.
+
+        Returns:
+            The observations view.
+        """
+        self._run(_RESET)
+        return self.observations
+
+    def step(
+        self, actions: Sequence[int]
+    ) -> tuple[memoryview, memoryview, memoryview, memoryview]:
+        """Apply one action code per game.
+
+        Args:
+            actions: One action code per game, for the player with
+                priority.
+
+        Returns:
+            The observations, rewards, terminated and truncated views.
+
+        Raises:
+            ValueError: If the number of actions or an action code is
+                invalid.
+        """
+        if self._closed:
+            raise RuntimeError("VectorEnv is closed")
+        if len(actions) != self.num_envs:
+            raise ValueError(f"expected {self.num_envs} actions, got {len(actions)}")
+        out = self._buffers.actions
+        for i, code in enumerate(actions):
+            if not 0 <= code < NUM_ACTIONS:
+                raise ValueError(f"invalid action code {code} for game {i}")
+            out[i] = code
+        self._run(_STEP)
+        return self.observations, self.rewards, self.terminated, self.truncated
+
+    def close(self) -> None:
+        """Stop the workers and free the shared memory."""
+        if self._closed:
+            return
+        self._closed = True
+        self._buffers.command[0] = _CLOSE
+        try:
+            self._barrier.wait(timeout=5)
+        except threading.BrokenBarrierError:
+            pass
+        for process in self._processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+                process.join()
+        try:
+            for view in self._exports:
+                view.release()
+            self._buffers.release()
+            self._shm.close()
+        except BufferError:
+            pass  # arrays over the buffers are still alive; they keep the mapping
+        self._shm.unlink()
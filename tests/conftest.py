@@ -0,0 +1,15 @@
+"""Shared test helpers."""
+
+from mtg_engine.engine.actions import Action, ActionType
+from mtg_engine.engine.game import Game
+
+
+def lethal_on_pass() -> Game:
+    """P0 has lethal on the stack, but loses to any response if it casts."""
+    g = Game.new()
+    g.state.players[0].life = 2
+    g.state.players[1].life = 3
+    g.state.recompute_key()
+    g.apply(Action(ActionType.CAST_A))
+    g.apply(Action(ActionType.PASS))
+    return g
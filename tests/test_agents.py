@@ -0,0 +1,51 @@
+"""Tests for built-in agents."""
+
+import pytest
+
+from mtg_engine.agents import GreedyAgent, RandomAgent, make_agent
+from mtg_engine.engine.actions import Action, ActionType
+from mtg_engine.engine.game import Game
+from mtg_engine.search.mcts import MCTS
+
+
+class TestAgents:
+    """Tests for agent behaviour and construction."""
+
+    def test_random_agent_is_seeded(self) -> None:
+        """Equal seeds give equal choices."""
+        g = Game.new()
+        a = [RandomAgent(5).choose_action(g) for _ in range(3)]
+        b = [RandomAgent(5).choose_action(g) for _ in range(3)]
+        assert a == b
+
+    def test_greedy_casts_then_lets_it_resolve(self) -> None:
+        """Greedy casts its best spell on an empty stack and passes otherwise."""
+        g = Game.new()
+        agent = GreedyAgent()
+        assert agent.choose_action(g) == Action(ActionType.CAST_A)
+        g.apply(Action(ActionType.CAST_A))
+        assert agent.choose_action(g) == Action(ActionType.PASS)
+
+    def test_greedy_self_play_terminates(self) -> None:
+        """Two greedy agents finish a game: the active player burns out P1."""
+        g = Game.new()
+        agent = GreedyAgent()
+        for _ in range(100):
+            if g.is_over():
+                break
+            g.apply(agent.choose_action(g))
+        assert g.winner() == 0
+
+    def test_make_agent(self) -> None:
+        """Specs map to the right agent types."""
+        assert isinstance(make_agent("random"), RandomAgent)
+        assert isinstance(make_agent("greedy"), GreedyAgent)
+        agent = make_agent("mcts:25", seed=1)
+        assert isinstance(agent, MCTS)
+        assert agent.simulations == 25
+
+    @pytest.mark.parametrize("spec", ["", "minimax", "mcts:0", "mcts:x", "random:3"])
+    def test_make_agent_rejects_bad_specs(self, spec: str) -> None:
+        """Unknown names and malformed arguments raise ValueError."""
+        with pytest.raises(ValueError):
+            make_agent(spec)
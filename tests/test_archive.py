@@ -0,0 +1,180 @@
+"""Tests for the seekable multi-game archive."""
+
+import random
+from pathlib import Path
+
+import pytest
+
+from mtg_engine.archive import ArchiveWriter, GameArchive, encode_game, index_path
+from mtg_engine.engine.actions import ACTIONS, Action
+from mtg_engine.engine.game import Game, UndoRecord
+from mtg_engine.engine.state import GameState
+from mtg_engine.records import GameRecord, GameRecorder
+from mtg_engine.selfplay import run_selfplay
+
+
+def record_random_game(
+    seed: int, starting_life: int = 20
+) -> tuple[GameRecord, list[GameState]]:
+    """Play a random game, returning its record and the state at each ply."""
+    rng = random.Random(seed)
+    game = Game.new(starting_life)
+    recorder = GameRecorder(starting_life)
+    states = [game.state.clone_shallow()]
+    while not game.is_over():
+        action = ACTIONS[rng.randrange(len(ACTIONS))]
+        recorder.record(action)
+        game.apply(action)
+        states.append(game.state.clone_shallow())
+    return recorder.finish(), states
+
+
+class TestArchive:
+    """Tests for writing and seeking an archive."""
+
+    def test_every_ply_of_every_game(self, tmp_path: Path) -> None:
+        """Any ply of any game reconstructs the originally played state."""
+        path = tmp_path / "games.mtga"
+        games = [record_random_game(seed) for seed in range(5)]
+        with ArchiveWriter(path, snapshot_interval=8) as writer:
+            for record, _ in games:
+                writer.add(record)
+
+        with GameArchive(path) as archive:
+            assert len(archive) == 5
+            for index in (3, 0, 4, 1, 2):
+                record, states = games[index]
+                assert archive.record(index) == record
+                for ply in range(record.length, -1, -1):
+                    state = archive.state_at(index, ply)
+                    assert state == states[ply]
+                    assert state.key == states[ply].key
+
+    def test_seek_applies_fewer_than_interval(self, tmp_path: Path) -> None:
+        """Reaching a ply costs at most ``snapshot_interval - 1`` applies."""
+        path = tmp_path / "games.mtga"
+        record, _ = record_random_game(7)
+        with ArchiveWriter(path, snapshot_interval=16) as writer:
+            writer.add(record)
+
+        applied = 0
+        original = Game.apply
+
+        def counting_apply(self: Game, action: Action) -> UndoRecord:
+            nonlocal applied
+            applied += 1
+            return original(self, action)
+
+        with GameArchive(path) as archive:
+            Game.apply = counting_apply
+            try:
+                for ply in range(record.length + 1):
+                    applied = 0
+                    archive.game_at(0, ply)
+                    assert applied < 16
+            finally:
+                Game.apply = original
+
+    def test_reopen_appends(self, tmp_path: Path) -> None:
+        """Reopening an archive appends and keeps its snapshot interval."""
+        path = tmp_path / "games.mtga"
+        first, _ = record_random_game(1)
+        second, second_states = record_random_game(2)
+        with ArchiveWriter(path, snapshot_interval=4) as writer:
+            assert writer.add(first) == 0
+        with ArchiveWriter(path, snapshot_interval=100) as writer:
+            assert writer.snapshot_interval == 4
+            assert writer.add(second) == 1
+
+        with GameArchive(path) as archive:
+            assert len(archive) == 2
+            assert archive.snapshot_interval == 4
+            assert archive.state_at(1) == second_states[-1]
+
+    def test_add_encoded(self, tmp_path: Path) -> None:
+        """Pre-encoded games are appended as is, if the interval matches."""
+        path = tmp_path / "games.mtga"
+        record, states = record_random_game(4)
+        with ArchiveWriter(path, snapshot_interval=8) as writer:
+            assert writer.add_encoded(encode_game(record, 8)) == 0
+            with pytest.raises(ValueError):
+                writer.add_encoded(encode_game(record, 4))
+        with GameArchive(path) as archive:
+            assert len(archive) == 1
+            assert archive.state_at(0, 9) == states[9]
+
+    def test_out_of_range(self, tmp_path: Path) -> None:
+        """Unknown games and plies raise IndexError."""
+        path = tmp_path / "games.mtga"
+        record, _ = record_random_game(3)
+        with ArchiveWriter(path) as writer:
+            writer.add(record)
+        with GameArchive(path) as archive:
+            with pytest.raises(IndexError):
+                archive.record(1)
+            with pytest.raises(IndexError):
+                archive.game_at(0, record.length + 1)
+
+    def test_deep_stack_snapshot(self, tmp_path: Path) -> None:
+        """Snapshots keep stacks deeper than a few items."""
+        recorder = GameRecorder()
+        for i in range(300):
+            recorder.record(ACTIONS[i % 2])
+        path = tmp_path / "games.mtga"
+        with ArchiveWriter(path, snapshot_interval=100) as writer:
+            writer.add(recorder.finish())
+        with GameArchive(path) as archive:
+            assert len(archive.state_at(0, 250).stack) == 250
+
+    @pytest.mark.parametrize("index", [None, b"", b"MTGAIDX1" + bytes(5), b"junk"])
+    def test_rejects_damaged_index(self, tmp_path: Path, index: bytes | None) -> None:
+        """A missing, empty, short or foreign index is not overwritten."""
+        path = tmp_path / "games.mtga"
+        record, _ = record_random_game(3)
+        with ArchiveWriter(path) as writer:
+            writer.add(record)
+        if index is None:
+            index_path(path).unlink()
+        else:
+            index_path(path).write_bytes(index)
+        with pytest.raises(ValueError):
+            ArchiveWriter(path)
+        with pytest.raises((ValueError, FileNotFoundError)):
+            GameArchive(path)
+        assert index_path(path).exists() == (index is not None)
+
+    def test_rejects_bad_interval(self, tmp_path: Path) -> None:
+        """A non-positive snapshot interval is rejected before any file opens."""
+        path = tmp_path / "games.mtga"
+        with pytest.raises(ValueError):
+            ArchiveWriter(path, snapshot_interval=0)
+        assert not path.exists()
+        assert not index_path(path).exists()
+
+    def test_rejects_non_archive(self, tmp_path: Path) -> None:
+        """Opening an unrelated file raises ValueError."""
+        path = tmp_path / "games.mtga"
+        path.write_bytes(b"not an archive at all")
+        index_path(path).write_bytes(b"")
+        with pytest.raises(ValueError):
+            GameArchive(path)
+        with pytest.raises(ValueError):
+            ArchiveWriter(path)
+
+    def test_selfplay_archive(self, tmp_path: Path) -> None:
+        """Self-play records every game, in order, for any worker count."""
+        results = {}
+        for workers in (1, 2):
+            path = tmp_path / f"games{workers}.mtga"
+            with ArchiveWriter(path, snapshot_interval=32) as writer:
+                results[workers] = list(
+                    run_selfplay(6, workers=workers, seed=5, archive=writer)
+                )
+            with GameArchive(path) as archive:
+                assert len(archive) == 6
+                for result in results[workers]:
+                    game = archive.game_at(result.game)
+                    assert archive.record(result.game).length == result.actions
+                    assert game.winner() == result.winner
+                    assert game.state.turn == result.turns
+        assert results[1] == results[2]
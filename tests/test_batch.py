@@ -0,0 +1,120 @@
+"""Tests for the batched game environment."""
+
+import random
+
+import pytest
+
+from mtg_engine.engine.actions import ACTION_TYPES, Action, ActionType
+from mtg_engine.engine.game import Game, GameInvariantError
+
+pytest.importorskip("numpy")
+
+from mtg_engine.engine.batch import CAST_A, CAST_B, PASS, BatchGame
+
+
+def assert_same_state(batch: BatchGame, i: int, game: Game) -> None:
+    """Assert that batched game ``i`` matches a reference Game."""
+    assert batch.get_state(i) == game.state
+
+
+class TestBatchGame:
+    """Tests for BatchGame."""
+
+    def test_new_batch_matches_new_game(self) -> None:
+        """A fresh batch holds fresh games."""
+        batch = BatchGame(3, starting_life=15)
+        for i in range(3):
+            assert_same_state(batch, i, Game.new(15))
+
+    def test_stack_resolution(self) -> None:
+        """Casts push, and pass/pass resolves LIFO like Game.apply."""
+        batch = BatchGame(1)
+        for code in (CAST_A, CAST_B, PASS, PASS):
+            batch.apply([code])
+
+        assert batch.life[0].tolist() == [18, 20]
+        assert batch.stack_depth[0] == 1
+        assert batch.priority_player[0] == batch.active_player[0]
+
+    def test_pass_pass_advances_turn(self) -> None:
+        """Pass/pass with an empty stack advances the turn."""
+        batch = BatchGame(1)
+        batch.apply([PASS])
+        batch.apply([PASS])
+
+        assert batch.turn[0] == 2
+        assert batch.active_player[0] == 1
+        assert batch.priority_player[0] == 1
+        assert batch.pass_streak[0] == 0
+
+    def test_matches_game_apply(self) -> None:
+        """Random action sequences produce the same states as Game.apply."""
+        rng = random.Random(1234)
+        n = 16
+        games = [Game.new() for _ in range(n)]
+        batch = BatchGame.from_games(games, max_stack_depth=256)
+
+        for _ in range(200):
+            codes = [rng.choice((CAST_A, CAST_B, PASS, PASS)) for _ in range(n)]
+            batch.apply(codes)
+            for game, code in zip(games, codes):
+                game.apply(Action(ACTION_TYPES[code]))
+
+        for i, game in enumerate(games):
+            assert_same_state(batch, i, game)
+            assert batch.is_over(i) == game.is_over()
+            assert batch.winner(i) == game.winner()
+
+    def test_reset(self) -> None:
+        """reset restores only the selected games."""
+        batch = BatchGame(2)
+        batch.apply([CAST_A, CAST_A])
+        batch.reset([1])
+
+        assert batch.stack_depth[0] == 1
+        assert_same_state(batch, 1, Game.new())
+
+    def test_reset_from_games(self) -> None:
+        """A batch built from games resets to the copied states."""
+        game = Game.new(5)
+        game.apply(Action(ActionType.CAST_B))
+        batch = BatchGame.from_games([Game.new(5), game])
+        batch.apply([CAST_A, PASS])
+        batch.reset()
+
+        assert_same_state(batch, 0, Game.new(5))
+        assert_same_state(batch, 1, game)
+
+    def test_stack_overflow_raises(self) -> None:
+        """Casting past max_stack_depth raises."""
+        batch = BatchGame(1, max_stack_depth=2)
+        batch.apply([CAST_A])
+        batch.apply([CAST_B])
+        with pytest.raises(GameInvariantError):
+            batch.apply([CAST_A])
+
+    def test_rejected_step_changes_nothing(self) -> None:
+        """A step that fails for one game leaves every game unchanged."""
+        batch = BatchGame(3, max_stack_depth=1)
+        batch.apply([PASS, PASS, CAST_A])
+        before = [batch.get_state(i) for i in range(3)]
+
+        with pytest.raises(GameInvariantError):
+            batch.apply([PASS, CAST_A, CAST_B])
+        with pytest.raises(KeyError):
+            batch.apply([PASS, PASS, len(ACTION_TYPES)])
+        assert [batch.get_state(i) for i in range(3)] == before
+
+    def test_wrong_length_raises(self) -> None:
+        """apply requires one code per game."""
+        batch = BatchGame(2)
+        with pytest.raises(ValueError):
+            batch.apply([PASS])
+        with pytest.raises(ValueError, match="got 1"):
+            batch.apply(PASS)
+
+    def test_codes_follow_action_types(self) -> None:
+        """Action codes are positions in ACTION_TYPES."""
+        assert ACTION_TYPES[CAST_A] is ActionType.CAST_A
+        assert ACTION_TYPES[CAST_B] is ActionType.CAST_B
+        assert ACTION_TYPES[PASS] is ActionType.PASS
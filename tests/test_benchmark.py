@@ -0,0 +1,83 @@
+"""Tests for the benchmark runner's regression tracking."""
+
+import importlib.util
+import json
+import sys
+from pathlib import Path
+from types import ModuleType
+
+import pytest
+
+
+def load_benchmark() -> ModuleType:
+    """Import tools/benchmark.py, which is a script rather than a module."""
+    path = Path(__file__).parent.parent / "tools" / "benchmark.py"
+    spec = importlib.util.spec_from_file_location("benchmark", path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module  # dataclasses look their module up here
+    spec.loader.exec_module(module)
+    return module
+
+
+benchmark = load_benchmark()
+
+
+def write_results(path: Path, metrics: dict[str, float]) -> Path:
+    """Write a results file in the runner's format."""
+    benchmark.save_results(path, metrics)
+    return path
+
+
+class TestCompare:
+    """Tests for comparing results against a baseline."""
+
+    def test_within_threshold(self) -> None:
+        """Small drops and any gains pass."""
+        result = benchmark.compare(
+            {"a": 100.0, "b": 100.0}, {"a": 85.0, "b": 300.0}, 0.2
+        )
+        assert [c.regressed for c in result] == [False, False]
+        assert result[0].change == pytest.approx(-0.15)
+
+    def test_regression(self) -> None:
+        """A drop beyond the threshold is flagged."""
+        (c,) = benchmark.compare({"a": 100.0}, {"a": 70.0}, 0.2)
+        assert c.regressed
+
+    def test_added_and_removed_metrics(self) -> None:
+        """Metrics present on only one side are reported but never fail."""
+        result = benchmark.compare({"old": 1.0}, {"new": 1.0})
+        assert [(c.name, c.change, c.regressed) for c in result] == [
+            ("new", None, False),
+            ("old", None, False),
+        ]
+
+
+class TestMain:
+    """Tests for the command-line runner."""
+
+    def test_compare_exit_status(self, tmp_path: Path) -> None:
+        """The runner exits 1 on regression and 0 otherwise."""
+        base = write_results(tmp_path / "base.json", {"a": 100.0})
+        slow = write_results(tmp_path / "slow.json", {"a": 50.0})
+        ok = write_results(tmp_path / "ok.json", {"a": 95.0})
+
+        argv = ["--baseline", str(base), "--compare"]
+        assert benchmark.main([*argv, str(slow)]) == 1
+        assert benchmark.main([*argv, str(ok)]) == 0
+        assert benchmark.main([*argv, str(slow), "--threshold", "0.6"]) == 0
+
+    def test_run_and_save(self, tmp_path: Path) -> None:
+        """A filtered run writes results that load back."""
+        out = tmp_path / "results.json"
+        assert benchmark.main(["-k", "stack.", "--repeat", "1", "-o", str(out)]) == 0
+
+        metrics = benchmark.load_results(out)
+        assert list(metrics) == ["stack.push_pop"]
+        assert metrics["stack.push_pop"] > 0
+        assert json.loads(out.read_text())["version"] == benchmark.RESULTS_VERSION
+
+    def test_every_benchmark_runs(self) -> None:
+        """Each registered benchmark produces a positive rate."""
+        for name, factory in benchmark.BENCHMARKS.items():
+            assert factory()() > 0, name
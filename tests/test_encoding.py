@@ -0,0 +1,143 @@
+"""Tests for the binary GameState encoding."""
+
+from multiprocessing.shared_memory import SharedMemory
+
+import pytest
+
+from mtg_engine.engine.actions import Action, ActionType
+from mtg_engine.engine.game import Game
+from mtg_engine.engine.spells import SpellDefinition, SpellRegistry
+from mtg_engine.engine.stack import StackItem
+from mtg_engine.engine.state import (
+    MAX_ENCODED_STACK,
+    STATE_HEADER_SIZE,
+    GameState,
+    encoded_size,
+    new_game,
+)
+
+
+class TestStateEncoding:
+    """Tests for GameState.to_bytes/from_bytes/into_buffer."""
+
+    def test_round_trip_new_game(self) -> None:
+        """A fresh state survives encoding."""
+        state = new_game(starting_life=33)
+        data = state.to_bytes()
+        assert len(data) == STATE_HEADER_SIZE == state.encoded_size
+
+        decoded = GameState.from_bytes(data)
+        assert decoded == state
+        assert decoded.key == state.key
+
+    def test_round_trip_mid_game(self) -> None:
+        """Stack contents, lives and priority survive encoding."""
+        g = Game.new()
+        for t in (ActionType.CAST_A, ActionType.CAST_B, ActionType.PASS):
+            g.apply(Action(t))
+        g.apply(Action(ActionType.PASS))
+        g.apply(Action(ActionType.CAST_B))
+
+        decoded = GameState.from_bytes(g.state.to_bytes())
+        assert decoded == g.state
+        assert decoded.stack.describe() == g.state.stack.describe()
+        assert decoded.key == g.state.key
+
+    def test_into_buffer_at_offset(self) -> None:
+        """States can be packed back to back into one buffer."""
+        g = Game.new()
+        states = []
+        for t in (ActionType.CAST_A, ActionType.CAST_B, ActionType.PASS):
+            g.apply(Action(t))
+            states.append(g.state.clone_shallow())
+        buffer = bytearray(sum(state.encoded_size for state in states))
+        offsets = [0]
+        for state in states:
+            offsets.append(state.into_buffer(buffer, offsets[-1]))
+        assert offsets[-1] == len(buffer)
+
+        for offset, state in zip(offsets, states, strict=False):
+            assert GameState.from_bytes(buffer, offset) == state
+
+    def test_shared_memory(self) -> None:
+        """Encoding works directly into shared memory."""
+        shm = SharedMemory(create=True, size=STATE_HEADER_SIZE)
+        try:
+            state = new_game()
+            state.into_buffer(shm.buf)
+            assert GameState.from_bytes(shm.buf) == state
+        finally:
+            shm.close()
+            shm.unlink()
+
+    def test_deep_stack(self) -> None:
+        """Stacks of any realistic depth round-trip, two bytes per item."""
+        g = Game.new()
+        for i in range(300):
+            g.apply(Action(ActionType.CAST_A if i % 3 else ActionType.CAST_B))
+        data = g.state.to_bytes()
+        assert len(data) == encoded_size(300)
+        assert GameState.from_bytes(data) == g.state
+
+    def test_registry_spells(self) -> None:
+        """Stack items are encoded by spell id, so long names are fine."""
+        spells = SpellRegistry(
+            [SpellDefinition("Lightning Bolt", ActionType.CAST_A, 3)]
+        )
+        g = Game.new(spells=spells)
+        g.apply(Action(ActionType.CAST_A))
+        data = g.state.to_bytes(spells)
+        assert GameState.from_bytes(data, spells=spells) == g.state
+        with pytest.raises(ValueError):
+            g.state.to_bytes()
+        default = Game.new()
+        default.apply(Action(ActionType.CAST_B))
+        with pytest.raises(ValueError):
+            GameState.from_bytes(default.state.to_bytes(), spells=spells)
+
+    def test_out_of_range_fields(self) -> None:
+        """Values outside the layout raise ValueError, not struct.error."""
+        state = new_game(starting_life=2**31)
+        with pytest.raises(ValueError):
+            state.to_bytes()
+        deep = new_game()
+        for _ in range(MAX_ENCODED_STACK + 1):
+            deep.stack.push(StackItem(name="A", controller=0, damage_to_opponent=3))
+        with pytest.raises(ValueError):
+            deep.to_bytes()
+        with pytest.raises(ValueError):
+            new_game().into_buffer(bytearray(STATE_HEADER_SIZE - 1))
+
+    def test_truncated(self) -> None:
+        """Short data is rejected with ValueError."""
+        g = Game.new()
+        g.apply(Action(ActionType.CAST_A))
+        data = g.state.to_bytes()
+        for size in (0, STATE_HEADER_SIZE - 1, len(data) - 1):
+            with pytest.raises(ValueError):
+                GameState.from_bytes(data[:size])
+
+    @pytest.mark.parametrize(
+        ("offset", "value"),
+        [
+            (1, 0x55),  # key
+            (9, 7),  # turn, so the key no longer matches
+            (21, 2),  # active player
+            (22, 0xFF),  # priority player
+            (23, 2),  # pass streak
+            (24, 0xEE),  # phase
+        ],
+    )
+    def test_corrupt_fields(self, offset: int, value: int) -> None:
+        """Out-of-range fields and keys that do not match are rejected."""
+        data = bytearray(new_game().to_bytes())
+        data[offset] = value
+        with pytest.raises(ValueError):
+            GameState.from_bytes(data)
+
+    def test_bad_version(self) -> None:
+        """Unknown encoding versions are rejected."""
+        data = bytearray(new_game().to_bytes())
+        data[0] = 255
+        with pytest.raises(ValueError):
+            GameState.from_bytes(data)
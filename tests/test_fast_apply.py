@@ -0,0 +1,93 @@
+"""Tests for table-dispatched Game.apply and configurable invariant checks."""
+
+import random
+
+import pytest
+
+from mtg_engine.engine.actions import ACTIONS, ActionType
+from mtg_engine.engine.game import Game, GameInvariantError
+
+
+def _random_codes(seed: int, n: int) -> list[int]:
+    rng = random.Random(seed)
+    return [rng.randrange(len(ACTIONS)) for _ in range(n)]
+
+
+class TestFastApply:
+    """Differential tests: checked, unchecked and batched apply agree."""
+
+    @pytest.mark.parametrize("interval", [0, 1, 7])
+    def test_matches_batch_engine(self, interval: int) -> None:
+        """States and keys match BatchGame for any check interval."""
+        batch_game = pytest.importorskip("mtg_engine.engine.batch").BatchGame
+        g = Game.new(check_keys=True, check_interval=interval)
+        batch = batch_game(1, max_stack_depth=256)
+
+        for code in _random_codes(interval + 11, 400):
+            if g.is_over():
+                break
+            g.apply(ACTIONS[code])
+            batch.apply([code])
+            assert g.state == batch.get_state(0)
+            assert g.state.key == batch.get_state(0).key
+
+    def test_checked_and_unchecked_records_match(self) -> None:
+        """Undo records do not depend on the check interval."""
+        checked = Game.new(check_interval=1)
+        unchecked = Game.new(check_interval=0)
+
+        for code in _random_codes(3, 300):
+            if checked.is_over():
+                break
+            action = ACTIONS[code]
+            assert checked.apply(action) == unchecked.apply(action)
+            assert checked.state == unchecked.state
+            assert checked.state.key == unchecked.state.key
+
+    def test_undo_after_unchecked_applies(self) -> None:
+        """Undo restores the start after a fast-path sequence."""
+        g = Game.new(check_keys=True, check_interval=0)
+        start = g.state.clone_shallow()
+        records = []
+        for code in _random_codes(5, 200):
+            if g.is_over():
+                break
+            records.append(g.apply(ACTIONS[code]))
+        for record in reversed(records):
+            g.undo(record)
+        assert g.state == start
+        assert g.state.key == start.key
+
+    def test_every_action_type_dispatched(self) -> None:
+        """Every action type has a handler."""
+        assert set(Game._DISPATCH) == set(ActionType)
+
+
+class TestCheckInterval:
+    """Tests for when invariants are checked."""
+
+    def test_default_follows_debug_flag(self) -> None:
+        """Games check every action unless running under ``python -O``."""
+        assert Game.new().check_interval == (1 if __debug__ else 0)
+
+    def test_zero_never_checks(self) -> None:
+        """A corrupted state goes unnoticed with checks disabled."""
+        g = Game.new(check_interval=0)
+        g.state.turn = -5
+        for _ in range(10):
+            g.apply(ACTIONS[0])
+
+    def test_every_nth_action(self) -> None:
+        """With interval N, the corruption is caught on the Nth apply."""
+        g = Game.new(check_interval=3)
+        g.state.turn = -5
+        g.apply(ACTIONS[0])
+        g.apply(ACTIONS[0])
+        with pytest.raises(GameInvariantError):
+            g.apply(ACTIONS[0])
+
+    def test_override_does_not_change_default(self) -> None:
+        """A per-game interval leaves the class default alone."""
+        default = Game.check_interval
+        Game.new(check_interval=5)
+        assert Game.check_interval == default
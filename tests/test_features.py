@@ -0,0 +1,96 @@
+"""Tests for observation encoding."""
+
+from array import array
+
+from mtg_engine.engine.actions import Action, ActionType
+from mtg_engine.engine.game import Game
+from mtg_engine.engine.phases import Phase
+from mtg_engine.engine.state import new_game
+from mtg_engine.features import (
+    IS_ACTIVE,
+    MY_LIFE,
+    OPPONENT_LIFE,
+    PASS_STREAK,
+    PHASE,
+    PRIORITY_SEAT,
+    STACK,
+    STACK_DEPTH,
+    STACK_SLOT_SIZE,
+    TURN,
+    ObservationEncoder,
+)
+
+
+class TestObservationEncoder:
+    """Tests for ObservationEncoder."""
+
+    def test_new_game(self) -> None:
+        """A fresh game encodes lives, turn, phase and an empty stack."""
+        encoder = ObservationEncoder(max_stack=4)
+        out = array("f", [9.0]) * encoder.size
+        encoder.encode_into(new_game(), out)
+
+        assert out[MY_LIFE] == 20
+        assert out[OPPONENT_LIFE] == 20
+        assert out[TURN] == 1
+        assert out[PRIORITY_SEAT] == 0
+        assert out[IS_ACTIVE] == 1
+        assert out[PASS_STREAK] == 0
+        assert out[STACK_DEPTH] == 0
+        phases = list(out[PHASE:STACK])
+        assert phases[list(Phase).index(Phase.MAIN)] == 1
+        assert sum(phases) == 1
+        assert list(out[STACK:]) == [0.0] * (4 * STACK_SLOT_SIZE)
+
+    def test_player_relative(self) -> None:
+        """Features are from the perspective of the priority player."""
+        g = Game.new()
+        g.apply(Action(ActionType.CAST_A))  # P1 now has priority
+        g.state.players[0].life = 7
+
+        encoder = ObservationEncoder()
+        out = array("f", [0.0]) * encoder.size
+        encoder.encode_into(g.state, out)
+
+        assert out[MY_LIFE] == 20
+        assert out[OPPONENT_LIFE] == 7
+        assert out[PRIORITY_SEAT] == 1
+        assert out[IS_ACTIVE] == 0
+        # Top of stack: P0's spell A, which is not mine
+        assert list(out[STACK : STACK + STACK_SLOT_SIZE]) == [1.0, 0.0, 3.0]
+
+    def test_stack_top_first_and_truncated(self) -> None:
+        """Stack slots are top first and capped at max_stack."""
+        g = Game.new()
+        for t in (ActionType.CAST_A, ActionType.CAST_B, ActionType.CAST_A):
+            g.apply(Action(t))
+
+        encoder = ObservationEncoder(max_stack=2)
+        out = array("f", [0.0]) * encoder.size
+        encoder.encode_into(g.state, out)
+
+        assert out[STACK_DEPTH] == 3
+        damages = [out[STACK + i * STACK_SLOT_SIZE + 2] for i in range(2)]
+        assert damages == [3.0, 2.0]
+
+    def test_reused_buffer_is_overwritten(self) -> None:
+        """Encoding into a used buffer leaves no stale stack entries."""
+        g = Game.new()
+        g.apply(Action(ActionType.CAST_A))
+        encoder = ObservationEncoder()
+        out = array("f", [0.0]) * encoder.size
+        encoder.encode_into(g.state, out)
+        encoder.encode_into(new_game(), out)
+
+        assert list(out[STACK:]) == [0.0] * (encoder.max_stack * STACK_SLOT_SIZE)
+
+    def test_batch_and_memoryview(self) -> None:
+        """encode_batch writes back-to-back rows into any float buffer."""
+        states = [new_game(life) for life in (3, 4, 5)]
+        encoder = ObservationEncoder()
+        raw = bytearray(4 * encoder.size * len(states))
+        out = memoryview(raw).cast("f")
+        encoder.encode_batch(states, out)
+
+        for i, life in enumerate((3, 4, 5)):
+            assert out[i * encoder.size + MY_LIFE] == life
@@ -0,0 +1,126 @@
+"""Tests for opt-in Game instrumentation."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from mtg_engine.engine.actions import Action, ActionType
+from mtg_engine.engine.game import Game, GameInvariantError
+from mtg_engine.engine.instrument import GameMetrics, instrument, uninstrument
+from mtg_engine.selfplay import run_selfplay
+
+CAST_A = Action(ActionType.CAST_A)
+PASS = Action(ActionType.PASS)
+
+
+def play_script(game: Game) -> None:
+    """Cast, resolve, then advance the turn."""
+    for action in (CAST_A, PASS, PASS, PASS, PASS):
+        game.apply(action)
+
+
+class TestInstrument:
+    """Tests for instrument/uninstrument."""
+
+    def test_counts(self) -> None:
+        """Actions, resolutions, turn advances and checks are counted."""
+        g = Game.new(check_interval=1)
+        metrics = instrument(g)
+        play_script(g)
+
+        snap = metrics.snapshot()
+        assert snap["actions"] == {"CAST_A": 1, "CAST_B": 0, "PASS": 4, "CAST": 0}
+        assert snap["resolutions"] == 1
+        assert snap["turn_advances"] == 1
+        assert snap["invariant_checks"] == 5
+        assert sum(metrics.latency) == 5
+        assert metrics.apply_ns >= metrics.invariant_ns > 0
+
+    def test_uninstrumented_game_is_untouched(self) -> None:
+        """Uninstrumenting restores the class methods on the instance."""
+        g = Game.new()
+        metrics = instrument(g)
+        uninstrument(g)
+        assert "apply" not in vars(g)
+        assert "_assert_invariants" not in vars(g)
+        play_script(g)
+        assert metrics.total_actions == 0
+
+    def test_state_matches_plain_game(self) -> None:
+        """Instrumentation does not change game behaviour."""
+        plain, timed = Game.new(), Game.new()
+        instrument(timed)
+        play_script(plain)
+        play_script(timed)
+        assert plain.state == timed.state
+
+    def test_failed_check_still_counted(self) -> None:
+        """Invariant failures propagate and their check is recorded."""
+        g = Game.new(check_interval=1)
+        metrics = instrument(g)
+        g.state.turn = 0
+        with pytest.raises(GameInvariantError):
+            g.apply(PASS)
+        assert metrics.invariant_checks == 1
+
+    def test_shared_metrics_and_merge(self) -> None:
+        """Games can share one GameMetrics; metrics merge by addition."""
+        shared = GameMetrics()
+        for _ in range(2):
+            g = Game.new()
+            instrument(g, shared)
+            play_script(g)
+        other = GameMetrics()
+        other.merge(shared)
+        other.merge(shared)
+        assert other.total_actions == 20
+        assert other.resolutions == 4
+        other.reset()
+        assert other.total_actions == 0
+
+
+class TestExport:
+    """Tests for dumping and scraping metrics."""
+
+    def test_write_json(self, tmp_path: Path) -> None:
+        """Dumps are valid JSON matching the snapshot."""
+        g = Game.new()
+        metrics = instrument(g)
+        play_script(g)
+        path = tmp_path / "metrics.json"
+        metrics.write_json(path)
+
+        assert json.loads(path.read_text()) == metrics.snapshot()
+        assert not (tmp_path / "metrics.json.tmp").exists()
+
+    def test_prometheus_text(self) -> None:
+        """The exposition has counters and a cumulative histogram."""
+        g = Game.new()
+        metrics = instrument(g)
+        play_script(g)
+        text = metrics.prometheus_text()
+
+        assert 'mtg_engine_actions_total{action="PASS"} 4' in text
+        assert "mtg_engine_resolutions_total 1" in text
+        assert 'mtg_engine_apply_seconds_bucket{le="+Inf"} 5' in text
+        assert "mtg_engine_apply_seconds_count 5" in text
+
+    def test_latency_quantile(self) -> None:
+        """Quantiles report the upper edge of the containing bucket."""
+        metrics = GameMetrics()
+        assert metrics.latency_quantile(0.5) == 0
+        metrics.latency[10] = 90
+        metrics.latency[20] = 10
+        assert metrics.latency_quantile(0.5) == 1 << 10
+        assert metrics.latency_quantile(0.99) == 1 << 20
+
+    def test_selfplay_metrics(self) -> None:
+        """Self-play collects metrics from every game, in or out of process."""
+        serial, pooled = GameMetrics(), GameMetrics()
+        results = list(run_selfplay(4, seed=2, metrics=serial))
+        list(run_selfplay(4, seed=2, workers=2, chunk_size=2, metrics=pooled))
+
+        assert serial.total_actions == sum(r.actions for r in results)
+        assert pooled.actions == serial.actions
+        assert pooled.resolutions == serial.resolutions
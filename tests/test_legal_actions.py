@@ -0,0 +1,67 @@
+"""Tests for legal-action masks and interned actions."""
+
+from array import array
+
+from mtg_engine.engine.actions import (
+    ACTION_CODES,
+    ACTION_TYPES,
+    ACTIONS,
+    ALL_ACTIONS_MASK,
+    MASK_ACTIONS,
+    Action,
+    ActionType,
+    action_for,
+    action_from_input,
+)
+from mtg_engine.engine.game import Game
+
+
+class TestInternedActions:
+    """Tests for the interned Action table."""
+
+    def test_one_action_per_type(self) -> None:
+        """ACTIONS holds one Action per type, in code order."""
+        assert [a.type for a in ACTIONS] == list(ACTION_TYPES)
+        for action_type in ACTION_TYPES:
+            assert ACTIONS[ACTION_CODES[action_type]].type is action_type
+
+    def test_action_for_is_interned(self) -> None:
+        """action_for and action_from_input return shared instances."""
+        assert action_for(ActionType.CAST_A) is action_for(ActionType.CAST_A)
+        assert action_from_input("p") is action_for(ActionType.PASS)
+        assert action_for(ActionType.CAST_B) == Action(ActionType.CAST_B)
+
+    def test_mask_actions(self) -> None:
+        """MASK_ACTIONS lists the actions whose bits are set."""
+        assert MASK_ACTIONS[0] == ()
+        assert MASK_ACTIONS[ALL_ACTIONS_MASK] == ACTIONS
+        pass_bit = 1 << ACTION_CODES[ActionType.PASS]
+        assert MASK_ACTIONS[pass_bit] == (action_for(ActionType.PASS),)
+
+
+class TestLegalActionMask:
+    """Tests for Game.legal_action_mask."""
+
+    def test_mask_matches_legal_actions(self) -> None:
+        """The mask and the list describe the same actions."""
+        g = Game.new()
+        mask = g.legal_action_mask()
+        assert list(MASK_ACTIONS[mask]) == g.legal_actions()
+
+    def test_legal_actions_are_interned(self) -> None:
+        """legal_actions returns the shared Action instances."""
+        for action in Game.new().legal_actions():
+            assert action is ACTIONS[ACTION_CODES[action.type]]
+
+    def test_legal_action_tuple_is_shared(self) -> None:
+        """legal_action_tuple returns the registry's tuple, not a copy."""
+        g = Game.new()
+        assert g.legal_action_tuple() is g.spells.actions
+        assert list(g.legal_action_tuple()) == g.legal_actions()
+
+    def test_mask_into_buffer(self) -> None:
+        """The mask can be written as 0/1 values into a buffer."""
+        out = array("b", [7]) * (len(ACTION_TYPES) + 1)
+        Game.new().legal_action_mask_into(out, offset=1)
+        assert out[0] == 7
+        assert list(out[1:]) == [1] * len(ACTION_TYPES)
@@ -0,0 +1,161 @@
+"""Tests for Monte Carlo Tree Search."""
+
+import pytest
+
+from mtg_engine.engine.actions import Action, ActionType
+from mtg_engine.engine.game import Game
+from mtg_engine.search.mcts import MCTS, NodeArrays, Selection
+from tests.conftest import lethal_on_pass
+
+
+class TestNodeArrays:
+    """Tests for flat node storage."""
+
+    def test_alloc_until_full(self) -> None:
+        """alloc hands out contiguous ranges until capacity runs out."""
+        nodes = NodeArrays(4)
+        assert nodes.alloc(1) == 0
+        assert nodes.alloc(3) == 1
+        assert nodes.alloc(1) == -1
+        assert len(nodes) == 4
+
+    def test_external_buffer(self) -> None:
+        """Nodes can live in a caller-supplied buffer."""
+        buffer = bytearray(NodeArrays.nbytes(8))
+        nodes = NodeArrays(8, buffer)
+        nodes.alloc(1)
+        nodes.visits[0] = 5
+
+        view = NodeArrays(8, buffer)
+        assert len(view) == 1
+        assert view.visits[0] == 5
+
+
+class TestMCTS:
+    """Tests for the MCTS agent."""
+
+    @pytest.mark.parametrize("selection", list(Selection))
+    def test_finds_lethal(self, selection: Selection) -> None:
+        """Resolving a lethal spell is preferred."""
+        g = lethal_on_pass()
+        agent = MCTS(simulations=300, selection=selection, seed=0)
+        assert agent.choose_action(g).type is ActionType.PASS
+
+    def test_restores_game(self) -> None:
+        """Searching leaves the game untouched."""
+        g = Game.new()
+        before = g.state.clone_shallow()
+        MCTS(simulations=100, seed=0).choose_action(g)
+        assert g.state == before
+        assert g.state.key == before.key
+
+    def test_subtree_reuse(self) -> None:
+        """The subtree under the new position is kept between moves."""
+        g = Game.new(starting_life=6)
+        agent = MCTS(simulations=200, seed=0)
+        g.apply(agent.choose_action(g))
+        g.apply(Action(ActionType.PASS))
+
+        agent.choose_action(g)
+        assert agent.last_stats.reused > 0
+
+    def test_subtree_reuse_compacts_in_place(self) -> None:
+        """Reuse moves the kept subtree to the front of the same store."""
+        g = Game.new(starting_life=6)
+        agent = MCTS(simulations=200, seed=0)
+        nodes = agent.nodes
+        g.apply(agent.choose_action(g))
+        g.apply(Action(ActionType.PASS))
+        agent.choose_action(g)
+
+        assert agent.nodes is nodes
+        assert nodes.parent[0] == -1
+        assert nodes.key[0] == g.state.key
+        for node in range(len(nodes)):
+            first = nodes.first_child[node]
+            for child in range(first, first + nodes.num_children[node]):
+                assert child > node
+                assert nodes.parent[child] == node
+
+    def test_unrelated_position_resets_tree(self) -> None:
+        """A position outside the tree starts a fresh search."""
+        agent = MCTS(simulations=50, seed=0)
+        agent.choose_action(Game.new())
+        agent.choose_action(Game.new(starting_life=7))
+        assert agent.last_stats.reused == 0
+
+    def test_callbacks(self) -> None:
+        """prior_fn and value_fn replace uniform priors and rollouts."""
+        calls = {"prior": 0, "value": 0}
+
+        def prior_fn(game: Game) -> list[float]:
+            calls["prior"] += 1
+            return [0.1, 0.1, 0.8]
+
+        def value_fn(game: Game) -> float:
+            calls["value"] += 1
+            return 0.0
+
+        agent = MCTS(
+            simulations=50,
+            selection=Selection.PUCT,
+            prior_fn=prior_fn,
+            value_fn=value_fn,
+            seed=0,
+        )
+        action = agent.choose_action(Game.new())
+        assert action.type is ActionType.PASS
+        assert calls["prior"] > 0
+        assert calls["value"] == 50
+
+    def test_node_capacity(self) -> None:
+        """A full tree keeps searching without expanding."""
+        agent = MCTS(simulations=200, max_nodes=10, seed=0)
+        agent.choose_action(Game.new())
+        assert len(agent.nodes) <= 10
+        assert agent.last_stats.simulations == 200
+
+    def test_existing_node_store(self) -> None:
+        """A supplied node store is searched in place of a new one."""
+        nodes = NodeArrays(50)
+        agent = MCTS(simulations=20, seed=0, nodes=nodes)
+        agent.choose_action(Game.new())
+        assert agent.nodes is nodes
+        assert len(nodes) > 1
+
+    def test_root_not_expanded_falls_back(self) -> None:
+        """With no room to expand the root, a legal action is still returned."""
+        g = Game.new()
+        for max_nodes in (1, 2):
+            agent = MCTS(simulations=10, max_nodes=max_nodes, seed=0)
+            assert agent.choose_action(g) in g.legal_actions()
+        with pytest.raises(ValueError):
+            MCTS(max_nodes=0)
+
+    def test_simulations_must_be_positive(self) -> None:
+        """A search budget of zero simulations is rejected."""
+        with pytest.raises(ValueError):
+            MCTS(seed=0).choose_action(Game.new(), simulations=0)
+        with pytest.raises(ValueError):
+            MCTS(simulations=0, seed=0).choose_action(Game.new())
+
+    def test_throughput_tracked(self) -> None:
+        """Simulations per second are reported."""
+        agent = MCTS(simulations=20, seed=0)
+        agent.choose_action(Game.new())
+        assert agent.last_stats.simulations == 20
+        assert agent.last_stats.simulations_per_second > 0
+        assert agent.simulations_per_second > 0
+
+    def test_time_budget(self) -> None:
+        """A time limit stops the search early."""
+        agent = MCTS(simulations=10**9, time_limit=0.05, seed=0)
+        agent.choose_action(Game.new())
+        assert agent.last_stats.simulations < 10**9
+
+    def test_finished_game_raises(self) -> None:
+        """choose_action refuses a finished game."""
+        g = Game.new()
+        g.state.players[1].life = 0
+        with pytest.raises(ValueError):
+            MCTS().choose_action(g)
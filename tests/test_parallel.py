@@ -0,0 +1,59 @@
+"""Tests for multi-process MCTS."""
+
+import pytest
+
+from mtg_engine.engine.actions import ActionType
+from mtg_engine.engine.game import Game
+from mtg_engine.search.parallel import ParallelMCTS, ParallelMode
+from tests.conftest import lethal_on_pass
+
+
+class TestParallelMCTS:
+    """Tests for root- and tree-parallel search."""
+
+    @pytest.mark.parametrize("mode", list(ParallelMode))
+    def test_finds_lethal(self, mode: ParallelMode) -> None:
+        """Both modes find the winning pass."""
+        g = lethal_on_pass()
+        with ParallelMCTS(workers=2, mode=mode, simulations=400, seed=0) as search:
+            assert search.choose_action(g).type is ActionType.PASS
+            assert search.last_stats.simulations == 400
+
+    @pytest.mark.parametrize("mode", list(ParallelMode))
+    def test_visits_merged(self, mode: ParallelMode) -> None:
+        """Root visits cover the whole budget across workers."""
+        g = Game.new()
+        before = g.state.clone_shallow()
+        with ParallelMCTS(workers=3, mode=mode, simulations=90, seed=0) as search:
+            search.choose_action(g)
+            visits = search.root_visits()
+
+        # Each simulation visits one root child, except the root expansion
+        assert sum(visits.values()) >= 90 - 3
+        assert g.state == before
+
+    def test_finished_game_raises(self) -> None:
+        """choose_action refuses a finished game."""
+        g = Game.new()
+        g.state.players[0].life = 0
+        with ParallelMCTS(workers=1) as search, pytest.raises(ValueError):
+            search.choose_action(g)
+
+    def test_simulations_must_be_positive(self) -> None:
+        """A search budget of zero simulations or nodes is rejected."""
+        with ParallelMCTS(workers=1, simulations=0) as search:
+            with pytest.raises(ValueError):
+                search.choose_action(Game.new())
+            with pytest.raises(ValueError):
+                search.choose_action(Game.new(), simulations=0)
+        with pytest.raises(ValueError):
+            ParallelMCTS(workers=1, max_nodes=0)
+
+    @pytest.mark.parametrize("mode", list(ParallelMode))
+    def test_root_not_expanded_falls_back(self, mode: ParallelMode) -> None:
+        """With no room to expand the root, a legal action is still returned."""
+        g = Game.new()
+        with ParallelMCTS(
+            workers=2, mode=mode, simulations=10, max_nodes=1, seed=0
+        ) as search:
+            assert search.choose_action(g) in g.legal_actions()
@@ -0,0 +1,99 @@
+"""Tests for persistent (structurally shared) game states."""
+
+import random
+
+from mtg_engine.engine.actions import ACTIONS, Action, ActionType
+from mtg_engine.engine.game import Game
+from mtg_engine.engine.persistent import PersistentGame, PersistentState
+from mtg_engine.engine.zobrist import compute_key
+from mtg_engine.search.alphabeta import AlphaBeta
+from mtg_engine.search.mcts import MCTS
+
+CAST_A = Action(ActionType.CAST_A)
+CAST_B = Action(ActionType.CAST_B)
+PASS = Action(ActionType.PASS)
+
+
+class TestPersistentState:
+    """Tests for PersistentState transitions."""
+
+    def test_matches_game(self) -> None:
+        """Random play matches Game state for state, including keys."""
+        rng = random.Random(4)
+        g = Game.new()
+        pg = PersistentGame.new()
+        assert pg.state == PersistentState.from_state(g.state)
+
+        for _ in range(400):
+            if g.is_over():
+                break
+            action = ACTIONS[rng.randrange(len(ACTIONS))]
+            g.apply(action)
+            pg.apply(action)
+            assert pg.state.to_state() == g.state
+            assert pg.state.key == g.state.key == compute_key(g.state)
+            assert pg.winner() == g.winner()
+
+    def test_parent_unchanged(self) -> None:
+        """Applying an action leaves the original state untouched."""
+        parent = PersistentGame.new().state
+        snapshot = parent.to_state()
+        parent.apply(CAST_A).apply(PASS).apply(PASS)
+        assert parent.to_state() == snapshot
+
+    def test_structural_sharing(self) -> None:
+        """Children share the parent's stack and untouched players."""
+        parent = PersistentGame.new().state.apply(CAST_A)
+        child = parent.apply(CAST_B)
+        assert child.stack.below is parent.stack
+        assert child.players is parent.players
+
+        resolved = child.apply(PASS).apply(PASS)
+        assert resolved.stack is parent.stack
+        assert resolved.players[1] is parent.players[1]
+        assert resolved.players[0].life == 18
+
+    def test_transpositions_equal_and_hash_alike(self) -> None:
+        """Different move orders reaching one position are interchangeable."""
+        start = PersistentGame.new().state
+        x = start.apply(CAST_A).apply(PASS).apply(PASS)
+        x = x.apply(CAST_B).apply(PASS).apply(PASS)
+        y = start.apply(CAST_B).apply(PASS).apply(PASS)
+        y = y.apply(CAST_A).apply(PASS).apply(PASS)
+        assert x == y
+        assert len({x, y}) == 1
+
+
+class TestPersistentGame:
+    """Tests for the Game-compatible wrapper."""
+
+    def test_undo_and_clone(self) -> None:
+        """Undo restores the prior state; clones are independent."""
+        pg = PersistentGame.new()
+        start = pg.state
+        record = pg.apply(CAST_A)
+        clone = pg.clone()
+        pg.undo(record)
+
+        assert pg.state is start
+        assert clone.state.stack_depth == 1
+
+    def test_alphabeta_finds_lethal(self) -> None:
+        """Alpha-beta runs unchanged on a PersistentGame."""
+        g = Game.new()
+        g.state.players[1].life = 3
+        g.state.recompute_key()
+        pg = PersistentGame(PersistentState.from_state(g.state))
+        pg.apply(CAST_A)
+        pg.apply(PASS)
+
+        result = AlphaBeta().search(pg, depth=2)
+        assert result.best_action == PASS
+
+    def test_mcts_runs(self) -> None:
+        """MCTS runs unchanged on a PersistentGame and leaves it untouched."""
+        pg = PersistentGame.new()
+        start = pg.state
+        action = MCTS(simulations=50, seed=1).choose_action(pg)
+        assert action in pg.legal_actions()
+        assert pg.state is start
@@ -0,0 +1,119 @@
+"""Tests for compact game records and replay."""
+
+import random
+
+import pytest
+
+from mtg_engine.engine.actions import ACTIONS
+from mtg_engine.engine.game import Game
+from mtg_engine.records import (
+    GameRecord,
+    GameRecorder,
+    Replayer,
+    iter_records,
+    replay,
+)
+
+
+def record_random_game(
+    seed: int, starting_life: int = 20, max_actions: int = 2000
+) -> tuple[GameRecord, list[Game]]:
+    """Play a random game, returning its record and a state per ply."""
+    rng = random.Random(seed)
+    game = Game.new(starting_life)
+    recorder = GameRecorder(starting_life)
+    states = [game.state.clone_shallow()]
+    while not game.is_over() and len(recorder) < max_actions:
+        action = ACTIONS[rng.randrange(len(ACTIONS))]
+        recorder.record(action)
+        game.apply(action)
+        states.append(game.state.clone_shallow())
+    return recorder.finish(), states
+
+
+class TestGameRecord:
+    """Tests for recording and encoding."""
+
+    def test_round_trip(self) -> None:
+        """Encoding and decoding preserves every action."""
+        record, _ = record_random_game(1)
+        decoded = GameRecord.from_bytes(record.to_bytes())
+        assert decoded == record
+        assert [decoded.code(i) for i in range(decoded.length)] == list(decoded.codes())
+
+    def test_compact(self) -> None:
+        """Four actions fit in a byte."""
+        record, _ = record_random_game(2)
+        assert len(record.packed) == -(-record.length // 4)
+        assert record.encoded_size == 10 + len(record.packed)
+
+    def test_concatenated_records(self) -> None:
+        """Records are self-delimiting."""
+        records = [record_random_game(seed)[0] for seed in range(5)]
+        data = b"".join(r.to_bytes() for r in records)
+        assert list(iter_records(data)) == records
+
+    def test_truncated(self) -> None:
+        """A cut-off record is rejected."""
+        record, _ = record_random_game(3)
+        data = record.to_bytes()
+        for cut in (len(data) - 1, 3, 0):
+            with pytest.raises(ValueError):
+                GameRecord.from_bytes(data[:cut])
+
+    def test_unknown_code(self) -> None:
+        """A packed code outside the action set is rejected."""
+        record = GameRecord(20, 1, b"\x03")
+        with pytest.raises(ValueError):
+            GameRecord.from_bytes(record.to_bytes())
+
+
+class TestReplay:
+    """Tests for deterministic replay."""
+
+    def test_replay_reproduces_game(self) -> None:
+        """Replaying reaches the same final state and winner."""
+        record, states = record_random_game(4, starting_life=7)
+        game = replay(record)
+        assert game.state == states[-1]
+        assert game.state.key == states[-1].key
+
+    @pytest.mark.parametrize("interval", [0, 1, 16])
+    def test_seek(self, interval: int) -> None:
+        """Seeking to any ply, in any order, gives that ply's state."""
+        record, states = record_random_game(5)
+        replayer = Replayer(record, snapshot_interval=interval)
+        rng = random.Random(0)
+        plies = [len(states) - 1, 0, *(rng.randrange(len(states)) for _ in range(30))]
+        for ply in plies:
+            assert replayer.seek(ply) == states[ply]
+            assert replayer.ply == ply
+
+    def test_seek_uses_snapshots(self) -> None:
+        """Seeking back restores a snapshot instead of replaying from 0."""
+        record, _ = record_random_game(6)
+        replayer = Replayer(record, snapshot_interval=10)
+        replayer.replay()
+        game = replayer.game
+        replayer.seek(len(replayer) - 3)
+        assert replayer.game is not game
+        assert replayer.ply == len(replayer) - 3
+
+    def test_out_of_range(self) -> None:
+        """Seeking or stepping past the end raises IndexError."""
+        record, _ = record_random_game(7)
+        replayer = Replayer(record)
+        with pytest.raises(IndexError):
+            replayer.seek(len(replayer) + 1)
+        replayer.replay()
+        with pytest.raises(IndexError):
+            replayer.step()
+
+    def test_negative_step(self) -> None:
+        """Stepping backwards raises ValueError; seek goes back instead."""
+        record, _ = record_random_game(8)
+        replayer = Replayer(record)
+        replayer.step(3)
+        with pytest.raises(ValueError):
+            replayer.step(-1)
+        assert replayer.ply == 3
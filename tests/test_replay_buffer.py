@@ -0,0 +1,162 @@
+"""Tests for the memory-mapped replay buffer."""
+
+import multiprocessing
+import random
+from pathlib import Path
+
+import pytest
+
+from mtg_engine.engine.actions import Action, ActionType
+from mtg_engine.engine.game import Game
+from mtg_engine.engine.state import new_game
+from mtg_engine.replay_buffer import EpisodeWriter, ReplayBuffer, record_size
+
+
+def play_episode(buffer: ReplayBuffer, seed: int, starting_life: int = 5) -> int | None:
+    """Play one random game into ``buffer`` and return the winner."""
+    rng = random.Random(seed)
+    game = Game.new(starting_life=starting_life)
+    writer = EpisodeWriter(buffer)
+    while not game.is_over():
+        action = rng.choice(game.legal_actions())
+        writer.record(game, action)
+        game.apply(action)
+    writer.finish(game.winner())
+    return game.winner()
+
+
+def append_worker(path: str, seed: int, n: int) -> None:
+    """Append ``n`` records from a separate process."""
+    with ReplayBuffer(path) as buffer:
+        for i in range(n):
+            state = new_game(starting_life=seed * 1000 + i)
+            buffer.append(state, Action(ActionType.PASS), 0b111, 1)
+
+
+class TestReplayBuffer:
+    """Tests for ReplayBuffer and EpisodeWriter."""
+
+    def test_create_and_reopen(self, tmp_path: Path) -> None:
+        """A created buffer can be reopened with its records intact."""
+        path = tmp_path / "replay.bin"
+        with ReplayBuffer(path, capacity=8) as buffer:
+            buffer.append(new_game(7), Action(ActionType.CAST_B), 0b111, -1)
+
+        with ReplayBuffer(path) as buffer:
+            assert buffer.capacity == 8
+            assert len(buffer) == 1
+            record = buffer.record(0)
+            assert record.state == new_game(7)
+            assert record.action == Action(ActionType.CAST_B)
+            assert record.legal_mask == 0b111
+            assert record.outcome == -1
+
+    def test_missing_file_raises(self, tmp_path: Path) -> None:
+        """Opening a missing buffer without a capacity fails."""
+        with pytest.raises(FileNotFoundError):
+            ReplayBuffer(tmp_path / "missing.bin")
+
+    def test_ring_overwrites_oldest(self, tmp_path: Path) -> None:
+        """Appending past capacity wraps around."""
+        with ReplayBuffer(tmp_path / "replay.bin", capacity=4) as buffer:
+            for life in range(1, 7):
+                buffer.append(new_game(life), Action(ActionType.PASS), 0b111, 0)
+
+            assert len(buffer) == 4
+            assert buffer.total_appended() == 6
+            lives = sorted(buffer.record(i).state.players[0].life for i in range(4))
+            assert lives == [3, 4, 5, 6]
+
+    def test_episode_outcomes(self, tmp_path: Path) -> None:
+        """Episode outcomes are labelled from each acting player's view."""
+        with ReplayBuffer(tmp_path / "replay.bin", capacity=10_000) as buffer:
+            winner = play_episode(buffer, seed=3)
+            assert winner is not None
+            assert len(buffer) > 0
+            for i in range(len(buffer)):
+                record = buffer.record(i)
+                expected = 1 if record.state.priority_player == winner else -1
+                assert record.outcome == expected
+                assert record.legal_mask == Game(record.state).legal_action_mask()
+
+    def test_sample(self, tmp_path: Path) -> None:
+        """Sampled batches match the stored records."""
+        with ReplayBuffer(tmp_path / "replay.bin", capacity=10_000) as buffer:
+            play_episode(buffer, seed=5)
+            batch = buffer.sample(32, random.Random(0))
+
+            assert len(batch.states) == 32 * buffer.state_size
+            for i in range(32):
+                record = buffer.record(batch.indices[i])
+                assert batch.state(i) == record.state
+                assert batch.actions[i] == list(ActionType).index(record.action.type)
+                assert batch.outcomes[i] == record.outcome
+                assert batch.legal_masks[i] == record.legal_mask
+
+    def test_sample_empty_raises(self, tmp_path: Path) -> None:
+        """Sampling an empty buffer fails."""
+        with (
+            ReplayBuffer(tmp_path / "replay.bin", capacity=4) as buffer,
+            pytest.raises(ValueError),
+        ):
+            buffer.sample(1)
+
+    def test_full_random_game(self, tmp_path: Path) -> None:
+        """A whole random game at 20 life, deep stacks included, is recorded."""
+        with ReplayBuffer(tmp_path / "replay.bin", capacity=10_000) as buffer:
+            play_episode(buffer, seed=0, starting_life=20)
+            depths = [len(buffer.record(i).state.stack) for i in range(len(buffer))]
+            assert max(depths) > 32
+
+    def test_stack_too_deep(self, tmp_path: Path) -> None:
+        """States deeper than max_stack are rejected without a partial write."""
+        with ReplayBuffer(tmp_path / "replay.bin", capacity=4, max_stack=2) as buffer:
+            game = Game.new()
+            for _ in range(3):
+                game.apply(Action(ActionType.CAST_A))
+            with pytest.raises(ValueError):
+                buffer.append(game.state, Action(ActionType.PASS), 0b111, 0)
+            assert buffer.total_appended() == 0
+
+            writer = EpisodeWriter(buffer)
+            writer.record(Game.new(), Action(ActionType.PASS))
+            with pytest.raises(ValueError):
+                writer.record(game, Action(ActionType.PASS))
+            assert writer.finish(None) == 1
+            assert buffer.record(0).state == new_game()
+
+        with ReplayBuffer(tmp_path / "replay.bin") as buffer:
+            assert buffer.record_size == record_size(2)
+
+    def test_unwritten_slots(self, tmp_path: Path) -> None:
+        """Reserved but unwritten slots are never returned."""
+        with ReplayBuffer(tmp_path / "replay.bin", capacity=8) as buffer:
+            buffer._reserve(3)
+            with pytest.raises(IndexError):
+                buffer.record(0)
+            with pytest.raises(ValueError):
+                buffer.sample(1)
+
+            buffer.append(new_game(9), Action(ActionType.PASS), 0b111, 0)
+            batch = buffer.sample(16, random.Random(0))
+            assert set(batch.indices) == {3}
+
+    def test_concurrent_writers(self, tmp_path: Path) -> None:
+        """Appends from several processes all land in distinct slots."""
+        path = tmp_path / "replay.bin"
+        ReplayBuffer(path, capacity=1000).close()
+
+        procs = [
+            multiprocessing.Process(target=append_worker, args=(str(path), seed, 100))
+            for seed in (1, 2, 3)
+        ]
+        for proc in procs:
+            proc.start()
+        for proc in procs:
+            proc.join()
+
+        with ReplayBuffer(path) as buffer:
+            assert len(buffer) == 300
+            lives = {buffer.record(i).state.players[0].life for i in range(300)}
+            expected = {s * 1000 + i for s in (1, 2, 3) for i in range(100)}
+            assert lives == expected
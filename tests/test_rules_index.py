@@ -0,0 +1,166 @@
+"""Tests for the memory-mapped Comprehensive Rules index."""
+
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+from mtg_engine import cli
+from mtg_engine.rules.index import (
+    RulesIndex,
+    default_rules_path,
+    index_path,
+    parent_number,
+    rule_sort_key,
+)
+
+SAMPLE = (
+    "\ufeffSample Rules\r\n\r\nContents\r\n\r\n1. Game Concepts\r\n"
+    "100. General\r\n7. Additional Rules\r\n704. State-Based Actions\r\n"
+    "Glossary\r\n\r\nCredits\r\n\r\n"
+    "1. Game Concepts\r\n\r\n"
+    "100. General\r\n\r\n"
+    "100.1. These rules apply to games.\r\n\r\n"
+    "100.1a A two-player game has two players.\r\n\r\n"
+    "Example: Two players sit down.\r\n\r\n"
+    "100.2. To play, you need cards.\r\n\r\n"
+    "7. Additional Rules\r\n\r\n"
+    "704. State-Based Actions\r\n\r\n"
+    "704.5. The state-based actions are as follows:\r\n\r\n"
+    "704.5a If a player has 0 or less life, that player loses the game.\r\n\r\n"
+    "704.5b A player who drew from an empty library loses.\r\n\r\n"
+    "Glossary\r\n\r\n"
+    "Zone\r\nA place where objects can be.\r\n\r\n"
+    "Ability\r\n1. Text on an object.\r\n2. An ability on the stack.\r\n\r\n"
+    "Credits\r\n\r\nEveryone\r\n"
+)
+
+
+@pytest.fixture
+def sample(tmp_path: Path) -> Path:
+    """A small rules file in the Comprehensive Rules format."""
+    path = tmp_path / "rules.txt"
+    path.write_bytes(SAMPLE.encode("utf-8"))
+    return path
+
+
+class TestRuleNumbers:
+    """Tests for rule number ordering and parents."""
+
+    def test_sort_key_follows_document_order(self) -> None:
+        """Sections, rules and subrules sort in document order."""
+        numbers = ["1", "100", "100.1", "100.1a", "100.1b", "100.2", "100.10", "101"]
+        assert sorted(numbers, key=rule_sort_key) == numbers
+        with pytest.raises(ValueError):
+            rule_sort_key("x.1")
+
+    def test_parent_number(self) -> None:
+        """Each level points at the enclosing one."""
+        assert parent_number("704.5a") == "704.5"
+        assert parent_number("704.5") == "704"
+        assert parent_number("704") == "7"
+        assert parent_number("7") is None
+
+
+class TestRulesIndex:
+    """Tests for lookups and index maintenance."""
+
+    def test_get_rule(self, sample: Path) -> None:
+        """Rules are found by number with their text and parent."""
+        with RulesIndex(sample) as rules:
+            assert len(rules) == 10
+            rule = rules.get_rule("704.5a")
+            assert (
+                rule.text
+                == "If a player has 0 or less life, that player loses the game."
+            )
+            assert rule.parent == "704.5"
+            assert rules.get_rule("704.5.").text.startswith("The state-based")
+            assert rules.get_rule("7").text == "Additional Rules"
+            assert rules.get_rule("100.1a").text == (
+                "A two-player game has two players.\n\nExample: Two players sit down."
+            )
+            assert "100.3" not in rules
+            with pytest.raises(KeyError):
+                rules.get_rule("100.3")
+            with pytest.raises(KeyError):
+                rules.get_rule("priority")
+
+    def test_hierarchy(self, sample: Path) -> None:
+        """Children and section paths follow the rule numbering."""
+        with RulesIndex(sample) as rules:
+            assert [r.number for r in rules.children("100")] == ["100.1", "100.2"]
+            assert [r.number for r in rules.children("704.5")] == ["704.5a", "704.5b"]
+            assert rules.children("704.5b") == []
+            path = rules.section_path("704.5b")
+            assert [r.number for r in path] == ["7", "704", "704.5", "704.5b"]
+            assert list(rules.numbers())[:3] == ["1", "100", "100.1"]
+
+    def test_glossary(self, sample: Path) -> None:
+        """Glossary terms are found ignoring case and listed in order."""
+        with RulesIndex(sample) as rules:
+            assert rules.glossary_terms() == ["Ability", "Zone"]
+            entry = rules.glossary("ABILITY")
+            assert entry.term == "Ability"
+            assert entry.text == "1. Text on an object.\n2. An ability on the stack."
+            with pytest.raises(KeyError):
+                rules.glossary("Credits")
+
+    def test_rebuilt_only_when_content_changes(self, sample: Path) -> None:
+        """Touching the file keeps the index; editing it rebuilds it."""
+        with RulesIndex(sample) as rules:
+            assert rules.rebuilt
+        with RulesIndex(sample) as rules:
+            assert not rules.rebuilt
+
+        stat = sample.stat()
+        os.utime(sample, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        with RulesIndex(sample) as rules:
+            assert not rules.rebuilt
+        with RulesIndex(sample) as rules:
+            assert not rules.rebuilt
+
+        sample.write_bytes(SAMPLE.replace("0 or less", "zero").encode("utf-8"))
+        with RulesIndex(sample) as rules:
+            assert rules.rebuilt
+            assert rules.get_rule("704.5a").text.startswith("If a player has zero")
+
+    def test_corrupt_index_is_rebuilt(self, sample: Path) -> None:
+        """An index with a bad header is replaced."""
+        index_path(sample).write_bytes(b"junk")
+        with RulesIndex(sample) as rules:
+            assert rules.rebuilt
+            assert "100.1a" in rules
+
+    def test_comprehensive_rules(self, tmp_path: Path) -> None:
+        """The real rules file indexes every section, rule and glossary term."""
+        path = tmp_path / "rules.txt"
+        shutil.copyfile(default_rules_path(), path)
+        with RulesIndex(path) as rules:
+            assert [r.number for r in rules.rules() if r.parent is None] == [
+                str(n) for n in range(1, 10)
+            ]
+            assert rules.get_rule("704.5a").text.startswith("If a player has 0")
+            assert rules.get_rule("601.2f").parent == "601.2"
+            assert rules.get_rule("117").text == "Timing and Priority"
+            assert "Priority" in rules.glossary("priority").term
+            assert len(rules.glossary_terms()) > 500
+
+
+class TestRulesCommand:
+    """Tests for the ``rules show`` subcommand."""
+
+    def test_show(self, sample: Path, capsys: pytest.CaptureFixture[str]) -> None:
+        """Rules print with their section path; terms with their definition."""
+        cli.main(["rules", "--rules-file", str(sample), "show", "704.5", "--children"])
+        out = capsys.readouterr().out.splitlines()
+        assert out[0] == "7 Additional Rules > 704 State-Based Actions"
+        assert out[1] == "704.5 The state-based actions are as follows:"
+        assert out[2].startswith("  704.5a If a player")
+
+        cli.main(["rules", "--rules-file", str(sample), "show", "zone"])
+        assert capsys.readouterr().out == "Zone\nA place where objects can be.\n"
+
+        with pytest.raises(SystemExit):
+            cli.main(["rules", "--rules-file", str(sample), "show", "999"])
@@ -0,0 +1,158 @@
+"""Tests for the full-text search index over the Comprehensive Rules."""
+
+import shutil
+from pathlib import Path
+
+import pytest
+
+from mtg_engine import cli
+from mtg_engine.rules.index import default_rules_path
+from mtg_engine.rules.search import Clause, RulesSearch, parse_query, tokenize
+
+SAMPLE = (
+    "\ufeffSample Rules\r\n\r\nContents\r\n\r\n1. Game Concepts\r\n"
+    "Glossary\r\n\r\nCredits\r\n\r\n"
+    "1. Game Concepts\r\n\r\n"
+    "116. Special Actions\r\n\r\n"
+    "116.1. A player may take special actions when they have priority.\r\n\r\n"
+    "117. Timing and Priority\r\n\r\n"
+    "117.1. The player with priority may cast spells onto the stack.\r\n\r\n"
+    "117.2. Priority passes after a spell on the stack resolves. "
+    "Priority, priority, priority.\r\n\r\n"
+    "117.3. Each player must pay mana for spells with priority.\r\n\r\n"
+    "117.4. Lifelink and deathtouch matter. See rule 704.5a.\r\n\r\n"
+    "Glossary\r\n\r\n"
+    "Stack\r\nA zone where spells wait to resolve. See rule 405.\r\n\r\n"
+    "State-Based Actions\r\nActions that happen automatically.\r\n\r\n"
+    "Credits\r\n\r\nEveryone\r\n"
+)
+
+
+@pytest.fixture
+def sample(tmp_path: Path) -> Path:
+    """A small rules file in the Comprehensive Rules format."""
+    path = tmp_path / "rules.txt"
+    path.write_bytes(SAMPLE.encode("utf-8"))
+    return path
+
+
+def keys(search: RulesSearch, query: str) -> set[str]:
+    """Keys of every hit for a query."""
+    return {hit.key for hit in search.search(query, limit=None)}
+
+
+class TestQueries:
+    """Tests for tokenizing and query parsing."""
+
+    def test_tokenize(self) -> None:
+        """Words are case-folded; rule numbers stay whole."""
+        assert tokenize("State-based actions, see rule 608.2b.") == [
+            "state",
+            "based",
+            "actions",
+            "see",
+            "rule",
+            "608.2b",
+        ]
+        assert tokenize("player’s") == ["player", "s"]
+
+    def test_parse_query(self) -> None:
+        """Words, phrases, exclusions and OR become clauses."""
+        assert parse_query('priority "the stack" -mana NOT land OR lifelink') == [
+            Clause(
+                required=(("priority",), ("the", "stack")),
+                excluded=(("mana",), ("land",)),
+            ),
+            Clause(required=(("lifelink",),), excluded=()),
+        ]
+        assert parse_query("state-based") == [
+            Clause(required=(("state", "based"),), excluded=())
+        ]
+        assert parse_query("-mana") == []
+        assert parse_query("OR") == []
+
+
+class TestRulesSearch:
+    """Tests for boolean, phrase and ranked search."""
+
+    def test_boolean_queries(self, sample: Path) -> None:
+        """AND, OR and exclusions select the expected documents."""
+        with RulesSearch(sample) as search:
+            assert keys(search, "priority stack") == {"117.1", "117.2"}
+            assert keys(search, "priority -stack") == {
+                "116.1",
+                "117",
+                "117.3",
+            }
+            assert keys(search, "lifelink OR zone") == {"117.4", "Stack"}
+            assert keys(search, "priority NOT mana NOT stack") == {"116.1", "117"}
+            assert keys(search, "nothing") == set()
+            assert keys(search, "priority nothing") == set()
+
+    def test_phrases(self, sample: Path) -> None:
+        """Phrases match adjacent words in order only."""
+        with RulesSearch(sample) as search:
+            assert keys(search, '"the stack"') == {"117.1", "117.2"}
+            assert keys(search, '"stack the"') == set()
+            assert keys(search, "state-based") == {"State-Based Actions"}
+            assert keys(search, 'priority -"the stack"') == {"116.1", "117", "117.3"}
+
+    def test_ranking(self, sample: Path) -> None:
+        """More occurrences in a shorter document rank higher."""
+        with RulesSearch(sample) as search:
+            hits = search.search("priority", limit=2)
+            assert [hit.key for hit in hits] == ["117.2", "117"]
+            assert hits[0].score > hits[1].score
+            assert not hits[0].glossary
+            assert hits[0].text.startswith("Priority passes")
+            (glossary,) = search.search("zone")
+            assert glossary.glossary and glossary.key == "Stack"
+
+    def test_rule_references(self, sample: Path) -> None:
+        """A rule reference is found by itself and by its parent numbers."""
+        with RulesSearch(sample) as search:
+            assert keys(search, "704.5a") == {"117.4"}
+            assert keys(search, "704.5") == {"117.4"}
+            assert keys(search, "704") == {"117.4"}
+            assert keys(search, "405") == {"Stack"}
+
+    def test_rebuilt_when_rules_change(self, sample: Path) -> None:
+        """The index is reused until the rules file's content changes."""
+        with RulesSearch(sample) as search:
+            assert search.rebuilt
+        with RulesSearch(sample) as search:
+            assert not search.rebuilt
+        sample.write_bytes(SAMPLE.replace("Lifelink", "Trample").encode("utf-8"))
+        with RulesSearch(sample) as search:
+            assert search.rebuilt
+            assert keys(search, "trample") == {"117.4"}
+            assert keys(search, "lifelink") == set()
+
+    def test_comprehensive_rules(self, tmp_path: Path) -> None:
+        """Searching the real rules finds the rules a reader would expect."""
+        path = tmp_path / "rules.txt"
+        shutil.copyfile(default_rules_path(), path)
+        with RulesSearch(path) as search:
+            assert "704" in keys(search, '"state-based actions"')
+            assert "117.3a" in keys(search, "priority stack")
+            top = search.search("deathtouch", limit=5)
+            assert any(hit.key == "Deathtouch" and hit.glossary for hit in top)
+
+
+class TestRulesSearchCommand:
+    """Tests for the ``rules search`` subcommand."""
+
+    def test_search(self, sample: Path, capsys: pytest.CaptureFixture[str]) -> None:
+        """Hits print best first, glossary terms in brackets."""
+        cli.main(
+            ["rules", "--rules-file", str(sample), "search", "priority", "-n", "1"]
+        )
+        out = capsys.readouterr().out.splitlines()
+        assert len(out) == 1
+        assert "117.2  Priority passes" in out[0]
+
+        cli.main(["rules", "--rules-file", str(sample), "search", "zone"])
+        assert "[Stack]" in capsys.readouterr().out
+
+        cli.main(["rules", "--rules-file", str(sample), "search", "nothing"])
+        assert capsys.readouterr().out == "No matches.\n"
@@ -0,0 +1,159 @@
+"""Tests for the Comprehensive Rules cross-reference graph."""
+
+import shutil
+from pathlib import Path
+
+import pytest
+
+from mtg_engine import cli
+from mtg_engine.rules.index import default_rules_path
+from mtg_engine.rules.xref import RuleGraph, extract_references, xref_path
+
+RULES = [
+    "1. Game Concepts",
+    "100. General",
+    "100.1. See rule 101 and rules 100.2a-b.",
+    "100.2. Players need cards.",
+    "100.2a A deck has 60 cards, as described in section 1.",
+    "100.2b A deck has 40 cards. See rule 100.2a.",
+    "101. The Magic Golden Rules",
+    "101.1. Card text wins. See rule 100.1 and rule 102.1.",
+]
+
+
+def write_rules(path: Path, rules: list[str]) -> Path:
+    """Write a rules file in the Comprehensive Rules format."""
+    body = "".join(f"{rule}\r\n\r\n" for rule in rules)
+    text = (
+        "\ufeffSample Rules\r\n\r\nContents\r\n\r\n1. Game Concepts\r\n"
+        f"Glossary\r\n\r\nCredits\r\n\r\n{body}Glossary\r\n\r\nCredits\r\n"
+    )
+    path.write_bytes(text.encode("utf-8"))
+    return path
+
+
+@pytest.fixture
+def sample(tmp_path: Path) -> Path:
+    """A small rules file with cross-references."""
+    return write_rules(tmp_path / "rules.txt", RULES)
+
+
+class TestExtractReferences:
+    """Tests for finding references in rule text."""
+
+    def test_forms(self) -> None:
+        """Lists, letter ranges, sections and bare dotted numbers are found."""
+        text = (
+            "See rule 601.2g-h and rules 702.19b and 702.19c, section 8, "
+            "rules 100.1, 100.2, or 101. Also 704.5a. Draw 7 cards; rule 1."
+        )
+        assert extract_references(text) == [
+            "601.2g",
+            "601.2h",
+            "702.19b",
+            "702.19c",
+            "8",
+            "100.1",
+            "100.2",
+            "101",
+            "704.5a",
+        ]
+
+    def test_no_references(self) -> None:
+        """Plain numbers are not references."""
+        assert extract_references("A deck has 60 cards and 100 life.") == []
+
+
+class TestRuleGraph:
+    """Tests for dependency queries and the incremental cache."""
+
+    def test_dependencies_and_dependents(self, sample: Path) -> None:
+        """Direct and transitive queries in both directions."""
+        with RuleGraph(sample) as graph:
+            assert graph.edge_count == 6
+            assert graph.dependencies("100.1") == ["100.2a", "100.2b", "101"]
+            assert graph.dependencies("100.2b") == ["100.2a"]
+            assert graph.dependencies("100.2a") == ["1"]
+            assert graph.dependencies("100.1", transitive=True) == [
+                "1",
+                "100.2a",
+                "100.2b",
+                "101",
+            ]
+            assert graph.dependents("100.2a") == ["100.1", "100.2b"]
+            assert graph.dependents("1", transitive=True) == [
+                "100.1",
+                "100.2a",
+                "100.2b",
+                "101.1",
+            ]
+            assert graph.dependencies("100") == []
+            with pytest.raises(KeyError):
+                graph.dependencies("102.1")
+
+    def test_cycles_exclude_the_start(self, sample: Path) -> None:
+        """A rule reachable from itself is not its own dependency."""
+        with RuleGraph(sample) as graph:
+            assert graph.dependencies("101.1") == ["100.1"]
+            assert "101.1" not in graph.dependencies("101.1", transitive=True)
+
+    def test_incremental_rebuild(self, tmp_path: Path, sample: Path) -> None:
+        """Only new or edited rules are re-parsed when the rules change."""
+        with RuleGraph(sample) as graph:
+            assert graph.rebuilt
+            assert graph.reparsed == len(RULES)
+        with RuleGraph(sample) as graph:
+            assert not graph.rebuilt
+            assert graph.reparsed == 0
+
+        edited = [*RULES]
+        edited[3] = "100.2. Players need cards. See rule 101.1."
+        write_rules(sample, edited)
+        with RuleGraph(sample) as graph:
+            assert graph.rebuilt
+            assert graph.reparsed == 1
+            assert graph.dependencies("100.2") == ["101.1"]
+            assert graph.dependents("101.1") == ["100.2"]
+
+        # 101.1 already referred to 102.1; the edge appears once it exists
+        write_rules(sample, [*edited, "102. Rulings", "102.1. Rulings apply."])
+        with RuleGraph(sample) as graph:
+            assert graph.reparsed == 2
+            assert graph.dependencies("101.1") == ["100.1", "102.1"]
+
+    def test_corrupt_cache_is_rebuilt(self, sample: Path) -> None:
+        """A damaged cache is rebuilt from scratch."""
+        with RuleGraph(sample):
+            pass
+        xref_path(sample).write_bytes(b"MTGXREF1 damaged")
+        with RuleGraph(sample) as graph:
+            assert graph.rebuilt
+            assert graph.reparsed == len(RULES)
+            assert graph.dependencies("100.2b") == ["100.2a"]
+
+    def test_comprehensive_rules(self, tmp_path: Path) -> None:
+        """References in the real rules resolve to rules."""
+        path = tmp_path / "rules.txt"
+        shutil.copyfile(default_rules_path(), path)
+        with RuleGraph(path) as graph:
+            assert graph.edge_count > 1000
+            assert "704.7" in graph.dependents("704.5a")
+            assert "601.2a" in graph.dependencies("601.2", transitive=True)
+
+
+class TestRulesRefsCommand:
+    """Tests for the ``rules refs`` subcommand."""
+
+    def test_refs(self, sample: Path, capsys: pytest.CaptureFixture[str]) -> None:
+        """Dependencies and dependents print with their rule text."""
+        cli.main(["rules", "--rules-file", str(sample), "refs", "100.2b"])
+        assert capsys.readouterr().out.splitlines() == [
+            "Rules referenced by 100.2b: 1",
+            "  100.2a  A deck has 60 cards, as described in section 1.",
+        ]
+
+        cli.main(["rules", "--rules-file", str(sample), "refs", "1", "--dependents"])
+        assert capsys.readouterr().out.splitlines()[0] == "Rules referring to 1: 1"
+
+        with pytest.raises(SystemExit):
+            cli.main(["rules", "--rules-file", str(sample), "refs", "999"])
@@ -0,0 +1,89 @@
+"""Tests for the headless self-play runner and its CLI subcommand."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from mtg_engine import cli
+from mtg_engine.selfplay import (
+    GameResult,
+    play_game,
+    read_binary,
+    run_selfplay,
+    summarize,
+)
+
+
+class TestSelfPlay:
+    """Tests for running self-play games."""
+
+    def test_results_in_order(self) -> None:
+        """One result per game, in game order, each finished or capped."""
+        results = list(run_selfplay(10, seed=3))
+        assert [r.game for r in results] == list(range(10))
+        for r in results:
+            assert r.winner in (0, 1) or r.actions == 10_000
+
+    def test_reproducible_across_workers(self) -> None:
+        """A run gives the same results in-process and in a worker pool."""
+        serial = list(run_selfplay(6, ("random", "greedy"), seed=9))
+        pooled = list(
+            run_selfplay(6, ("random", "greedy"), workers=2, seed=9, chunk_size=2)
+        )
+        assert serial == pooled
+
+    def test_max_actions_abandons_game(self) -> None:
+        """Games cut off at max_actions have no winner."""
+        result = play_game(0, ("random", "random"), max_actions=3)
+        assert result == GameResult(0, None, result.turns, 3)
+
+    def test_summarize(self) -> None:
+        """Totals count games, actions and wins per player."""
+        results = [GameResult(0, 1, 2, 10), GameResult(1, None, 1, 5)]
+        stats = summarize(iter(results), 0.0)
+        assert (stats.games, stats.actions, stats.wins) == (2, 15, (0, 1))
+        assert stats.actions_per_second > 0
+
+
+class TestSelfPlayCommand:
+    """Tests for ``python -m mtg_engine selfplay``."""
+
+    def test_jsonl_output(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Results stream to JSONL and throughput is printed."""
+        path = tmp_path / "results.jsonl"
+        cli.main(
+            ["selfplay", "-n", "5", "--agents", "greedy", "greedy", "-o", str(path)]
+        )
+
+        lines = [json.loads(line) for line in path.read_text().splitlines()]
+        assert [line["game"] for line in lines] == list(range(5))
+        assert all(line["winner"] == 0 for line in lines)
+        out = capsys.readouterr().out
+        assert "games/s" in out
+        assert "actions/s" in out
+
+    def test_binary_output(self, tmp_path: Path) -> None:
+        """Binary output round-trips through read_binary."""
+        path = tmp_path / "results.bin"
+        cli.main(
+            [
+                "selfplay",
+                "-n",
+                "4",
+                "--seed",
+                "1",
+                "--format",
+                "binary",
+                "-o",
+                str(path),
+            ]
+        )
+        assert list(read_binary(path)) == list(run_selfplay(4, seed=1))
+
+    def test_unknown_agent(self) -> None:
+        """Bad agent specs are rejected by the argument parser."""
+        with pytest.raises(SystemExit):
+            cli.main(["selfplay", "--agents", "nobody", "random"])
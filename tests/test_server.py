@@ -0,0 +1,254 @@
+"""Tests for the asyncio game server and its load-test client."""
+
+import asyncio
+import threading
+from collections.abc import Awaitable, Callable
+
+from mtg_engine.engine.actions import Action, ActionType, action_for
+from mtg_engine.engine.game import Game
+from mtg_engine.loadtest import percentile, run_load_test
+from mtg_engine.server import MAX_LINE, GameServer
+
+
+class Client:
+    """Minimal protocol client for tests."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+
+    async def send(self, line: str) -> None:
+        self.writer.write(line.encode() + b"\n")
+        await self.writer.drain()
+
+    async def recv(self) -> str:
+        line = await asyncio.wait_for(self.reader.readline(), timeout=5)
+        return line.decode().rstrip("\n")
+
+    async def close(self) -> None:
+        self.writer.close()
+        await self.writer.wait_closed()
+
+
+def run_with_server(
+    test: Callable[[GameServer, Callable[[], Awaitable[Client]]], Awaitable[None]],
+    **limits: int,
+) -> None:
+    """Run ``test(server, connect)`` against a server on a loopback port."""
+
+    async def main() -> None:
+        server = GameServer(**limits)
+        port = await server.start()
+
+        async def connect() -> Client:
+            return Client(*await asyncio.open_connection("127.0.0.1", port))
+
+        try:
+            await test(server, connect)
+        finally:
+            await server.close()
+
+    asyncio.run(main())
+
+
+class TestGameServer:
+    """Tests for the line protocol."""
+
+    def test_play_both_seats_to_the_end(self) -> None:
+        """A connection playing both seats can finish a game."""
+
+        async def test(server: GameServer, connect) -> None:
+            c = await connect()
+            await c.send("NEW 3")
+            assert await c.recv() == "GAME 1 01"
+            assert await c.recv() == "STATE 1 1 0 0 3 3 -"
+            await c.send("ACT 1 a")
+            assert await c.recv() == "STATE 1 1 0 1 3 3 A0"
+            await c.send("ACT 1 p")
+            assert await c.recv() == "STATE 1 1 0 0 3 3 A0"
+            await c.send("ACT 1 p")
+            assert await c.recv() == "STATE 1 1 0 0 3 0 -"
+            assert await c.recv() == "OVER 1 0"
+            assert server.games == {}
+            await c.close()
+
+        run_with_server(test)
+
+    def test_server_agent_replies(self) -> None:
+        """A server agent takes seat 1's turns before the update is pushed."""
+
+        async def test(server: GameServer, connect) -> None:
+            c = await connect()
+            await c.send("NEW 20 greedy")
+            assert await c.recv() == "GAME 1 0"
+            await c.recv()
+            for _ in range(50):
+                await c.send("ACT 1 p")
+                words = (await c.recv()).split()
+                assert words[0] == "STATE"
+                if int(words[5]) <= 0 or int(words[6]) <= 0:
+                    assert (await c.recv()).startswith("OVER 1")
+                    break
+                assert words[4] == "0"  # priority is back with seat 0
+            await c.close()
+
+        run_with_server(test)
+
+    def test_agents_are_shared_and_limited(self) -> None:
+        """Games naming the same opponent share one agent, up to a limit."""
+
+        async def test(server: GameServer, connect) -> None:
+            c = await connect()
+            for _ in range(2):
+                await c.send("NEW 20 greedy")
+                assert (await c.recv()).startswith("GAME")
+                await c.recv()
+            hosted = list(server.games.values())
+            assert hosted[0].agent is hosted[1].agent is server.agents["greedy"]
+            await c.send("NEW 20 random")
+            assert await c.recv() == "ERR server already runs 1 kinds of opponent"
+            await c.close()
+
+        run_with_server(test, max_agents=1)
+
+    def test_agent_search_does_not_block_the_loop(self) -> None:
+        """Other connections are served while a server agent thinks."""
+        release = threading.Event()
+
+        class SlowAgent:
+            def choose_action(self, game: Game) -> Action:
+                release.wait(5)
+                return action_for(ActionType.PASS)
+
+        async def test(server: GameServer, connect) -> None:
+            server.agents["slow"] = SlowAgent()
+            player, other = await connect(), await connect()
+            await player.send("NEW 20 slow")
+            assert await player.recv() == "GAME 1 0"
+            await player.recv()
+            await player.send("ACT 1 a")
+            await other.send("NEW 20")
+            assert await other.recv() == "GAME 2 01"
+            release.set()
+            assert await player.recv() == "STATE 1 1 0 0 20 20 A0"
+            await player.close()
+            await other.close()
+
+        run_with_server(test)
+
+    def test_join_and_watch_receive_pushes(self) -> None:
+        """Updates are pushed to both players and to watchers."""
+
+        async def test(server: GameServer, connect) -> None:
+            p0, p1, watcher = await connect(), await connect(), await connect()
+            await p0.send("NEW 20 open")
+            assert await p0.recv() == "GAME 1 0"
+            initial = await p0.recv()
+            await p1.send("JOIN 1")
+            assert await p1.recv() == "GAME 1 1"
+            assert await p1.recv() == initial
+            assert await p0.recv() == initial
+            await watcher.send("WATCH 1")
+            assert await watcher.recv() == initial
+
+            await p1.send("ACT 1 a")
+            assert (await p1.recv()).startswith("ERR player 0 has priority")
+            await p0.send("ACT 1 b")
+            update = "STATE 1 1 0 1 20 20 B0"
+            for c in (p0, p1, watcher):
+                assert await c.recv() == update
+            await p1.send("ACT 1 a")
+            update = "STATE 1 1 0 0 20 20 B0.A1"
+            for c in (p0, p1, watcher):
+                assert await c.recv() == update
+
+            await p1.close()
+            assert await p0.recv() == "OVER 1 -"
+            assert await watcher.recv() == "OVER 1 -"
+            assert server.games == {}
+            await p0.close()
+            await watcher.close()
+
+        run_with_server(test)
+
+    def test_errors(self) -> None:
+        """Bad commands get an ERR line and the connection stays usable."""
+
+        async def test(server: GameServer, connect) -> None:
+            c = await connect()
+            for line in (
+                "FOO",
+                "ACT",
+                "ACT x p",
+                "ACT 99 p",
+                "NEW zero",
+                "NEW 0",
+                "NEW 20 nobody",
+                "JOIN 1",
+            ):
+                await c.send(line)
+                assert (await c.recv()).startswith("ERR "), line
+            await c.send("NEW 20")
+            assert await c.recv() == "GAME 1 01"
+            await c.recv()
+            await c.send("ACT 1 z")
+            assert (await c.recv()).startswith("ERR bad action")
+            await c.send("JOIN 1")
+            assert (await c.recv()).startswith("ERR game 1 has no open seat")
+            await c.close()
+
+        run_with_server(test)
+
+    def test_limits(self) -> None:
+        """Game limits and over-long lines are enforced."""
+
+        async def test(server: GameServer, connect) -> None:
+            c = await connect()
+            await c.send("NEW\nNEW")
+            assert (await c.recv()).startswith("GAME")
+            await c.recv()
+            assert await c.recv() == "ERR connection already has 1 games"
+
+            other = await connect()
+            await other.send("NEW")
+            assert (await other.recv()).startswith("GAME")
+            await other.recv()
+            third = await connect()
+            await third.send("NEW")
+            assert await third.recv() == "ERR server is full"
+
+            await third.send("x" * (MAX_LINE * 2))
+            assert (await third.recv()).startswith("ERR line longer")
+            assert await third.reader.read() == b""
+            for client in (c, other, third):
+                await client.close()
+
+        run_with_server(test, max_games=2, max_games_per_connection=1)
+
+
+class TestLoadTest:
+    """Tests for the load-test client."""
+
+    def test_percentile(self) -> None:
+        """Nearest-rank percentiles of sorted values."""
+        values = list(range(1, 101))
+        assert percentile(values, 0.5) == 50
+        assert percentile(values, 0.99) == 99
+        assert percentile(values, 1.0) == 100
+        assert percentile([], 0.5) == 0
+
+    def test_in_process_run(self) -> None:
+        """A small run completes every requested action."""
+        stats = asyncio.run(
+            run_load_test(
+                connections=4,
+                games_per_connection=3,
+                actions_per_connection=200,
+                starting_life=5,
+                opponent="random",
+            )
+        )
+        assert stats.actions == 800
+        assert stats.games > 0
+        assert 0 < stats.p50_ms <= stats.p99_ms
+        assert stats.actions_per_second > 0
@@ -0,0 +1,128 @@
+"""Tests for the retrograde solver."""
+
+import pytest
+
+from mtg_engine.engine.actions import ACTION_CODES, ACTIONS, ActionType
+from mtg_engine.engine.game import Game
+from mtg_engine.search.solver import (
+    Outcome,
+    RetrogradeSolver,
+    position_key,
+    solve_range,
+)
+
+
+def child_outcome(game: Game, solver: RetrogradeSolver, action_code: int) -> Outcome:
+    """Value of playing an action, for the player who plays it."""
+    me = game.state.priority_player
+    record = game.apply(ACTIONS[action_code])
+    value = solver.value(game.state)
+    same = game.state.priority_player == me
+    game.undo(record)
+    return value if same else Outcome(-value)
+
+
+def explore(solver: RetrogradeSolver) -> list[Game]:
+    """Return a game at every position in the solver's table."""
+    root = Game.new(solver.starting_life, check_interval=0)
+    seen = {position_key(root.state)}
+    games = [root]
+    frontier = [root]
+    while frontier:
+        game = frontier.pop()
+        if game.is_over():
+            continue
+        for code in moves(game, solver):
+            child = game.clone()
+            child.apply(ACTIONS[code])
+            key = position_key(child.state)
+            if key not in seen:
+                seen.add(key)
+                games.append(child)
+                frontier.append(child)
+    return games
+
+
+def moves(game: Game, solver: RetrogradeSolver) -> list[int]:
+    """Action codes the solver considers in a position."""
+    if len(game.state.stack) < solver.max_stack_depth:
+        return [ACTION_CODES[a.type] for a in ACTIONS]
+    return [ACTION_CODES[ActionType.PASS]]
+
+
+class TestRetrogradeSolver:
+    """Tests for enumeration and valuation."""
+
+    @pytest.mark.parametrize("max_stack_depth", [1, 2, 3])
+    def test_values_are_consistent(self, max_stack_depth: int) -> None:
+        """Every value agrees with the values of its position's moves."""
+        solver = RetrogradeSolver(4, max_stack_depth)
+        stats = solver.solve()
+        games = explore(solver)
+        assert len(games) == stats.positions
+
+        for game in games:
+            value = solver.value(game.state)
+            if game.is_over():
+                won = game.winner() == game.state.priority_player
+                assert value == (Outcome.WIN if won else Outcome.LOSS)
+                assert solver.best_action(game.state) is None
+                continue
+            outcomes = [child_outcome(game, solver, c) for c in moves(game, solver)]
+            assert value == max(outcomes)
+            best = solver.best_action(game.state)
+            assert child_outcome(game, solver, ACTION_CODES[best.type]) == value
+
+    def test_optimal_play_ends_in_predicted_plies(self) -> None:
+        """Following best actions from the start wins as predicted."""
+        solver = RetrogradeSolver(5, max_stack_depth=3)
+        game = Game.new(5)
+        assert solver.value(game.state) is Outcome.WIN
+        winner = game.state.priority_player
+        plies = solver.plies(game.state)
+        for _ in range(plies):
+            game.apply(solver.best_action(game.state))
+        assert game.is_over()
+        assert game.winner() == winner
+
+    def test_pass_cycles_are_draws(self) -> None:
+        """With an even depth limit the opening player cannot force a win."""
+        solver = RetrogradeSolver(1, max_stack_depth=2)
+        root = Game.new(1).state
+        assert solver.value(root) is Outcome.DRAW
+        assert solver.solve().draws > 0
+
+    def test_turn_is_ignored(self) -> None:
+        """Positions that differ only in turn number share one entry."""
+        solver = RetrogradeSolver(3, max_stack_depth=1)
+        game = Game.new(3)
+        before = solver.value(game.state)
+        for _ in range(4):
+            game.apply(ACTIONS[ACTION_CODES[ActionType.PASS]])
+        assert game.state.turn == 3
+        assert solver.value(game.state) == before
+
+    def test_unreachable_state(self) -> None:
+        """States beyond the depth limit are not in the table."""
+        solver = RetrogradeSolver(3, max_stack_depth=1)
+        game = Game.new(3)
+        game.apply(ACTIONS[ACTION_CODES[ActionType.CAST_A]])
+        game.apply(ACTIONS[ACTION_CODES[ActionType.CAST_A]])
+        with pytest.raises(KeyError):
+            solver.value(game.state)
+
+    def test_table_grows_with_life(self) -> None:
+        """solve_range reports one growing table per starting life."""
+        stats = solve_range(range(2, 6), max_stack_depth=2)
+        assert [s.starting_life for s in stats] == [2, 3, 4, 5]
+        sizes = [s.positions for s in stats]
+        assert sizes == sorted(sizes)
+        assert sizes[0] < sizes[-1]
+        for s in stats:
+            assert s.wins + s.losses + s.draws == s.positions
+            assert s.table_bytes > 0
+
+    def test_rejects_negative_depth(self) -> None:
+        """A negative depth limit raises ValueError."""
+        with pytest.raises(ValueError):
+            RetrogradeSolver(3, max_stack_depth=-1)
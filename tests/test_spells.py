@@ -0,0 +1,215 @@
+"""Tests for the data-driven spell registry."""
+
+import pickle
+import random
+from pathlib import Path
+
+import pytest
+
+from mtg_engine.agents import GreedyAgent
+from mtg_engine.engine import spells as spells_module
+from mtg_engine.engine.actions import ACTIONS, Action, ActionType, action_for
+from mtg_engine.engine.game import Game
+from mtg_engine.engine.persistent import PersistentGame
+from mtg_engine.engine.spells import (
+    DEFAULT_SPELLS,
+    MAX_DAMAGE,
+    MIN_DAMAGE,
+    SpellDefinition,
+    SpellRegistry,
+)
+from mtg_engine.engine.stack import StackItem
+from mtg_engine.engine.state import GameState
+from mtg_engine.records import GameRecorder
+from mtg_engine.replay_buffer import ReplayBuffer
+from mtg_engine.search.alphabeta import AlphaBeta
+from mtg_engine.search.mcts import MCTS
+
+BIG_A = SpellRegistry([SpellDefinition("Big", ActionType.CAST_A, 10)])
+
+# 150 spells cast by the parametric CAST action, plus one bound to CAST_A
+MANY = SpellRegistry(
+    [SpellDefinition("Shock", ActionType.CAST_A, 2)]
+    + [SpellDefinition(f"Spell {i}", ActionType.CAST, i % 7) for i in range(150)]
+)
+
+
+class TestSpellRegistry:
+    """Tests for compiling spell definitions."""
+
+    def test_default_spells(self) -> None:
+        """The default registry holds the prototype's spells A and B."""
+        a = DEFAULT_SPELLS.by_action[ActionType.CAST_A]
+        b = DEFAULT_SPELLS.by_action[ActionType.CAST_B]
+        assert (a.name, a.damage_to_opponent) == ("A", 3)
+        assert (b.name, b.damage_to_opponent) == ("B", 2)
+        assert a.items[1] == StackItem(name="A", controller=1, damage_to_opponent=3)
+
+    def test_from_toml(self, tmp_path: Path) -> None:
+        """Spells load from a TOML file."""
+        path = tmp_path / "spells.toml"
+        path.write_text(
+            '[[spell]]\nname = "Bolt"\naction = "CAST_B"\ndamage_to_opponent = 5\n'
+        )
+        registry = SpellRegistry.from_toml(path)
+
+        assert len(registry) == 1
+        spell = registry.by_name["Bolt"]
+        assert spell.id == 0
+        assert spell.action is ActionType.CAST_B
+        assert spell.damage_to_opponent == 5
+
+    def test_parametric_cast(self) -> None:
+        """Spells with the CAST action are cast by spell id."""
+        registry = SpellRegistry.from_mapping(
+            {"spell": [{"name": "Bolt", "action": "CAST", "damage_to_opponent": 3}]}
+        )
+        assert registry.spells[0].action is ActionType.CAST
+        assert registry.actions == (
+            action_for(ActionType.PASS),
+            Action(ActionType.CAST, 0),
+        )
+
+    @pytest.mark.parametrize("entry", [{"name": "X", "action": "NOPE"}, {"name": "X"}])
+    def test_unknown_action_rejected(self, entry: dict[str, str]) -> None:
+        """Entries must name an existing action type."""
+        with pytest.raises(ValueError):
+            SpellRegistry.from_mapping({"spell": [entry]})
+
+    @pytest.mark.parametrize(
+        "definitions",
+        [
+            [SpellDefinition("X", ActionType.PASS)],
+            [
+                SpellDefinition("X", ActionType.CAST_A),
+                SpellDefinition("X", ActionType.CAST_B),
+            ],
+            [
+                SpellDefinition("X", ActionType.CAST_A),
+                SpellDefinition("Y", ActionType.CAST_A),
+            ],
+            [SpellDefinition("X", ActionType.CAST, MAX_DAMAGE + 1)],
+            [SpellDefinition("X", ActionType.CAST, MIN_DAMAGE - 1)],
+        ],
+    )
+    def test_invalid_definitions(self, definitions: list[SpellDefinition]) -> None:
+        """PASS, duplicates and out-of-range damage are rejected."""
+        with pytest.raises(ValueError):
+            SpellRegistry(definitions)
+
+    def test_too_many_spells(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Registries larger than the stack encoding allows are rejected."""
+        monkeypatch.setattr(spells_module, "MAX_SPELLS", 3)
+        SpellRegistry([SpellDefinition(f"S{i}", ActionType.CAST) for i in range(3)])
+        with pytest.raises(ValueError):
+            SpellRegistry([SpellDefinition(f"S{i}", ActionType.CAST) for i in range(4)])
+
+    def test_spell_for_action(self) -> None:
+        """Fixed and parametric casts map to their spell; others raise."""
+        assert MANY.spell_for_action(action_for(ActionType.CAST_A)).name == "Shock"
+        assert MANY.spell_for_action(Action(ActionType.CAST, 5)).name == "Spell 4"
+        for action in (
+            action_for(ActionType.CAST_B),
+            action_for(ActionType.PASS),
+            Action(ActionType.CAST),
+            Action(ActionType.CAST, 0),
+            Action(ActionType.CAST, len(MANY)),
+        ):
+            with pytest.raises(KeyError):
+                MANY.spell_for_action(action)
+
+    def test_pickle(self) -> None:
+        """Registries pickle by definition and compile the same tables."""
+        copy = pickle.loads(pickle.dumps(MANY))
+        assert copy.actions == MANY.actions
+        assert copy.spells == MANY.spells
+
+    def test_spell_for(self) -> None:
+        """Stack items map back to their spell only if they match exactly."""
+        a = DEFAULT_SPELLS.by_name["A"]
+        assert DEFAULT_SPELLS.spell_for(a.items[0]) is a
+        forged = StackItem(name="A", controller=0, damage_to_opponent=99)
+        assert DEFAULT_SPELLS.spell_for(forged) is None
+
+
+class TestGameSpells:
+    """Tests for games driven by a custom registry."""
+
+    def test_cast_pushes_registry_item(self) -> None:
+        """Casting pushes the compiled stack item, which resolves its damage."""
+        g = Game.new(spells=BIG_A, check_keys=True)
+        g.apply(action_for(ActionType.CAST_A))
+        assert g.state.stack.peek() is BIG_A.spells[0].items[0]
+
+        g.apply(action_for(ActionType.PASS))
+        g.apply(action_for(ActionType.PASS))
+        assert g.state.players[1].life == 10
+
+    def test_mask_excludes_unbound_actions(self) -> None:
+        """Actions with no spell in the registry are not legal."""
+        g = Game.new(spells=BIG_A)
+        legal = {a.type for a in g.legal_actions()}
+        assert legal == {ActionType.CAST_A, ActionType.PASS}
+        with pytest.raises(KeyError):
+            g.apply(action_for(ActionType.CAST_B))
+
+    def test_many_spells(self) -> None:
+        """Games with over a hundred spells play, encode and search."""
+        g = Game.new(spells=MANY, check_keys=True)
+        assert len(g.legal_actions()) == 152
+        assert g.legal_actions() == list(MANY.actions)
+        persistent = PersistentGame.new(spells=MANY)
+
+        # Pass half the time so stacks stay shallow and games end quickly
+        rng = random.Random(4)
+        pass_action = action_for(ActionType.PASS)
+        for _ in range(500):
+            if g.is_over():
+                break
+            if rng.random() < 0.5:
+                action = pass_action
+            else:
+                action = rng.choice(MANY.actions)
+            g.apply(action)
+            persistent.apply(action)
+            assert persistent.state.to_state() == g.state
+            assert GameState.from_bytes(g.state.to_bytes(MANY), spells=MANY) == g.state
+
+        g = Game.new(spells=MANY)
+        best = GreedyAgent().choose_action(g)
+        assert MANY.spell_for_action(best).damage_to_opponent == 6
+        assert MCTS(simulations=50, seed=0).choose_action(g) in MANY.actions
+        assert AlphaBeta().search(g, 2).best_action in MANY.actions
+
+    def test_code_consumers_reject_parametric(self, tmp_path: Path) -> None:
+        """Stores that keep actions as codes refuse parametric CAST actions."""
+        with pytest.raises(ValueError, match="parametric"):
+            ReplayBuffer(tmp_path / "replay.bin", capacity=4, spells=MANY)
+        with pytest.raises(ValueError, match="no action code"):
+            GameRecorder().record(Action(ActionType.CAST, 1))
+        batch_game = pytest.importorskip("mtg_engine.engine.batch").BatchGame
+        with pytest.raises(ValueError, match="parametric"):
+            batch_game(1, spells=MANY)
+
+    def test_batch_matches_game(self) -> None:
+        """BatchGame with a custom registry matches Game step for step."""
+        batch_game = pytest.importorskip("mtg_engine.engine.batch").BatchGame
+        registry = SpellRegistry(
+            [
+                SpellDefinition("Y", ActionType.CAST_B, 1),
+                SpellDefinition("Z", ActionType.CAST_A, 4),
+            ]
+        )
+        rng = random.Random(2)
+        g = Game.new(spells=registry)
+        batch = batch_game(1, max_stack_depth=256, spells=registry)
+        for _ in range(300):
+            if g.is_over():
+                break
+            code = rng.randrange(len(ACTIONS))
+            g.apply(ACTIONS[code])
+            batch.apply([code])
+            assert g.state == batch.get_state(0)
+
+        batch.set_state(0, g.state)
+        assert batch.get_state(0) == g.state
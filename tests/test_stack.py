@@ -1,7 +1,11 @@
 """Tests for stack resolution mechanics."""
 
+import pickle
+
 from mtg_engine.engine.actions import Action, ActionType
 from mtg_engine.engine.game import Game
+from mtg_engine.engine.spells import DEFAULT_SPELLS
+from mtg_engine.engine.stack import Stack, StackItem
 
 
 class TestStackResolution:
@@ -90,3 +94,59 @@ class TestStackResolution:
 
         assert g.state.players[1].life == 14  # P1 took another 3 damage
         assert g.state.stack.is_empty()
+
+
+class TestStackStorage:
+    """Tests for interned, id-backed stack storage."""
+
+    def test_equal_items_are_shared(self) -> None:
+        """Pushing equal items yields the same interned instance."""
+        stack = Stack()
+        stack.push(StackItem(name="X", controller=0, damage_to_opponent=1))
+        stack.push(StackItem(name="X", controller=0, damage_to_opponent=1))
+
+        assert stack.ids.typecode == "H"
+        assert stack.ids[0] == stack.ids[1]
+        assert stack.pop() is stack.peek()
+
+    def test_cast_reuses_spell_item(self) -> None:
+        """Casting pushes the registry's item rather than a new one."""
+        g = Game.new()
+        g.apply(Action(ActionType.CAST_A))
+        g.apply(Action(ActionType.CAST_A))
+
+        spell = DEFAULT_SPELLS.by_action[ActionType.CAST_A]
+        items = g.state.stack.items()
+        assert items[0] is spell.items[0]
+        assert items[1] is spell.items[1]
+
+    def test_describe_and_peek(self) -> None:
+        """describe() lists items top first and peek() returns the top."""
+        stack = Stack()
+        assert stack.peek() is None
+        stack.push(StackItem(name="A", controller=0, damage_to_opponent=3))
+        stack.push(StackItem(name="B", controller=1, damage_to_opponent=2))
+
+        assert stack.describe() == ["B (P1, 2 dmg)", "A (P0, 3 dmg)"]
+        assert stack.peek() == StackItem(name="B", controller=1, damage_to_opponent=2)
+
+    def test_copy_is_independent(self) -> None:
+        """Copies share no storage with the original."""
+        stack = Stack()
+        stack.push(StackItem(name="A", controller=0, damage_to_opponent=3))
+        copy = stack.copy()
+        copy.pop()
+
+        assert len(stack) == 1
+        assert copy.is_empty()
+        assert copy != stack
+
+    def test_pickle_round_trip(self) -> None:
+        """Stacks pickle by item, so ids need not match across processes."""
+        stack = Stack()
+        stack.push(StackItem(name="A", controller=1, damage_to_opponent=3))
+        stack.push(StackItem(name="Q", controller=0, damage_to_opponent=7))
+
+        restored = pickle.loads(pickle.dumps(stack))
+        assert restored == stack
+        assert restored.items() == stack.items()
@@ -0,0 +1,185 @@
+"""Tests for the transposition table and alpha-beta search."""
+
+import pytest
+
+from mtg_engine.engine.actions import Action, ActionType
+from mtg_engine.engine.game import Game
+from mtg_engine.engine.state import new_game
+from mtg_engine.search.alphabeta import WIN_SCORE, AlphaBeta
+from mtg_engine.search.transposition import (
+    BUCKET_SIZE,
+    ENTRY_BYTES,
+    MAX_DEPTH,
+    Bound,
+    ReplacementPolicy,
+    TranspositionTable,
+)
+
+
+def colliding_keys(table: TranspositionTable, n: int) -> list[int]:
+    """Return ``n`` distinct keys that all map to bucket 0."""
+    return [(i + 1) * table.num_buckets for i in range(n)]
+
+
+class TestTranspositionTable:
+    """Tests for TranspositionTable."""
+
+    def test_memory_cap(self) -> None:
+        """The table never exceeds its memory budget."""
+        table = TranspositionTable(memory_bytes=10_000)
+        assert table.memory_bytes <= 10_000
+        assert table.capacity == table.num_buckets * BUCKET_SIZE
+        assert table.num_buckets & (table.num_buckets - 1) == 0
+
+    def test_too_small_raises(self) -> None:
+        """A budget below one bucket is rejected."""
+        with pytest.raises(ValueError):
+            TranspositionTable(memory_bytes=ENTRY_BYTES)
+
+    def test_store_and_get(self) -> None:
+        """Stored entries round-trip."""
+        table = TranspositionTable(memory_bytes=4096)
+        key = new_game().key
+        assert table.get(key) is None
+
+        table.store(key, depth=3, value=1.5, visits=7, best_action=2)
+        entry = table.get(key)
+        assert entry is not None
+        assert entry.key == key
+        assert entry.depth == 3
+        assert entry.value == 1.5
+        assert entry.visits == 7
+        assert entry.best_action == 2
+        assert entry.bound is Bound.EXACT
+
+    def test_depth_out_of_range_raises(self) -> None:
+        """Depths that do not fit the 16-bit depth field are rejected."""
+        table = TranspositionTable(memory_bytes=1024)
+        table.store(1, MAX_DEPTH, 0.0)
+        for depth in (-1, MAX_DEPTH + 1):
+            with pytest.raises(ValueError):
+                table.store(2, depth, 0.0)
+        assert table.get(2) is None
+
+    def test_same_key_overwrites(self) -> None:
+        """Storing an existing key updates it in place."""
+        table = TranspositionTable(memory_bytes=4096)
+        table.store(99, depth=5, value=1.0)
+        table.store(99, depth=1, value=2.0)
+        assert table.get(99).value == 2.0
+        assert table.stats().filled == 1
+
+    def test_depth_preferred_rejects_shallow(self) -> None:
+        """Depth-preferred buckets keep the deepest entries."""
+        table = TranspositionTable(4096, ReplacementPolicy.DEPTH_PREFERRED)
+        k1, k2, k3 = colliding_keys(table, 3)
+        table.store(k1, depth=5, value=0.0)
+        table.store(k2, depth=4, value=0.0)
+
+        assert not table.store(k3, depth=1, value=0.0)
+        assert table.get(k3) is None
+        assert table.store(k3, depth=6, value=0.0)
+        assert table.get(k2) is None
+        assert table.stats().rejected == 1
+
+    def test_always_replace_evicts_oldest(self) -> None:
+        """Always-replace buckets evict the least recently written entry."""
+        table = TranspositionTable(4096, ReplacementPolicy.ALWAYS_REPLACE)
+        k1, k2, k3 = colliding_keys(table, 3)
+        table.store(k1, depth=9, value=0.0)
+        table.store(k2, depth=9, value=0.0)
+        table.store(k3, depth=0, value=0.0)
+
+        assert table.get(k1) is None
+        assert table.get(k2) is not None
+        assert table.get(k3) is not None
+
+    def test_two_tier(self) -> None:
+        """Two-tier buckets keep the deepest entry and the newest entry."""
+        table = TranspositionTable(4096, ReplacementPolicy.TWO_TIER)
+        deep, k2, k3 = colliding_keys(table, 3)
+        table.store(deep, depth=9, value=0.0)
+        table.store(k2, depth=1, value=0.0)
+        table.store(k3, depth=1, value=0.0)
+
+        assert table.get(deep) is not None
+        assert table.get(k2) is None
+        assert table.get(k3) is not None
+
+    def test_stats(self) -> None:
+        """Probes, hits, collisions and occupancy are reported."""
+        table = TranspositionTable(4096)
+        k1, k2 = colliding_keys(table, 2)
+        table.store(k1, depth=1, value=0.0)
+        table.get(k1)
+        table.get(k2)
+
+        stats = table.stats()
+        assert stats.probes == 2
+        assert stats.hits == 1
+        assert stats.collisions == 1
+        assert stats.hit_rate == 0.5
+        assert stats.occupancy == 1 / table.capacity
+
+    def test_clear(self) -> None:
+        """clear empties the table."""
+        table = TranspositionTable(4096)
+        table.store(1, depth=1, value=0.0)
+        table.clear()
+        assert table.get(1) is None
+        assert table.stats().filled == 0
+
+
+class TestAlphaBeta:
+    """Tests for AlphaBeta search."""
+
+    def test_finds_lethal(self) -> None:
+        """Passing to resolve a lethal spell is chosen over casting more."""
+        g = Game.new()
+        g.state.players[1].life = 3
+        g.state.recompute_key()
+        g.apply(Action(ActionType.CAST_A))
+        g.apply(Action(ActionType.PASS))  # P1 passes back to P0
+
+        result = AlphaBeta().search(g, depth=3)
+        assert result.value > WIN_SCORE / 2
+        assert result.best_action.type is ActionType.PASS
+
+    def test_mate_distance_survives_table(self) -> None:
+        """A win stored from a deeper ply keeps its distance from the root."""
+        g = Game.new()
+        g.state.players[1].life = 3
+        g.state.recompute_key()
+        g.apply(Action(ActionType.CAST_A))
+        g.apply(Action(ActionType.PASS))  # P0 wins by passing
+        assert AlphaBeta().search(g, depth=3).value == WIN_SCORE - 1
+
+        # Store the position as if it had been reached two plies in
+        table = TranspositionTable(memory_bytes=1 << 20)
+        search = AlphaBeta(table)
+        assert search._negamax(g, 3, -2 * WIN_SCORE, 2 * WIN_SCORE, 2) == (
+            WIN_SCORE - 3
+        )
+        assert search.search(g, depth=3).value == WIN_SCORE - 1
+
+    def test_search_restores_game(self) -> None:
+        """Searching leaves the game untouched."""
+        g = Game.new()
+        before = g.state.clone_shallow()
+        AlphaBeta().search(g, depth=4)
+        assert g.state == before
+        assert g.state.key == before.key
+
+    def test_value_independent_of_table(self) -> None:
+        """Tiny and large tables, of any policy, give the same root value."""
+        g = Game.new(starting_life=6)
+        reference = AlphaBeta().search(g, depth=6).value
+        for policy in ReplacementPolicy:
+            table = TranspositionTable(memory_bytes=256, policy=policy)
+            assert AlphaBeta(table).search(g, depth=6).value == reference
+
+    def test_table_gets_hits(self) -> None:
+        """Transpositions are found during search."""
+        table = TranspositionTable(memory_bytes=1 << 20)
+        AlphaBeta(table).search(Game.new(), depth=6)
+        assert table.stats().hits > 0
@@ -0,0 +1,67 @@
+"""Tests for make-move/undo-move support."""
+
+import random
+
+from mtg_engine.engine.actions import ACTION_TYPES, Action, ActionType
+from mtg_engine.engine.game import Game
+
+
+class TestUndo:
+    """Tests for Game.apply undo records and Game.undo."""
+
+    def test_undo_cast(self) -> None:
+        """Undoing a cast removes the spell and restores priority."""
+        g = Game.new()
+        before = g.state.clone_shallow()
+
+        record = g.apply(Action(ActionType.CAST_A))
+        assert record.pushed
+        g.undo(record)
+
+        assert g.state == before
+
+    def test_undo_resolution(self) -> None:
+        """Undoing a resolution puts the spell back and restores life."""
+        g = Game.new()
+        g.apply(Action(ActionType.CAST_A))
+        g.apply(Action(ActionType.PASS))
+        before = g.state.clone_shallow()
+
+        record = g.apply(Action(ActionType.PASS))
+        assert record.popped is not None
+        assert g.state.players[1].life == 17
+        g.undo(record)
+
+        assert g.state == before
+        assert g.state.stack.peek() == record.popped
+
+    def test_undo_turn_advance(self) -> None:
+        """Undoing a turn advance restores turn and active player."""
+        g = Game.new()
+        g.apply(Action(ActionType.PASS))
+        before = g.state.clone_shallow()
+
+        record = g.apply(Action(ActionType.PASS))
+        assert g.state.turn == 2
+        g.undo(record)
+
+        assert g.state == before
+
+    def test_undo_random_sequence(self) -> None:
+        """Undoing a long random sequence in reverse restores the start."""
+        rng = random.Random(7)
+        g = Game.new()
+        start = g.state.clone_shallow()
+        snapshots = []
+        records = []
+
+        for _ in range(300):
+            snapshots.append(g.state.clone_shallow())
+            action = Action(rng.choice(ACTION_TYPES))
+            records.append(g.apply(action))
+
+        while records:
+            g.undo(records.pop())
+            assert g.state == snapshots.pop()
+
+        assert g.state == start
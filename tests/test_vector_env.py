@@ -0,0 +1,106 @@
+"""Tests for the shared-memory vector environment."""
+
+import random
+from array import array
+
+import pytest
+
+from mtg_engine.engine.actions import ACTION_CODES, ACTIONS, ActionType
+from mtg_engine.engine.game import Game
+from mtg_engine.features import ObservationEncoder
+from mtg_engine.vector_env import VectorEnv
+
+A = ACTION_CODES[ActionType.CAST_A]
+B = ACTION_CODES[ActionType.CAST_B]
+P = ACTION_CODES[ActionType.PASS]
+
+
+def encode(game: Game, max_stack: int = 8) -> list[float]:
+    """Observation of a game, as a list."""
+    encoder = ObservationEncoder(max_stack)
+    out = array("f", [0.0]) * encoder.size
+    encoder.encode_into(game.state, out)
+    return out.tolist()
+
+
+class TestVectorEnv:
+    """Tests for reset, step, auto-reset and shutdown."""
+
+    def test_reset_observations_and_masks(self) -> None:
+        """Reset fills every slot with a new game's observation and mask."""
+        with VectorEnv(3, workers=2) as env:
+            obs = env.reset()
+            assert obs.shape == (3, env.observation_size)
+            expected = encode(Game.new())
+            assert obs.tolist() == [expected] * 3
+            assert env.action_masks.tolist() == [[1] * env.num_actions] * 3
+
+    def test_step_matches_local_games(self) -> None:
+        """Random steps match the same games played in this process."""
+        rng = random.Random(0)
+        n = 5
+        local = [Game.new(5) for _ in range(n)]
+        with VectorEnv(n, workers=2, starting_life=5) as env:
+            env.reset()
+            for _ in range(300):
+                actions = [rng.randrange(env.num_actions) for _ in range(n)]
+                obs, rewards, terminated, truncated = env.step(actions)
+                rows = obs.tolist()
+                for i, game in enumerate(local):
+                    player = game.state.priority_player
+                    game.apply(ACTIONS[actions[i]])
+                    reward = 0.0
+                    if game.is_over():
+                        reward = 1.0 if game.winner() == player else -1.0
+                        local[i] = game = Game.new(5)
+                    assert terminated[i] == (reward != 0.0)
+                    assert rewards[i] == reward
+                    assert truncated[i] == 0
+                    assert rows[i] == encode(game)
+
+    def test_winning_pass_rewarded(self) -> None:
+        """The player whose pass resolves lethal damage gets reward 1."""
+        with VectorEnv(2, workers=1, starting_life=3) as env:
+            env.reset()
+            env.step([A, B])
+            env.step([P, P])
+            _, rewards, terminated, _ = env.step([P, P])
+            assert terminated.tolist() == [1, 0]
+            assert rewards.tolist() == [1.0, 0.0]
+            assert env.observations.tolist()[0] == encode(Game.new(3))
+
+    def test_truncation(self) -> None:
+        """Games reaching max_episode_steps are truncated and restarted."""
+        with VectorEnv(2, workers=1, max_episode_steps=3) as env:
+            env.reset()
+            for _ in range(2):
+                _, _, terminated, truncated = env.step([P, P])
+                assert truncated.tolist() == [0, 0]
+            _, rewards, terminated, truncated = env.step([P, P])
+            assert truncated.tolist() == [1, 1]
+            assert terminated.tolist() == [0, 0]
+            assert rewards.tolist() == [0.0, 0.0]
+            assert env.observations.tolist() == [encode(Game.new())] * 2
+
+    def test_invalid_actions(self) -> None:
+        """Wrong action counts and codes raise ValueError."""
+        with VectorEnv(2, workers=1) as env:
+            env.reset()
+            with pytest.raises(ValueError):
+                env.step([P])
+            with pytest.raises(ValueError):
+                env.step([P, env.num_actions])
+
+    def test_closed(self) -> None:
+        """Stepping a closed env raises; closing twice is harmless."""
+        env = VectorEnv(2, workers=2)
+        env.reset()
+        env.close()
+        env.close()
+        with pytest.raises(RuntimeError):
+            env.step([P, P])
+
+    def test_rejects_empty(self) -> None:
+        """num_envs must be positive."""
+        with pytest.raises(ValueError):
+            VectorEnv(0)
@@ -0,0 +1,94 @@
+"""Tests for Zobrist hashing of game states."""
+
+import random
+
+import pytest
+
+from mtg_engine.engine.actions import ACTION_TYPES, Action, ActionType
+from mtg_engine.engine.game import Game, GameInvariantError
+from mtg_engine.engine.state import new_game
+from mtg_engine.engine.zobrist import compute_key
+
+
+class TestZobrist:
+    """Tests for GameState.key maintenance."""
+
+    def test_new_game_has_key(self) -> None:
+        """A new state carries its computed key."""
+        state = new_game()
+        assert state.key != 0
+        assert state.key == compute_key(state)
+
+    def test_key_deterministic(self) -> None:
+        """Equal states built independently have equal keys."""
+        assert new_game(20).key == new_game(20).key
+        assert new_game(20).key != new_game(19).key
+
+    def test_incremental_matches_recompute(self) -> None:
+        """Keys stay consistent through random play in debug mode."""
+        rng = random.Random(42)
+        g = Game.new(check_keys=True)
+        for _ in range(500):
+            g.apply(Action(rng.choice(ACTION_TYPES)))
+        assert g.state.key == compute_key(g.state)
+
+    def test_transposition_same_key(self) -> None:
+        """Different move orders reaching the same state share a key."""
+        a, b, p = ActionType.CAST_A, ActionType.CAST_B, ActionType.PASS
+
+        g1 = Game.new()
+        for t in (a, p, p, b, p, p):
+            g1.apply(Action(t))
+        g2 = Game.new()
+        for t in (b, p, p, a, p, p):
+            g2.apply(Action(t))
+
+        assert g1.state == g2.state
+        assert g1.state.key == g2.state.key
+
+    def test_different_states_different_keys(self) -> None:
+        """Each action from the start leads to a distinct key."""
+        keys = {new_game().key}
+        for t in ACTION_TYPES:
+            g = Game.new()
+            g.apply(Action(t))
+            keys.add(g.state.key)
+        assert len(keys) == 1 + len(ACTION_TYPES)
+
+    def test_equal_item_pairs_do_not_cancel(self) -> None:
+        """Stacks of two equal items hash differently for different items."""
+        keys = set()
+        for t in (ActionType.CAST_A, ActionType.CAST_B):
+            g = Game.new()
+            for u in (t, ActionType.PASS, t):
+                g.apply(Action(u))
+            keys.add(g.state.key)
+        assert len(keys) == 2
+
+    def test_undo_restores_key(self) -> None:
+        """Undo restores the previous key exactly."""
+        g = Game.new(check_keys=True)
+        key = g.state.key
+        records = [g.apply(Action(ActionType.CAST_A))]
+        records.append(g.apply(Action(ActionType.PASS)))
+        records.append(g.apply(Action(ActionType.PASS)))
+        assert g.state.key != key
+
+        while records:
+            g.undo(records.pop())
+        assert g.state.key == key
+
+    def test_debug_mode_detects_stale_key(self) -> None:
+        """Direct state mutation is caught by the cross-check."""
+        g = Game.new(check_keys=True)
+        g.state.players[0].life = 5
+        with pytest.raises(GameInvariantError):
+            g.apply(Action(ActionType.PASS))
+
+    def test_recompute_key(self) -> None:
+        """recompute_key resynchronizes after direct mutation."""
+        state = new_game()
+        state.players[0].life = 5
+        stale = state.key
+        assert state.recompute_key() != stale
+        assert state.key == compute_key(state)
@@ -0,0 +1,393 @@
+#!/usr/bin/env python3
+"""Benchmark engine hot paths and check them against a saved baseline.
+
+Every metric is a throughput (higher is better): the best rate over a
+few repeats. Results are written as JSON; when a baseline file is given,
+each metric is compared with it and the script exits with status 1 if
+any metric dropped by more than the threshold.
+
+Baselines are machine-specific: record one on the machine that will run
+the comparison.
+
+Usage:
+    python tools/benchmark.py                          # run and print
+    python tools/benchmark.py -o results.json          # run and save
+    python tools/benchmark.py --baseline base.json --save-baseline
+    python tools/benchmark.py --baseline base.json     # run and compare
+    python tools/benchmark.py --baseline base.json --compare results.json
+    # or
+    uv run python tools/benchmark.py ...
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import json
+import platform
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from types import ModuleType
+
+from mtg_engine.engine.actions import ACTIONS, ActionType, action_for
+from mtg_engine.engine.game import Game
+from mtg_engine.engine.stack import Stack, StackItem
+from mtg_engine.rules.index import RulesIndex
+from mtg_engine.rules.search import RulesSearch, build_search_index
+from mtg_engine.rules.xref import RuleGraph
+from mtg_engine.selfplay import play_game
+
+RESULTS_VERSION = 1
+
+# Default allowed drop before a metric counts as a regression (20%)
+DEFAULT_THRESHOLD = 0.2
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+
+@dataclass(frozen=True)
+class Comparison:
+    """One metric compared against its baseline.
+
+    Attributes:
+        name: Metric name.
+        baseline: Baseline rate, or None if the metric is new.
+        current: Current rate, or None if the metric is no longer measured.
+        change: Relative change (``current / baseline - 1``), if both exist.
+        regressed: True if the rate dropped by more than the threshold.
+    """
+
+    name: str
+    baseline: float | None
+    current: float | None
+    change: float | None
+    regressed: bool
+
+
+def _rate(run: Callable[[], int], repeat: int) -> float:
+    """Return the best ops/second of ``run`` (which returns its op count)."""
+    best = 0.0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        ops = run()
+        best = max(best, ops / (time.perf_counter() - start))
+    return best
+
+
+def _bench_apply(action_type: ActionType, n: int = 10_000) -> Callable[[], int]:
+    """Game.apply of one action type, from a fresh game."""
+    action = action_for(action_type)
+
+    def run() -> int:
+        apply = Game.new().apply
+        for _ in range(n):
+            apply(action)
+        return n
+
+    return run
+
+
+def _bench_legal_actions(n: int = 50_000) -> Callable[[], int]:
+    """Game.legal_actions on a fresh game (calls/second)."""
+    game = Game.new()
+
+    def run() -> int:
+        legal_actions = game.legal_actions
+        for _ in range(n):
+            legal_actions()
+        return n
+
+    return run
+
+
+def _bench_clone_shallow(depth: int = 8, n: int = 20_000) -> Callable[[], int]:
+    """GameState.clone_shallow with ``depth`` items on the stack."""
+    game = Game.new()
+    for _ in range(depth):
+        game.apply(action_for(ActionType.CAST_A))
+    state = game.state
+
+    def run() -> int:
+        clone = state.clone_shallow
+        for _ in range(n):
+            clone()
+        return n
+
+    return run
+
+
+def _bench_stack_push_pop(n: int = 50_000) -> Callable[[], int]:
+    """One Stack.push plus one Stack.pop per op."""
+    item = StackItem(name="A", controller=0, damage_to_opponent=3)
+
+    def run() -> int:
+        stack = Stack()
+        push, pop = stack.push, stack.pop
+        for _ in range(n):
+            push(item)
+            pop()
+        return n
+
+    return run
+
+
+def _bench_random_playouts(games: int = 50) -> Callable[[], int]:
+    """Complete random-vs-random games (reported as games/second)."""
+
+    def run() -> int:
+        for i in range(games):
+            play_game(i, ("random", "random"))
+        return games
+
+    return run
+
+
+def _load_outline_tool() -> ModuleType:
+    """Import tools/extract_rules_outline.py, which is not a package module."""
+    path = PROJECT_ROOT / "tools" / "extract_rules_outline.py"
+    spec = importlib.util.spec_from_file_location("extract_rules_outline", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _bench_rules_outline() -> Callable[[], int]:
+    """extract_toc_from_rules over the Comprehensive Rules (parses/second)."""
+    tool = _load_outline_tool()
+    rules_path = tool.find_rules_file(PROJECT_ROOT / "docs")
+
+    def run() -> int:
+        tool.extract_toc_from_rules(rules_path)
+        return 1
+
+    return run
+
+
+# Queries timed by rules.search.query, covering each query form
+_RULES_QUERIES = (
+    "priority stack",
+    '"state-based actions"',
+    "lifelink OR deathtouch",
+    "damage -combat",
+    "608.2",
+)
+
+
+def _bench_rules_get_rule(n: int = 20_000) -> Callable[[], int]:
+    """RulesIndex.get_rule on a few rule numbers (lookups/second)."""
+    rules = RulesIndex()
+    numbers = ["704.5a", "601.2f", "117", "702.19b", "903.4"]
+
+    def run() -> int:
+        get_rule = rules.get_rule
+        for i in range(n):
+            get_rule(numbers[i % len(numbers)])
+        return n
+
+    return run
+
+
+def _bench_rules_search_build() -> Callable[[], int]:
+    """build_search_index over the Comprehensive Rules (builds/second)."""
+    rules = RulesIndex()
+
+    def run() -> int:
+        with tempfile.TemporaryDirectory() as tmp:
+            build_search_index(rules, Path(tmp) / "rules.search")
+        return 1
+
+    return run
+
+
+def _bench_rules_search_query(n: int = 20) -> Callable[[], int]:
+    """RulesSearch.search over ``_RULES_QUERIES`` (queries/second)."""
+    search = RulesSearch()
+
+    def run() -> int:
+        for _ in range(n):
+            for query in _RULES_QUERIES:
+                search.search(query)
+        return n * len(_RULES_QUERIES)
+
+    return run
+
+
+def _bench_rules_xref_transitive(n: int = 1000) -> Callable[[], int]:
+    """RuleGraph.dependents(transitive=True) of rule 704 (queries/second)."""
+    graph = RuleGraph()
+
+    def run() -> int:
+        dependents = graph.dependents
+        for _ in range(n):
+            dependents("704", transitive=True)
+        return n
+
+    return run
+
+
+# Benchmark name -> factory for its timed function
+BENCHMARKS: dict[str, Callable[[], Callable[[], int]]] = {
+    **{
+        f"game.apply.{action.type.name}": (lambda t=action.type: _bench_apply(t))
+        for action in ACTIONS
+    },
+    "game.legal_actions": _bench_legal_actions,
+    "state.clone_shallow": _bench_clone_shallow,
+    "stack.push_pop": _bench_stack_push_pop,
+    "playout.random_games": _bench_random_playouts,
+    "rules.extract_outline": _bench_rules_outline,
+    "rules.get_rule": _bench_rules_get_rule,
+    "rules.search.build": _bench_rules_search_build,
+    "rules.search.query": _bench_rules_search_query,
+    "rules.xref.transitive": _bench_rules_xref_transitive,
+}
+
+
+def run_benchmarks(names: list[str] | None = None, repeat: int = 5) -> dict[str, float]:
+    """Run benchmarks and return their rates.
+
+    Args:
+        names: Benchmarks to run. Runs all if None.
+        repeat: Timed runs per benchmark; the best is kept.
+
+    Returns:
+        Ops per second for each benchmark.
+    """
+    results = {}
+    for name in names or BENCHMARKS:
+        results[name] = _rate(BENCHMARKS[name](), repeat)
+    return results
+
+
+def compare(
+    baseline: dict[str, float],
+    current: dict[str, float],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> list[Comparison]:
+    """Compare current rates with a baseline.
+
+    Args:
+        baseline: Baseline rates by metric name.
+        current: Current rates by metric name.
+        threshold: Allowed relative drop, e.g. 0.2 for 20%.
+
+    Returns:
+        One Comparison per metric in either input, sorted by name.
+    """
+    comparisons = []
+    for name in sorted(baseline.keys() | current.keys()):
+        base, cur = baseline.get(name), current.get(name)
+        change = None
+        if base is not None and cur is not None and base > 0:
+            change = cur / base - 1
+        comparisons.append(
+            Comparison(
+                name=name,
+                baseline=base,
+                current=cur,
+                change=change,
+                regressed=change is not None and change < -threshold,
+            )
+        )
+    return comparisons
+
+
+def load_results(path: Path) -> dict[str, float]:
+    """Load the metrics from a results file written by ``save_results``."""
+    data = json.loads(path.read_text(encoding="utf-8"))
+    if data.get("version") != RESULTS_VERSION:
+        raise ValueError(f"{path}: unsupported results version {data.get('version')}")
+    return data["metrics"]
+
+
+def save_results(path: Path, metrics: dict[str, float]) -> None:
+    """Write metrics, with the interpreter and platform, as JSON."""
+    data = {
+        "version": RESULTS_VERSION,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "metrics": metrics,
+    }
+    path.write_text(json.dumps(data, indent=2) + "\n", encoding="utf-8")
+
+
+def format_comparisons(comparisons: list[Comparison]) -> str:
+    """Render comparisons as an aligned text table."""
+    lines = [f"{'metric':<28} {'baseline':>14} {'current':>14} {'change':>8}"]
+    for c in comparisons:
+        base = f"{c.baseline:,.1f}" if c.baseline is not None else "-"
+        cur = f"{c.current:,.1f}" if c.current is not None else "-"
+        change = f"{c.change:+.1%}" if c.change is not None else "-"
+        flag = "  REGRESSED" if c.regressed else ""
+        lines.append(f"{c.name:<28} {base:>14} {cur:>14} {change:>8}{flag}")
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Main entry point; returns the process exit status."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-o", "--output", type=Path, help="write results JSON here")
+    parser.add_argument("--baseline", type=Path, help="baseline results JSON")
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="write this run's results to --baseline instead of comparing",
+    )
+    parser.add_argument(
+        "--compare",
+        type=Path,
+        metavar="RESULTS",
+        help="compare a saved results file instead of running benchmarks",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="allowed relative drop before failing (default: %(default)s)",
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs each")
+    parser.add_argument(
+        "-k", "--filter", default="", help="only run metrics containing this"
+    )
+    args = parser.parse_args(argv)
+
+    if args.compare is not None:
+        current = load_results(args.compare)
+    else:
+        names = [name for name in BENCHMARKS if args.filter in name]
+        current = run_benchmarks(names, args.repeat)
+        if args.output is not None:
+            save_results(args.output, current)
+            print(f"Wrote {args.output}")
+
+    if args.baseline is None or args.save_baseline:
+        for name, rate in current.items():
+            print(f"{name:<28} {rate:>14,.1f} /s")
+        if args.save_baseline:
+            if args.baseline is None:
+                parser.error("--save-baseline requires --baseline")
+            save_results(args.baseline, current)
+            print(f"Wrote baseline {args.baseline}")
+        return 0
+
+    baseline = load_results(args.baseline)
+    if args.filter:
+        baseline = {k: v for k, v in baseline.items() if args.filter in k}
+    comparisons = compare(baseline, current, args.threshold)
+    print(format_comparisons(comparisons))
+    regressed = [c.name for c in comparisons if c.regressed]
+    if regressed:
+        print(
+            f"\n{len(regressed)} metric(s) regressed by more than "
+            f"{args.threshold:.0%}: {', '.join(regressed)}"
+        )
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,6 +4,8 @@
 This script reads the Comprehensive Rules text file and generates:
 - docs/rules_index.md: A navigable table of contents
 - docs/rules_coverage.yml: A coverage tracker (only if missing)
+- <rules file>.xref: The rule cross-reference graph (see mtg_engine.rules.xref),
+  updated incrementally when the rules file changes
 
 Usage:
     python tools/extract_rules_outline.py
@@ -16,6 +18,8 @@ from __future__ import annotations
 import re
 from pathlib import Path
 
+from mtg_engine.rules.xref import RuleGraph
+
 
 def find_rules_file(docs_dir: Path) -> Path | None:
     """Find the Comprehensive Rules .txt file in docs/."""
@@ -235,6 +239,17 @@ def main() -> None:
     else:
         print(f"Skipped {coverage_path} (already exists)")
 
+    # Build or update the cross-reference graph
+    with RuleGraph(rules_file) as graph:
+        if graph.rebuilt:
+            status = f"{graph.reparsed} rules re-parsed"
+        else:
+            status = "up to date"
+        print(
+            f"Cross-reference graph: {len(graph.rules)} rules, "
+            f"{graph.edge_count} references ({status})"
+        )
+
 
 if __name__ == "__main__":
     main()